@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Activity Aggregates
+=============================================
+Rolling per-day activity statistics, updated incrementally at SessionEnd.
+
+Key Features:
+- One small JSON file per month in .claude/data/aggregates/YYYY-MM.json
+  holding per-day counters: sessions, prompts, responses, session time,
+  files touched and the most-touched top-level directories
+- SessionEnd adds only what changed since the session was last counted
+  (resumed sessions are never double-counted), so nothing rescans
+  .claude/data/sessions/
+- Reports for any date range read only the month files in that range, so
+  they stay instant after years of history
+- Month files are updated under an flock, so concurrent sessions don't lose counts
+
+Usage:
+    python log_conversation.py report --since 2026-01-01 --by week
+    python activity_stats.py rebuild      # one-time backfill from existing sessions
+"""
+
+import sys
+import os
+import json
+import fcntl
+from pathlib import Path
+from datetime import datetime, date, timedelta
+from typing import Dict, Any, Optional, List, Tuple
+
+from session_manager import get_session_manager, active_seconds
+
+
+# ===== CONFIGURATION =====
+# Directories kept per day (the rest are dropped to keep month files small)
+MAX_DIRECTORIES_PER_DAY = 50
+
+# Directories listed per row in reports
+REPORT_TOP_DIRECTORIES = 3
+
+
+def _empty_day() -> Dict[str, Any]:
+    """Get a zeroed per-day record."""
+    return {
+        "sessions": 0,
+        "prompts": 0,
+        "responses": 0,
+        "duration_seconds": 0.0,
+        "files_touched": 0,
+        "directories": {},
+    }
+
+
+class ActivityAggregates:
+    """Per-day activity counters stored as monthly JSON files."""
+
+    def __init__(self, project_root: Optional[Path] = None):
+        """
+        Initialize the aggregates store.
+
+        Args:
+            project_root: Project root directory (defaults to auto-detect)
+        """
+        self.project_root = project_root or self._get_project_root()
+        self.aggregates_dir = self.project_root / ".claude" / "data" / "aggregates"
+
+    def _get_project_root(self) -> Path:
+        """Get the project root directory (parent of .claude folder)."""
+        return Path(__file__).parent.parent.parent
+
+    def _month_path(self, month: str) -> Path:
+        """Get the aggregate file for a month ("YYYY-MM")."""
+        return self.aggregates_dir / f"{month}.json"
+
+    def _load_month(self, month: str) -> Dict[str, Any]:
+        """Load a month's per-day records ({} if none yet)."""
+        try:
+            with open(self._month_path(month), "r", encoding="utf-8") as f:
+                return json.load(f).get("days", {})
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Warning: Failed to read aggregates for {month}: {e}", file=sys.stderr)
+            return {}
+
+    def _directory_of(self, file_path: str) -> str:
+        """Get the top-level project directory of a file ("." for root files)."""
+        path = Path(file_path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(self.project_root)
+            except ValueError:
+                # Outside the project: group by the file's own directory
+                return str(path.parent)
+        return path.parts[0] if len(path.parts) > 1 else "."
+
+    def add(self, day: date, delta: Dict[str, Any]):
+        """
+        Add counters to one day (read-modify-write under the month lock).
+
+        Args:
+            day: Day to update
+            delta: Counters to add (same keys as a per-day record)
+        """
+        month = day.strftime("%Y-%m")
+        self.aggregates_dir.mkdir(parents=True, exist_ok=True)
+
+        lock_path = self.aggregates_dir / f"{month}.lock"
+        with open(lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+
+            days = self._load_month(month)
+            record = days.setdefault(day.isoformat(), _empty_day())
+            for key in ("sessions", "prompts", "responses", "files_touched"):
+                record[key] = record.get(key, 0) + delta.get(key, 0)
+            record["duration_seconds"] = round(record.get("duration_seconds", 0.0)
+                                               + delta.get("duration_seconds", 0.0), 3)
+
+            directories = record.setdefault("directories", {})
+            for directory, count in delta.get("directories", {}).items():
+                directories[directory] = directories.get(directory, 0) + count
+            if len(directories) > MAX_DIRECTORIES_PER_DAY:
+                top = sorted(directories.items(), key=lambda item: item[1], reverse=True)
+                record["directories"] = dict(top[:MAX_DIRECTORIES_PER_DAY])
+
+            path = self._month_path(month)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"days": days}, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+
+    def record_session(self, session_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Compute what a session added since it was last counted.
+
+        The returned delta is applied to the day the session ended; the caller
+        stores session_data["aggregated"] so a resumed session only adds its
+        new activity next time.
+
+        Args:
+            session_data: Finalized session data (modified in place)
+
+        Returns:
+            The delta that was added, or None if there was nothing new
+        """
+        counted = session_data.get("aggregated", {})
+        prompts = len(session_data.get("prompts", []))
+        responses = len(session_data.get("responses", []))
+        files = session_data.get("file_changes", [])
+
+        end_time = datetime.fromisoformat(session_data.get("end_time") or datetime.now().isoformat())
+        duration = round(active_seconds(session_data), 3)
+
+        new_files = files[counted.get("files", 0):]
+        directories: Dict[str, int] = {}
+        for file_path in new_files:
+            directory = self._directory_of(file_path)
+            directories[directory] = directories.get(directory, 0) + 1
+
+        delta = {
+            "sessions": 0 if counted else 1,
+            "prompts": prompts - counted.get("prompts", 0),
+            "responses": responses - counted.get("responses", 0),
+            "duration_seconds": round(duration - counted.get("duration_seconds", 0.0), 3),
+            "files_touched": len(new_files),
+            "directories": directories,
+        }
+        if not any(delta[key] for key in ("sessions", "prompts", "responses", "files_touched")) \
+                and delta["duration_seconds"] <= 0:
+            return None
+
+        self.add(end_time.date(), delta)
+        session_data["aggregated"] = {
+            "prompts": prompts,
+            "responses": responses,
+            "files": len(files),
+            "duration_seconds": duration,
+        }
+        return delta
+
+    def query(self, since: date, until: date) -> Dict[str, Dict[str, Any]]:
+        """
+        Get per-day records for a date range (inclusive).
+
+        Args:
+            since: First day
+            until: Last day
+
+        Returns:
+            Dictionary of ISO date -> per-day record, in date order
+        """
+        days = {}
+        month = date(since.year, since.month, 1)
+        while month <= until:
+            for day, record in sorted(self._load_month(month.strftime("%Y-%m")).items()):
+                if since.isoformat() <= day <= until.isoformat():
+                    days[day] = record
+            month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        return days
+
+    def report(self, since: date, until: date, by: str = "day") -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Group per-day records into report periods.
+
+        Args:
+            since: First day
+            until: Last day
+            by: Period size ("day", "week" or "month")
+
+        Returns:
+            List of (period label, summed record), oldest first
+        """
+        periods: Dict[str, Dict[str, Any]] = {}
+        for day, record in self.query(since, until).items():
+            day_date = date.fromisoformat(day)
+            if by == "week":
+                year, week, _ = day_date.isocalendar()
+                label = f"{year}-W{week:02d}"
+            elif by == "month":
+                label = day[:7]
+            else:
+                label = day
+
+            total = periods.setdefault(label, _empty_day())
+            for key in ("sessions", "prompts", "responses", "duration_seconds", "files_touched"):
+                total[key] += record.get(key, 0)
+            for directory, count in record.get("directories", {}).items():
+                total["directories"][directory] = total["directories"].get(directory, 0) + count
+
+        return sorted(periods.items())
+
+    def rebuild(self) -> int:
+        """
+        Backfill aggregates from finalized session files (one-time migration).
+
+        Sessions that were already counted are skipped.
+
+        Returns:
+            Number of sessions added
+        """
+        manager = get_session_manager()
+        added = 0
+        for session_file in sorted(manager.sessions_dir.glob("*.json")):
+            session_data = manager.load_session(session_file.stem)
+            if not session_data or not session_data.get("finalized") or session_data.get("aggregated"):
+                continue
+            if self.record_session(session_data) is not None:
+                manager.save_session(session_file.stem, session_data)
+                added += 1
+        return added
+
+
+def parse_since(value: str, today: Optional[date] = None) -> date:
+    """
+    Parse a report start date.
+
+    Args:
+        value: "YYYY-MM-DD", "YYYY-MM", or a relative "7d" / "4w"
+        today: Reference day for relative values (defaults to today)
+
+    Returns:
+        Start date
+
+    Raises:
+        ValueError: If the value can't be parsed
+    """
+    today = today or date.today()
+    if value[:-1].isdigit() and value[-1] in "dw":
+        amount = int(value[:-1])
+        return today - timedelta(days=amount * (7 if value[-1] == "w" else 1) - 1)
+    if len(value) == 7:
+        return date.fromisoformat(f"{value}-01")
+    return date.fromisoformat(value)
+
+
+def format_report(rows: List[Tuple[str, Dict[str, Any]]]) -> str:
+    """
+    Render report rows as a markdown table with a totals line.
+
+    Args:
+        rows: Output of ActivityAggregates.report
+
+    Returns:
+        Markdown table
+    """
+    if not rows:
+        return "No activity recorded in this range.\n"
+
+    def hours(seconds: float) -> str:
+        minutes = int(seconds // 60)
+        return f"{minutes // 60}:{minutes % 60:02d}"
+
+    def top(directories: Dict[str, int]) -> str:
+        ranked = sorted(directories.items(), key=lambda item: item[1], reverse=True)
+        return ", ".join(f"{name} ({count})" for name, count in ranked[:REPORT_TOP_DIRECTORIES])
+
+    totals = _empty_day()
+    table = "| Period | Sessions | Prompts | Responses | Time | Files | Top directories |\n"
+    table += "|--------|---------:|--------:|----------:|-----:|------:|-----------------|\n"
+    for label, record in rows:
+        table += (f"| {label} | {record['sessions']} | {record['prompts']} | {record['responses']} | "
+                  f"{hours(record['duration_seconds'])} | {record['files_touched']} | "
+                  f"{top(record['directories'])} |\n")
+        for key in ("sessions", "prompts", "responses", "duration_seconds", "files_touched"):
+            totals[key] += record[key]
+        for directory, count in record["directories"].items():
+            totals["directories"][directory] = totals["directories"].get(directory, 0) + count
+
+    table += (f"| **Total** | {totals['sessions']} | {totals['prompts']} | {totals['responses']} | "
+              f"{hours(totals['duration_seconds'])} | {totals['files_touched']} | "
+              f"{top(totals['directories'])} |\n")
+    return table
+
+
+# Convenience functions for use in hooks
+def record_session_activity(session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Add a finalized session's new activity to the daily aggregates.
+
+    Args:
+        session_id: Unique session identifier
+
+    Returns:
+        The delta that was added, or None
+    """
+    manager = get_session_manager()
+    session_data = manager.load_session(session_id)
+    if session_data is None:
+        return None
+
+    delta = ActivityAggregates(manager.project_root).record_session(session_data)
+    if delta is not None:
+        manager.save_session(session_id, session_data)
+    return delta
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "rebuild"
+
+    if command == "rebuild":
+        count = ActivityAggregates().rebuild()
+        print(f"✓ Added {count} session(s) to the activity aggregates", file=sys.stderr)
+    else:
+        print(f"Error: Unknown command '{command}'", file=sys.stderr)
+        print("Valid commands: rebuild", file=sys.stderr)
+        sys.exit(1)
@@ -10,6 +10,10 @@ Key Features:
 - Parses transcript_path (JSONL format) to extract assistant messages
 - Appends responses to existing session markdown file
 - Updates session JSON with response data
+- Merges file changes and tool timings spooled by tool hooks into the session JSON
+- Records a per-turn diff stat (git snapshot trees, see git_snapshot.py) under
+  the turn's last response
+- Runs the heavy work from the background work queue so Claude isn't blocked
 - Enables complete conversation logging (prompts + responses)
 
 This hook is crucial for achieving fully automatic logging of conversations.
@@ -21,64 +25,101 @@ import os
 from pathlib import Path
 from session_manager import get_session_manager
 from conversation_logger import get_logger
+from work_queue import submit
+from git_snapshot import take_snapshot, snapshot_turn
 
 
-def main():
-    """Handle Stop (agent stop) event."""
-    try:
-        # Read hook data from stdin
-        hook_data = json.load(sys.stdin)
+def process(hook_data):
+    """
+    Log new Claude responses from the transcript (runs from the work queue).
 
-        # Extract session ID and transcript path
-        session_id = hook_data.get("session_id", "unknown")
-        transcript_path = hook_data.get("transcript_path", "")
+    Only the part of the transcript written before the Stop hook fired is
+    read, and the turn diff uses the tree snapshotted at that moment, so a
+    turn started before the queue gets here isn't attributed to this one.
 
-        if session_id == "unknown":
-            print("Warning: No valid session_id in Stop hook", file=sys.stderr)
-            sys.exit(0)
+    Args:
+        hook_data: Stop hook payload, plus "snapshot_tree" and
+                   "transcript_offset" recorded by main()
+    """
+    session_id = hook_data.get("session_id", "unknown")
+    transcript_path = hook_data.get("transcript_path", "")
 
-        if not transcript_path or not os.path.exists(transcript_path):
-            print(f"Warning: Transcript path not found: {transcript_path}", file=sys.stderr)
-            sys.exit(0)
+    if not transcript_path or not os.path.exists(transcript_path):
+        print(f"Warning: Transcript path not found: {transcript_path}", file=sys.stderr)
+        return
 
-        # Initialize session manager
-        session_manager = get_session_manager()
+    # Initialize session manager
+    session_manager = get_session_manager()
 
-        # Verify session exists
-        if not session_manager.session_exists(session_id):
-            print(f"Warning: Session {session_id} not found in Stop hook", file=sys.stderr)
-            sys.exit(0)
+    # Verify session exists
+    if not session_manager.session_exists(session_id):
+        print(f"Warning: Session {session_id} not found in Stop hook", file=sys.stderr)
+        return
 
-        # Get logger instance
-        logger = get_logger(session_id)
+    # Coalesce file changes and tool timings spooled during this turn
+    session_manager.merge_spools(session_id)
 
-        # Parse transcript to extract messages
-        messages = logger.parse_transcript(transcript_path)
+    # Get logger instance
+    logger = get_logger(session_id)
 
-        # Extract Claude's responses (role == "assistant")
-        claude_responses = logger.extract_claude_responses(messages)
+    # Parse transcript to extract messages
+    messages = logger.parse_transcript(transcript_path, hook_data.get("transcript_offset"))
 
-        if not claude_responses:
-            # No responses to log
-            sys.exit(0)
+    # Extract Claude's responses (role == "assistant")
+    claude_responses = logger.extract_claude_responses(messages)
+
+    if not claude_responses:
+        # No responses to log
+        return
+
+    # Get session data to check if we've already logged these responses
+    session_data = session_manager.load_session(session_id)
+    existing_response_count = len(session_data.get("responses", []))
+
+    # Log only new responses (not already in session)
+    # Note: This is a simple heuristic - we assume responses are added sequentially
+    new_responses = claude_responses[existing_response_count:]
 
-        # Get session data to check if we've already logged these responses
-        session_data = session_manager.load_session(session_id)
-        existing_response_count = len(session_data.get("responses", []))
+    # Files changed since the previous Stop (None outside git or before a baseline)
+    turn_diff = snapshot_turn(session_id, hook_data.get("snapshot_tree")) if new_responses else None
 
-        # Log only new responses (not already in session)
-        # Note: This is a simple heuristic - we assume responses are added sequentially
-        new_responses = claude_responses[existing_response_count:]
+    for index, response in enumerate(new_responses):
+        # The diff belongs to the turn, so it goes under the turn's last response
+        response_diff = turn_diff if index == len(new_responses) - 1 else None
 
-        for response in new_responses:
-            # Log response to markdown file
-            logger.log_claude_response(response, session_id, response_type="agent")
+        # Log response to markdown file
+        logger.log_claude_response(response, session_id, response_type="agent", turn_diff=response_diff)
 
-            # Update session JSON
-            session_manager.add_response(session_id, response, response_type="agent")
+        # Update session JSON
+        session_manager.add_response(session_id, response, response_type="agent", turn_diff=response_diff)
 
-        if new_responses:
-            print(f"✓ Logged {len(new_responses)} Claude response(s) to session {session_id}", file=sys.stderr)
+    if new_responses:
+        print(f"✓ Logged {len(new_responses)} Claude response(s) to session {session_id}", file=sys.stderr)
+
+
+def main():
+    """Handle Stop (agent stop) event."""
+    try:
+        # Read hook data from stdin
+        hook_data = json.load(sys.stdin)
+
+        # Extract session ID
+        session_id = hook_data.get("session_id", "unknown")
+
+        if session_id == "unknown":
+            print("Warning: No valid session_id in Stop hook", file=sys.stderr)
+            sys.exit(0)
+
+        # Pin the turn's end now: the worker may run after the next turn started
+        transcript_path = hook_data.get("transcript_path", "")
+        try:
+            hook_data["transcript_offset"] = os.path.getsize(transcript_path)
+        except OSError:
+            pass
+        hook_data["snapshot_tree"] = take_snapshot(session_id)
+
+        # Hand the transcript parsing and diff rendering off to the background worker
+        submit("agent_stop", hook_data)
 
         # Exit successfully
         sys.exit(0)
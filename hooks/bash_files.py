@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Bash File-Target Extraction
+=============================================
+Works out which files a Bash command writes, so file tracking covers changes
+made through the shell and not only through Edit/Write.
+
+Key Features:
+- shlex-based tokenizer that keeps quoting, so a quoted ">" is an argument,
+  not a redirection; heredoc bodies and line continuations are handled
+- Splits command lists (;, &&, ||, |, newlines) and follows `cd` between them
+- Rules for common commands: redirections (>, >>, &>), tee, touch, rm, mv,
+  cp, install, ln, truncate, dd of=, sed -i, perl -i, git mv/rm/restore
+- Rules for the skill CLIs in skills/ (e.g. convert-pdf-to-markdown writes
+  <input>.md, update-changelog writes CHANGELOG.md)
+- Purely syntactic: no command execution, and the only files read are
+  "@list" arguments of skill CLIs (the PDFs an @list names are the targets)
+
+Usage:
+    from bash_files import extract_bash_targets
+    extract_bash_targets("sed -i 's/a/b/' src/x.py > log.txt", "/project")
+    # -> ("/project/src/x.py", "/project/log.txt")
+"""
+
+import os
+import re
+import shlex
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# ===== CONFIGURATION =====
+# Redirections whose next word is a file that gets written
+WRITE_REDIRECTS = {">", ">>", ">|", "&>", "&>>", ">&"}
+
+# Redirections whose next word is only read (or is a heredoc delimiter)
+READ_REDIRECTS = {"<", "<<", "<<<", "<<-", "<>"}
+
+# Prefixes that run the rest of the command
+WRAPPERS = {"sudo", "env", "time", "nohup", "command", "exec", "nice", "builtin"}
+
+# convert-pdf-to-markdown options that take a value; --report and --chunks
+# take one only when a non-option word follows. These mirror the argparse
+# options in main() of skills/convert-pdf-to-markdown/convert-pdf-to-markdown.py
+# (and REPORT_NAME there) - change both together
+PDF_TO_MARKDOWN_VALUE_OPTIONS = ("--jobs", "-j", "--timeout", "--memory-limit", "--max-tasks-per-worker",
+                                 "--retry-list", "--include", "--exclude", "--output-dir", "-o",
+                                 "--ocr-language")
+PDF_TO_MARKDOWN_OPTIONAL_VALUE = ("--report", "--chunks")
+PDF_TO_MARKDOWN_REPORT = "convert-pdf-to-markdown-report.json"
+
+HEREDOC = re.compile(r"<<-?\s*(['\"]?)([A-Za-z_][A-Za-z0-9_]*)\1")
+ASSIGNMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+
+
+def _strip_heredocs(command: str) -> str:
+    """Drop heredoc bodies (they are stdin text, not arguments)."""
+    if "<<" not in command:
+        return command
+
+    kept = []
+    delimiters: List[str] = []
+    for line in command.split("\n"):
+        if delimiters:
+            if line.strip() == delimiters[0]:
+                delimiters.pop(0)
+            continue
+        kept.append(line)
+        delimiters.extend(match.group(2) for match in HEREDOC.finditer(line))
+    return "\n".join(kept)
+
+
+def _unquote(word: str) -> str:
+    """Remove shell quoting from one word."""
+    if not any(char in word for char in "'\"\\"):
+        return word
+    try:
+        parts = shlex.split(word)
+    except ValueError:
+        return word.strip("'\"")
+    return parts[0] if len(parts) == 1 else word
+
+
+def tokenize(command: str) -> Optional[List[Tuple[str, bool]]]:
+    """
+    Split a command line into words and operators.
+
+    Args:
+        command: Bash command string
+
+    Returns:
+        List of (token, is_operator), or None if the command can't be parsed
+    """
+    command = _strip_heredocs(command.replace("\\\n", " "))
+    lexer = shlex.shlex(command.replace("\n", " ; "), posix=False, punctuation_chars=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    try:
+        raw = list(lexer)
+    except ValueError:
+        return None
+
+    tokens = []
+    for token in raw:
+        if token and all(char in "();<>|&" for char in token):
+            tokens.append((token, True))
+        else:
+            tokens.append((_unquote(token), False))
+    return tokens
+
+
+def _positional(args: List[str], value_options: Tuple[str, ...] = ()) -> List[str]:
+    """Get non-option arguments (options in value_options consume the next word)."""
+    result = []
+    skip = False
+    options_done = False
+    for arg in args:
+        if skip:
+            skip = False
+            continue
+        if options_done or arg == "-" or not arg.startswith("-"):
+            result.append(arg)
+        elif arg == "--":
+            options_done = True
+        elif arg in value_options:
+            skip = True
+    return result
+
+
+def _option_value(args: List[str], names: Tuple[str, ...]) -> Optional[str]:
+    """Get the value of an option given as "-x VALUE", "--name VALUE" or "--name=VALUE"."""
+    for index, arg in enumerate(args):
+        for name in names:
+            if arg == name and index + 1 < len(args):
+                return args[index + 1]
+            if name.startswith("--") and arg.startswith(name + "="):
+                return arg[len(name) + 1:]
+    return None
+
+
+# ----- Command rules: args (after the command name) -> written paths -----
+
+def _all_operands(args: List[str]) -> List[str]:
+    return _positional(args)
+
+
+def _last_operand(args: List[str]) -> List[str]:
+    target_dir = _option_value(args, ("-t", "--target-directory"))
+    if target_dir:
+        return [target_dir]
+    operands = _positional(args, ("-m", "--mode", "-o", "--owner", "-g", "--group", "-S", "--suffix"))
+    return operands[-1:] if len(operands) > 1 else []
+
+
+def _mv(args: List[str]) -> List[str]:
+    operands = _positional(args, ("-S", "--suffix"))
+    target_dir = _option_value(args, ("-t", "--target-directory"))
+    return operands + [target_dir] if target_dir else operands
+
+
+def _ln(args: List[str]) -> List[str]:
+    operands = _positional(args, ("-S", "--suffix", "-t", "--target-directory"))
+    if len(operands) == 1:
+        return [os.path.basename(operands[0].rstrip("/"))]
+    return operands[-1:]
+
+
+def _truncate(args: List[str]) -> List[str]:
+    return _positional(args, ("-s", "--size", "-r", "--reference"))
+
+
+def _dd(args: List[str]) -> List[str]:
+    return [arg[3:] for arg in args if arg.startswith("of=")]
+
+
+def _sed(args: List[str]) -> List[str]:
+    if not any(arg.startswith("-i") or arg.startswith("--in-place") for arg in args):
+        return []
+    has_script_option = any(arg in ("-e", "-f") or arg.startswith(("--expression", "--file")) for arg in args)
+    operands = _positional(args, ("-e", "-f", "-l", "--expression", "--file", "--line-length"))
+    return operands if has_script_option else operands[1:]
+
+
+def _perl(args: List[str]) -> List[str]:
+    in_place = any(arg.startswith("-") and not arg.startswith("--") and "i" in arg.split(".")[0][1:]
+                   for arg in args)
+    if not in_place:
+        return []
+    files = []
+    skip = False
+    has_script = False
+    for arg in args:
+        if skip:
+            skip = False
+            has_script = True
+            continue
+        if arg.startswith("-") and not arg.startswith("--"):
+            # -e / -E take the script as the next word (also at the end of a cluster like -pie)
+            flags = arg.split(".")[0][1:]
+            skip = flags.endswith(("e", "E"))
+            continue
+        if not has_script:
+            has_script = True
+            continue
+        files.append(arg)
+    return files
+
+
+def _git(args: List[str]) -> List[str]:
+    if not args:
+        return []
+    subcommand, rest = args[0], args[1:]
+    if subcommand in ("mv", "rm"):
+        return _positional(rest)
+    if subcommand in ("restore", "checkout") and "--" in rest:
+        return rest[rest.index("--") + 1:]
+    return []
+
+
+COMMAND_RULES: Dict[str, Callable[[List[str]], List[str]]] = {
+    "touch": _all_operands,
+    "rm": _all_operands,
+    "tee": _all_operands,
+    "shred": _all_operands,
+    "unlink": _all_operands,
+    "mv": _mv,
+    "cp": _last_operand,
+    "install": _last_operand,
+    "ln": _ln,
+    "truncate": _truncate,
+    "dd": _dd,
+    "sed": _sed,
+    "gsed": _sed,
+    "perl": _perl,
+    "git": _git,
+}
+
+
+# ----- Skill CLI rules (skills/<name>/<name>.py, optional "NN-" prefix) -----
+
+def _skill_inputs_with_suffix(suffix: str) -> Callable[[List[str]], List[str]]:
+    """Outputs next to each comma-separated input file, with a new suffix (folders as-is)."""
+    def rule(args: List[str]) -> List[str]:
+        operands = _positional(args)
+        if not operands:
+            return []
+        targets = []
+        for item in operands[0].split(","):
+            item = item.strip()
+            root, extension = os.path.splitext(item)
+            targets.append(root + suffix if extension else item)
+        return targets
+    return rule
+
+
+def _read_list_file(path: str) -> List[str]:
+    """Get the names in an @list file, one per line (empty if it can't be read)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+def _skill_pdf_to_markdown(args: List[str]) -> List[str]:
+    """<input>.md per PDF (in --output-dir if given), plus chunk folders and the report."""
+    words: List[str] = []
+    optional: Dict[str, str] = {}
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        if arg == "--":
+            words.extend(args[index:])
+            break
+        name, equals, value = arg.partition("=")
+        if name in PDF_TO_MARKDOWN_OPTIONAL_VALUE:
+            if not equals and index + 1 < len(args) and not args[index + 1].startswith("-"):
+                index += 1
+                value = args[index]
+            optional[name] = value
+        else:
+            words.append(arg)
+        index += 1
+
+    operands = _positional(words, PDF_TO_MARKDOWN_VALUE_OPTIONS)
+    if not operands:
+        return []
+    output_dir = _option_value(words, ("--output-dir", "-o"))
+    chunks = "--chunks" in optional and optional["--chunks"] != "0"
+
+    source = operands[0]
+    if source.startswith("@"):
+        items = _read_list_file(source[1:])
+    else:
+        items = [item.strip() for item in source.split(",") if item.strip()]
+
+    targets = []
+    for item in items:
+        root, extension = os.path.splitext(item)
+        if not extension:
+            # Folder mode: Markdown (and chunk folders) mirror the tree
+            targets.append(output_dir or item)
+            continue
+        markdown = os.path.join(output_dir, os.path.basename(root) + ".md") if output_dir else root + ".md"
+        targets.append(markdown)
+        if chunks:
+            targets.append(markdown[:-3] + ".chunks")
+    if "--report" in optional:
+        targets.append(optional["--report"] or PDF_TO_MARKDOWN_REPORT)
+    return targets
+
+
+def _skill_output_or(position: int, fallback: str) -> Callable[[List[str]], List[str]]:
+    """The explicit output argument, else the input file ("input") or its folder ("dir")."""
+    def rule(args: List[str]) -> List[str]:
+        operands = _positional(args, ("--style",))
+        if len(operands) > position:
+            return [operands[position]]
+        if len(operands) > position - 1 >= 0:
+            source = operands[position - 1]
+            return [source if fallback == "input" else (os.path.dirname(source) or ".")]
+        return []
+    return rule
+
+
+def _skill_operand(position: int) -> Callable[[List[str]], List[str]]:
+    """A folder or file argument the skill rewrites in place."""
+    def rule(args: List[str]) -> List[str]:
+        operands = _positional(args)
+        return [operands[position]] if len(operands) > position else []
+    return rule
+
+
+def _skill_fixed(*names: str) -> Callable[[List[str]], List[str]]:
+    """Files the skill always writes in the working directory."""
+    return lambda args: list(names)
+
+
+def _skill_pdf_split(args: List[str]) -> List[str]:
+    output_dir = _option_value(args, ("--output-dir", "-o"))
+    ranges = _option_value(args, ("--ranges", "-r"))
+    if ranges:
+        return [part.split(":", 1)[1] for part in ranges.split(",") if ":" in part]
+    if output_dir:
+        return [output_dir]
+    operands = _positional(args, ("--ranges", "-r", "--csv", "-c", "--output-dir", "-o"))
+    return [os.path.dirname(operands[0]) or "."] if operands else []
+
+
+SKILL_RULES: Dict[str, Callable[[List[str]], List[str]]] = {
+    "convert-pdf-to-markdown": _skill_pdf_to_markdown,
+    "convert-docx-to-pdf": _skill_inputs_with_suffix(".pdf"),
+    "convert-md-to-docx": _skill_output_or(1, "dir"),
+    "msword-format-table": _skill_output_or(1, "dir"),
+    "msword-move-citation-before-period": _skill_output_or(1, "dir"),
+    "msword-italicize-english-terms": _skill_output_or(2, "dir"),
+    "msword-remove-headers-footers": _skill_operand(0),
+    "pdf-split-pages": _skill_pdf_split,
+    "chapter-modify-numbering": _skill_operand(0),
+    "chapter-organizer": _skill_operand(1),
+    "chapter-orkestrasi-pembenahan": _skill_operand(0),
+    "sop-improvement-orchestration": _skill_operand(0),
+    "sanitize-filenames": _skill_operand(0),
+    "update-changelog": _skill_fixed("CHANGELOG.md"),
+    "update-progresslog": _skill_fixed("PROGRESS.md"),
+}
+
+
+def _skill_name(script: str) -> Optional[str]:
+    """Map a script path to a SKILL_RULES key (None if it isn't a skill CLI)."""
+    if not script.endswith(".py"):
+        return None
+    name = re.sub(r"^\d+-", "", os.path.basename(script)[:-3])
+    return name if name in SKILL_RULES else None
+
+
+def _targets_of_simple_command(words: List[str], cwd: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+    """
+    Get the paths one simple command writes.
+
+    Args:
+        words: Command words with redirections already removed
+        cwd: Directory the command runs in (for reading @list arguments)
+
+    Returns:
+        Tuple of (written paths, new working directory if this is `cd DIR`)
+    """
+    while words and (ASSIGNMENT.match(words[0]) or words[0] in WRAPPERS):
+        wrapper = words.pop(0)
+        if wrapper in ("env", "sudo", "nice"):
+            while words and (words[0].startswith("-") or ASSIGNMENT.match(words[0])):
+                words.pop(0)
+    if not words:
+        return [], None
+
+    name, args = os.path.basename(words[0]), words[1:]
+    if name == "cd":
+        return [], (args[0] if args and args[0] != "-" else None)
+
+    if name in COMMAND_RULES:
+        return COMMAND_RULES[name](args), None
+
+    # python/python3 [options] script.py args, or a directly executed script
+    if re.match(r"^python(\d+(\.\d+)?)?$", name):
+        operands = [arg for arg in args if not arg.startswith("-")]
+        if operands and "-m" not in args[:args.index(operands[0])]:
+            name, args = operands[0], args[args.index(operands[0]) + 1:]
+    skill = _skill_name(name if name.endswith(".py") else words[0])
+    if skill:
+        if cwd:
+            # Skill CLIs read "@list" relative to their working directory
+            args = ["@" + os.path.join(cwd, os.path.expanduser(arg[1:])) if arg.startswith("@") else arg
+                    for arg in args]
+        return SKILL_RULES[skill](args), None
+
+    return [], None
+
+
+def extract_bash_targets(command: str, cwd: Optional[str] = None) -> Tuple[str, ...]:
+    """
+    Get the files a Bash command writes.
+
+    Args:
+        command: Bash command string
+        cwd: Directory the command runs in (relative targets are resolved
+             against it, following any `cd` in the command)
+
+    Returns:
+        Tuple of written paths, de-duplicated, in command order
+    """
+    tokens = tokenize(command)
+    if not tokens:
+        return ()
+
+    targets: List[str] = []
+    current_dir = cwd
+    words: List[str] = []
+
+    def add_target(path: str):
+        if not path or path == "-" or path.startswith("/dev/") or any(char in path for char in "$`"):
+            return
+        path = os.path.expanduser(path)
+        if current_dir and not os.path.isabs(path):
+            path = os.path.join(current_dir, path)
+        targets.append(os.path.normpath(path))
+
+    def finish_command():
+        nonlocal current_dir
+        paths, new_dir = _targets_of_simple_command(words[:], current_dir)
+        words.clear()
+        for path in paths:
+            add_target(path)
+        if new_dir is not None and "$" not in new_dir:
+            new_dir = os.path.expanduser(new_dir)
+            current_dir = os.path.normpath(os.path.join(current_dir, new_dir)) if current_dir else new_dir
+
+    index = 0
+    while index < len(tokens):
+        token, is_operator = tokens[index]
+        if is_operator and token in WRITE_REDIRECTS | READ_REDIRECTS:
+            # An fd number just before the operator (2>file) isn't an argument
+            if words and words[-1].isdigit():
+                words.pop()
+            target = tokens[index + 1] if index + 1 < len(tokens) else ("", True)
+            if token in WRITE_REDIRECTS and not target[1]:
+                if not (token == ">&" and (target[0].isdigit() or target[0] == "-")):
+                    add_target(target[0])
+            index += 2
+        elif is_operator:
+            finish_command()
+            index += 1
+        else:
+            words.append(token)
+            index += 1
+    finish_command()
+
+    return tuple(dict.fromkeys(targets))
+
+
+if __name__ == "__main__":
+    """Print the targets of sample commands (or of the command given as arguments)."""
+    import sys
+
+    samples = [" ".join(sys.argv[1:])] if len(sys.argv) > 1 else [
+        "echo hi > out.txt 2>&1",
+        "grep '>' notes.md | tee -a log.txt > /dev/null",
+        "cd docs && sed -i 's/a/b/g' intro.md chapter1.md",
+        "perl -pi -e 's/x/y/' a.txt b.txt",
+        "mv old.py new.py && cp new.py backup/ && rm -f tmp.log",
+        "git mv src/a.py src/b.py; git commit -m 'x > y'",
+        "cat > notes.md <<'EOF'\nline > not-a-file\nEOF",
+        "python3 skills/convert-pdf-to-markdown/convert-pdf-to-markdown.py a.pdf,b.pdf",
+        "python3 convert-pdf-to-markdown.py --jobs 4 a.pdf -o out --chunks --report",
+        "python skills/update-changelog/update-changelog.py --type Added 'New feature'",
+        "ls -la",
+    ]
+    for sample in samples:
+        print(f"{sample!r}\n    -> {list(extract_bash_targets(sample, os.getcwd()))}", file=sys.stderr)
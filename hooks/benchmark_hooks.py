@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+"""
+Hook Pipeline Benchmark
+=============================================
+Replays synthetic Claude Code sessions against the hook scripts in this folder
+and reports per-event latency and I/O as session length scales.
+
+Key Features:
+- Synthesizes realistic payload streams (SessionStart, UserPromptSubmit,
+  PreToolUse bursts, Stop with a growing transcript, SubagentStop, SessionEnd)
+- Installs the hooks into a throwaway project root (<tmp>/.claude/hooks) so the
+  real project's dev-logs and session data are never touched
+- Reads hook registrations from settings.local.json, so newly registered
+  hooks are benchmarked automatically
+- Measures wall-clock latency per hook invocation and bytes read/written
+  (/proc/self/io on Linux minus interpreter startup, storage growth elsewhere)
+- Work a hook hands to the background queue (work_queue.py) is drained
+  synchronously right after the hook and reported as "<Event>:queued work",
+  so offloaded processing is measured instead of just the enqueue (hooks run
+  while the benchmark holds the worker lock, so they spawn no detached worker)
+- Runs several session lengths so O(N) / O(N²) growth shows up as numbers
+
+Usage:
+    python benchmark_hooks.py
+    python benchmark_hooks.py --turns 10,50,200 --tools-per-turn 20
+    python benchmark_hooks.py --match-all --json results.json
+
+Sounds are silenced during replay by shadowing `afplay` with a no-op.
+"""
+
+import sys
+import json
+import os
+import fcntl
+import re
+import shutil
+import argparse
+import tempfile
+import subprocess
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+
+HOOKS_DIR = Path(__file__).parent
+DEFAULT_SETTINGS = HOOKS_DIR.parent / "settings.local.json"
+
+# Runs a hook script as __main__ and reports the process I/O counters on exit.
+# argv: <script_path> <io_report_path>
+BOOTSTRAP = r"""
+import sys, json, runpy
+script, report = sys.argv[1], sys.argv[2]
+sys.argv = [script]
+sys.path.insert(0, script.rsplit('/', 1)[0])
+try:
+    runpy.run_path(script, run_name='__main__')
+finally:
+    counters = {}
+    try:
+        with open('/proc/self/io') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                counters[key.strip()] = int(value)
+    except OSError:
+        pass
+    with open(report, 'w') as f:
+        json.dump(counters, f)
+"""
+
+TOOL_MIX = ["Read", "Edit", "Bash", "Read", "Glob", "Write", "Bash", "TodoWrite", "Read", "Edit"]
+
+
+def load_hook_registry(settings_path: Path) -> Dict[str, List[Tuple[Optional[str], str]]]:
+    """
+    Build the event → hook script mapping from a Claude settings file.
+
+    Args:
+        settings_path: Path to settings.json / settings.local.json
+
+    Returns:
+        Dictionary of event name to list of (matcher, script filename)
+    """
+    with open(settings_path, 'r', encoding='utf-8') as f:
+        settings = json.load(f)
+
+    registry: Dict[str, List[Tuple[Optional[str], str]]] = {}
+    for event_name, entries in settings.get("hooks", {}).items():
+        for entry in entries:
+            matcher = entry.get("matcher")
+            for hook in entry.get("hooks", []):
+                match = re.search(r'hooks/([\w\-]+\.py)', hook.get("command", ""))
+                if match and (HOOKS_DIR / match.group(1)).exists():
+                    registry.setdefault(event_name, []).append((matcher, match.group(1)))
+
+    return registry
+
+
+def install_hooks(project_root: Path, init_git: bool = True) -> Path:
+    """
+    Copy the hook scripts into a temporary project root.
+
+    Args:
+        project_root: Temporary project directory
+        init_git: Initialize a git repository so git probes are exercised
+
+    Returns:
+        Path to the installed hooks directory
+    """
+    hooks_dir = project_root / ".claude" / "hooks"
+    hooks_dir.mkdir(parents=True)
+    for script in HOOKS_DIR.glob("*.py"):
+        shutil.copy2(script, hooks_dir / script.name)
+
+    # No-op audio player so replay is silent
+    bin_dir = project_root / ".bench-bin"
+    bin_dir.mkdir()
+    afplay = bin_dir / "afplay"
+    afplay.write_text("#!/bin/sh\nexit 0\n")
+    afplay.chmod(0o755)
+
+    if init_git:
+        subprocess.run(["git", "init", "-q"], cwd=project_root,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        (project_root / "README.md").write_text("# Benchmark project\n")
+
+    return hooks_dir
+
+
+def _tool_input(tool_name: str, project_root: Path, index: int, write_bytes: int) -> Dict[str, Any]:
+    """Build a plausible tool_input for a synthetic PreToolUse event."""
+    file_path = str(project_root / "src" / f"module_{index % 50}.py")
+
+    if tool_name == "Read":
+        return {"file_path": file_path}
+    if tool_name == "Edit":
+        return {"file_path": file_path, "old_string": "x = 1\n" * 20, "new_string": "x = 2\n" * 20}
+    if tool_name == "Write":
+        return {"file_path": file_path, "content": "# generated\n" * (write_bytes // 12)}
+    if tool_name == "Glob":
+        return {"pattern": f"src/**/*_{index % 7}.py"}
+    if tool_name == "Bash":
+        commands = ["ls -la", "pytest -q", "git status", f"sed -i 's/a/b/' src/module_{index % 50}.py"]
+        return {"command": commands[index % len(commands)]}
+    if tool_name == "TodoWrite":
+        return {"todos": [{"content": f"Task {i}", "status": "pending"} for i in range(5)]}
+    return {}
+
+
+def synthesize_session(project_root: Path, turns: int, tools_per_turn: int,
+                       subagent_every: int = 5, write_bytes: int = 20000):
+    """
+    Generate a synthetic session as a stream of hook payloads.
+
+    The transcript file grows as the stream is consumed: each Stop event is
+    yielded only after the turn's assistant messages were appended, matching
+    what Claude Code does.
+
+    Args:
+        project_root: Temporary project root
+        turns: Number of user prompt / Stop cycles
+        tools_per_turn: PreToolUse events per turn
+        subagent_every: Emit a SubagentStop every N turns (0 disables)
+        write_bytes: Approximate size of Write tool payloads
+
+    Yields:
+        Hook payload dictionaries
+    """
+    session_id = str(uuid.uuid4())
+    transcript = project_root / "transcripts" / f"{session_id}.jsonl"
+    transcript.parent.mkdir(parents=True, exist_ok=True)
+    transcript.touch()
+    base = {"session_id": session_id, "transcript_path": str(transcript), "cwd": str(project_root)}
+
+    yield {**base, "hook_event_name": "SessionStart", "source": "startup"}
+
+    tool_index = 0
+    for turn in range(turns):
+        prompt = f"Turn {turn}: please revise chapter {turn % 12} and update the SOP tables. " * 3
+        yield {**base, "hook_event_name": "UserPromptSubmit", "prompt": prompt}
+
+        with open(transcript, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"role": "user", "content": prompt}) + "\n")
+
+        for _ in range(tools_per_turn):
+            tool_name = TOOL_MIX[tool_index % len(TOOL_MIX)]
+            tool_use_id = f"toolu_{tool_index:06d}"
+            tool_input = _tool_input(tool_name, project_root, tool_index, write_bytes)
+            yield {**base, "hook_event_name": "PreToolUse", "tool_name": tool_name,
+                   "tool_use_id": tool_use_id, "tool_input": tool_input}
+            yield {**base, "hook_event_name": "PostToolUse", "tool_name": tool_name,
+                   "tool_use_id": tool_use_id, "tool_input": tool_input,
+                   "tool_response": {"success": True}}
+            tool_index += 1
+
+        with open(transcript, "a", encoding="utf-8") as f:
+            text = f"Done with turn {turn}. Updated the chapter and tables.\n" * 10
+            f.write(json.dumps({"role": "assistant", "content": [{"type": "text", "text": text}]}) + "\n")
+
+        if subagent_every and turn % subagent_every == subagent_every - 1:
+            yield {**base, "hook_event_name": "SubagentStop", "subagent_type": "Explore",
+                   "description": f"Survey chapter {turn % 12}"}
+
+        yield {**base, "hook_event_name": "Stop", "stop_hook_active": False}
+
+    yield {**base, "hook_event_name": "SessionEnd", "reason": "exit"}
+
+
+def _matches(matcher: Optional[str], payload: Dict[str, Any]) -> bool:
+    """Apply a settings matcher (regex on tool_name) the way Claude Code does."""
+    if not matcher or matcher == "*":
+        return True
+    return re.fullmatch(matcher, payload.get("tool_name", "")) is not None
+
+
+def _tree_size(root: Path) -> int:
+    """Total size of generated files under the project root (fallback I/O metric)."""
+    total = 0
+    for sub in (".claude/data", "dev-logs"):
+        for path in (root / sub).rglob("*"):
+            if path.is_file():
+                total += path.stat().st_size
+    return total
+
+
+def run_hook(script: Path, payload: Dict[str, Any], env: Dict[str, str],
+             project_root: Path, baseline: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Run one hook script with a payload and measure it.
+
+    Args:
+        script: Installed hook script path
+        payload: Hook payload to send on stdin
+        env: Environment for the child process
+        project_root: Temporary project root (for the storage-growth fallback)
+        baseline: Interpreter startup cost to subtract from I/O counters
+
+    Returns:
+        Dictionary with seconds, read_bytes, write_bytes and returncode
+    """
+    data = json.dumps(payload).encode("utf-8")
+    report = project_root / ".bench-io.json"
+    size_before = _tree_size(project_root) if sys.platform != "linux" else 0
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", BOOTSTRAP, str(script), str(report)],
+        input=data,
+        cwd=project_root,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    elapsed = time.perf_counter() - start
+
+    counters = {}
+    try:
+        counters = json.loads(report.read_text())
+    except (OSError, json.JSONDecodeError):
+        pass
+
+    if counters:
+        baseline = baseline or {}
+        read_bytes = max(0, counters.get("rchar", 0) - baseline.get("read_bytes", 0))
+        write_bytes = max(0, counters.get("wchar", 0) - baseline.get("write_bytes", 0))
+    else:
+        read_bytes = len(data)
+        write_bytes = max(0, _tree_size(project_root) - size_before)
+
+    return {
+        "seconds": elapsed,
+        "read_bytes": read_bytes,
+        "write_bytes": write_bytes,
+        "returncode": result.returncode,
+    }
+
+
+def _hold_worker_lock(project_root: Path):
+    """
+    Take the work queue's worker lock, so hooks enqueue work without starting a worker.
+
+    Args:
+        project_root: Temporary project root
+
+    Returns:
+        Open lock file handle (close it to release the lock)
+    """
+    queue_dir = project_root / ".claude" / "data" / "queue"
+    queue_dir.mkdir(parents=True, exist_ok=True)
+    handle = open(queue_dir / "worker.lock", "a")
+    fcntl.flock(handle, fcntl.LOCK_EX)
+    return handle
+
+
+def _queued_jobs(project_root: Path) -> bool:
+    """Check whether a hook left work in the background queue."""
+    return any((project_root / ".claude" / "data" / "queue" / "new").glob("*.json"))
+
+
+def measure_baseline(project_root: Path, env: Dict[str, str], runs: int = 3) -> Dict[str, Any]:
+    """
+    Measure the cost of starting the interpreter and running an empty hook.
+
+    Args:
+        project_root: Temporary project root
+        env: Environment for the child process
+        runs: Number of runs (the cheapest one is kept)
+
+    Returns:
+        Dictionary with seconds, read_bytes and write_bytes
+    """
+    noop = project_root / ".bench-bin" / "noop.py"
+    noop.write_text("import sys\nsys.stdin.read()\n")
+    samples = [run_hook(noop, {}, env, project_root) for _ in range(runs)]
+    return {
+        "seconds": min(s["seconds"] for s in samples),
+        "read_bytes": min(s["read_bytes"] for s in samples),
+        "write_bytes": min(s["write_bytes"] for s in samples),
+    }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def replay_session(turns: int, tools_per_turn: int, registry: Dict[str, List[Tuple[Optional[str], str]]],
+                   init_git: bool = True, write_bytes: int = 20000,
+                   match_all: bool = False) -> Dict[str, Any]:
+    """
+    Replay one synthetic session in a fresh temporary project root.
+
+    Args:
+        turns: Number of prompt/Stop cycles
+        tools_per_turn: PreToolUse events per turn
+        registry: Event → hook script mapping
+        init_git: Initialize a git repository in the temporary root
+        write_bytes: Approximate size of Write tool payloads
+        match_all: Ignore tool matchers and send every tool event to its hooks
+
+    Returns:
+        Per-hook statistics plus session totals
+    """
+    with tempfile.TemporaryDirectory(prefix="hook-bench-") as tmp:
+        project_root = Path(tmp)
+        hooks_dir = install_hooks(project_root, init_git=init_git)
+        env = dict(os.environ)
+        env["PATH"] = f"{project_root / '.bench-bin'}{os.pathsep}{env.get('PATH', '')}"
+
+        baseline = measure_baseline(project_root, env)
+        flush = project_root / ".bench-bin" / "flush_queue.py"
+        flush.write_text(f"import sys\nsys.path.insert(0, {str(hooks_dir)!r})\n"
+                         "from work_queue import flush_queue\nflush_queue()\n")
+        samples: Dict[str, List[Dict[str, Any]]] = {}
+        for payload in synthesize_session(project_root, turns, tools_per_turn, write_bytes=write_bytes):
+            event_name = payload["hook_event_name"]
+            for matcher, script_name in registry.get(event_name, []):
+                if not match_all and not _matches(matcher, payload):
+                    continue
+                # SessionEnd drains the queue itself, so it must get the lock
+                lock = _hold_worker_lock(project_root) if event_name != "SessionEnd" else None
+                try:
+                    sample = run_hook(hooks_dir / script_name, payload, env, project_root, baseline)
+                finally:
+                    if lock:
+                        lock.close()
+                samples.setdefault(f"{event_name}:{script_name}", []).append(sample)
+                if _queued_jobs(project_root):
+                    # Do the offloaded work before the next event
+                    sample = run_hook(flush, {}, env, project_root, baseline)
+                    samples.setdefault(f"{event_name}:queued work", []).append(sample)
+
+        hooks = {}
+        for key, runs in samples.items():
+            seconds = [r["seconds"] for r in runs]
+            quarter = max(1, len(seconds) // 4)
+            hooks[key] = {
+                "count": len(runs),
+                "mean_ms": 1000 * sum(seconds) / len(seconds),
+                "p95_ms": 1000 * _percentile(seconds, 95),
+                "max_ms": 1000 * max(seconds),
+                "first_quarter_ms": 1000 * sum(seconds[:quarter]) / quarter,
+                "last_quarter_ms": 1000 * sum(seconds[-quarter:]) / quarter,
+                "read_bytes": sum(r["read_bytes"] for r in runs),
+                "write_bytes": sum(r["write_bytes"] for r in runs),
+                "failures": sum(1 for r in runs if r["returncode"] != 0),
+            }
+
+        return {
+            "turns": turns,
+            "tools_per_turn": tools_per_turn,
+            "hooks": hooks,
+            "baseline_ms": 1000 * baseline["seconds"],
+            "total_seconds": sum(h["mean_ms"] * h["count"] for h in hooks.values()) / 1000,
+            "total_read_bytes": sum(h["read_bytes"] for h in hooks.values()),
+            "total_write_bytes": sum(h["write_bytes"] for h in hooks.values()),
+        }
+
+
+def _format_bytes(count: int) -> str:
+    """Human-readable byte count."""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if count < 1024 or unit == "GB":
+            return f"{count:.0f}{unit}" if unit == "B" else f"{count:.1f}{unit}"
+        count /= 1024
+    return f"{count}B"
+
+
+def print_report(results: List[Dict[str, Any]]):
+    """Print a per-hook latency/I/O table for each session length."""
+    for result in results:
+        print("\n" + "=" * 100)
+        print(f"Session: {result['turns']} turns × {result['tools_per_turn']} tools/turn "
+              f"— {result['total_seconds']:.2f}s in hooks, "
+              f"read {_format_bytes(result['total_read_bytes'])}, "
+              f"wrote {_format_bytes(result['total_write_bytes'])}")
+        print(f"(interpreter startup baseline: {result['baseline_ms']:.1f}ms, "
+              f"excluded from read/write columns)")
+        print("=" * 100)
+        print(f"{'Event:hook':<42} {'count':>6} {'mean':>8} {'p95':>8} {'max':>8} "
+              f"{'1st¼':>8} {'last¼':>8} {'read':>9} {'write':>9}")
+        for key in sorted(result["hooks"]):
+            h = result["hooks"][key]
+            flag = f"  ({h['failures']} failed)" if h["failures"] else ""
+            print(f"{key:<42} {h['count']:>6} {h['mean_ms']:>7.1f}ms {h['p95_ms']:>6.1f}ms "
+                  f"{h['max_ms']:>6.1f}ms {h['first_quarter_ms']:>6.1f}ms {h['last_quarter_ms']:>6.1f}ms "
+                  f"{_format_bytes(h['read_bytes']):>9} {_format_bytes(h['write_bytes']):>9}{flag}")
+
+    if len(results) > 1:
+        print("\nScaling (mean ms per invocation by session length):")
+        keys = sorted({key for result in results for key in result["hooks"]})
+        header = "".join(f"{str(r['turns']) + ' turns':>12}" for r in results)
+        print(f"{'Event:hook':<42}{header}")
+        for key in keys:
+            row = "".join(
+                f"{r['hooks'][key]['mean_ms']:>10.1f}ms" if key in r["hooks"] else f"{'-':>12}"
+                for r in results
+            )
+            print(f"{key:<42}{row}")
+
+
+def main():
+    """Main entry point for the benchmark."""
+    parser = argparse.ArgumentParser(description="Replay synthetic sessions against the hook scripts.")
+    parser.add_argument("--turns", default="5,20,50",
+                        help="Comma-separated session lengths in turns (default: 5,20,50)")
+    parser.add_argument("--tools-per-turn", type=int, default=10,
+                        help="PreToolUse events per turn (default: 10)")
+    parser.add_argument("--write-bytes", type=int, default=20000,
+                        help="Approximate Write payload size in bytes (default: 20000)")
+    parser.add_argument("--settings", type=Path, default=DEFAULT_SETTINGS,
+                        help="Settings file with hook registrations (default: settings.local.json)")
+    parser.add_argument("--no-git", action="store_true",
+                        help="Do not initialize a git repository in the temporary project")
+    parser.add_argument("--match-all", action="store_true",
+                        help="Ignore tool matchers (e.g. TodoWrite|Bash) and replay every tool event")
+    parser.add_argument("--json", type=Path, help="Also write raw results to this JSON file")
+    args = parser.parse_args()
+
+    try:
+        turn_counts = [int(t) for t in args.turns.split(",") if t.strip()]
+    except ValueError:
+        print(f"Error: Invalid --turns value: {args.turns}", file=sys.stderr)
+        sys.exit(1)
+
+    if not args.settings.exists():
+        print(f"Error: Settings file not found: {args.settings}", file=sys.stderr)
+        sys.exit(1)
+
+    registry = load_hook_registry(args.settings)
+    if not registry:
+        print(f"Error: No hook scripts registered in {args.settings}", file=sys.stderr)
+        sys.exit(1)
+
+    results = []
+    for turns in turn_counts:
+        print(f"Replaying {turns} turns...", file=sys.stderr)
+        results.append(replay_session(turns, args.tools_per_turn, registry,
+                                      init_git=not args.no_git, write_bytes=args.write_bytes,
+                                      match_all=args.match_all))
+
+    print_report(results)
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\n✓ Raw results written to {args.json}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
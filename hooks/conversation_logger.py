@@ -11,7 +11,11 @@ Log Structure:
 Configuration:
 - One file per conversation/session (using session_id for persistence)
 - Full automatic logging: all prompts + responses + sub-agent activities
-- Metadata: timestamps, file changes, git status
+- Metadata: timestamps, file changes, git status, per-turn diff stats
+
+Compressed Logs:
+- With log_archive.COMPRESS_FINALIZED_LOGS, finalized logs are gzip/zstd
+  compressed in the background and restored if the session is resumed
 
 Session Persistence:
 - Uses SessionManager for file-based session tracking
@@ -23,11 +27,18 @@ import sys
 import json
 import subprocess
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 
 # Import the session manager
-from session_manager import SessionManager
+from session_manager import SessionManager, get_session_manager, active_seconds
+from git_snapshot import summarize_changes
+from log_archive import COMPRESS_FINALIZED_LOGS, decompress_log
+from work_queue import submit
+from tool_policy import get_tool_policy, extract_file_paths, IGNORE, COUNT
+
+# Files listed under a response's turn diff before the rest are summarized
+TURN_DIFF_MAX_FILES = 20
 
 
 class ConversationLogger:
@@ -43,7 +54,7 @@ class ConversationLogger:
         """
         self.base_dir = Path(base_dir)
         self.session_id = session_id
-        self.session_manager = SessionManager()
+        self.session_manager = get_session_manager()
 
     def _get_project_root(self) -> Path:
         """Get the project root directory (parent of .claude folder)."""
@@ -169,6 +180,64 @@ class ConversationLogger:
         except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
             return None
 
+    def _format_tool_latency_table(self, tool_stats: Dict[str, Any]) -> Optional[str]:
+        """
+        Render per-tool latency statistics as a markdown table.
+
+        Args:
+            tool_stats: "tool_stats" from the session JSON (paired Pre/PostToolUse)
+
+        Returns:
+            Markdown table sorted by total time, or None if nothing was profiled
+        """
+        if not tool_stats:
+            return None
+
+        rows = []
+        for tool, entry in tool_stats.items():
+            durations = sorted(entry.get("durations", []))
+            if not durations:
+                continue
+            # Nearest-rank 95th percentile of the recent samples (capped per tool)
+            p95 = durations[max(0, -(-95 * len(durations) // 100) - 1)]
+            outcomes = entry.get("outcomes", {})
+            failures = sum(count for outcome, count in outcomes.items() if outcome != "ok")
+            rows.append((entry.get("total_seconds", sum(durations)), tool, entry.get("count", len(durations)),
+                         p95, failures, entry.get("payload_chars", 0)))
+
+        if not rows:
+            return None
+
+        table = "| Tool | Calls | Total | p95 | Failed | Payload |\n"
+        table += "|------|------:|------:|----:|-------:|--------:|\n"
+        for total, tool, count, p95, failures, payload_chars in sorted(rows, reverse=True):
+            table += f"| {tool} | {count} | {total:.1f}s | {p95:.2f}s | {failures} | {payload_chars / 1024:.0f} KB |\n"
+
+        return table
+
+    def _format_turn_diff(self, turn_diff: List[Dict[str, Any]]) -> str:
+        """
+        Render the files changed during a turn.
+
+        Args:
+            turn_diff: Changes from git_snapshot.snapshot_turn
+
+        Returns:
+            Markdown block with a shortstat line and per-file counts
+        """
+        if not turn_diff:
+            return "**Changes this turn:** none\n"
+
+        block = f"**Changes this turn:** {summarize_changes(turn_diff)}\n"
+        for change in turn_diff[:TURN_DIFF_MAX_FILES]:
+            if change.get("binary"):
+                block += f"- `{change['path']}` (binary)\n"
+            else:
+                block += f"- `{change['path']}` (+{change['insertions']} -{change['deletions']})\n"
+        if len(turn_diff) > TURN_DIFF_MAX_FILES:
+            block += f"- ... and {len(turn_diff) - TURN_DIFF_MAX_FILES} more\n"
+        return block
+
     def _format_timestamp(self) -> str:
         """Get formatted timestamp for log entries."""
         return datetime.now().strftime("%H:%M:%S")
@@ -183,23 +252,15 @@ class ConversationLogger:
         Returns:
             List of file paths that were modified
         """
-        files = []
         tool_name = hook_data.get("tool_name", "")
         tool_input = hook_data.get("tool_input", {})
 
-        # Extract file path based on tool type
-        if tool_name in ["Edit", "Write", "Read"]:
-            file_path = tool_input.get("file_path")
-            if file_path:
-                files.append(file_path)
-        elif tool_name == "Bash":
-            # Try to extract files from bash commands (e.g., git add, touch, etc.)
-            command = tool_input.get("command", "")
-            # Simple heuristic: look for file paths in common commands
-            # This is not perfect but covers most cases
-            pass  # Could be enhanced if needed
+        # Read-only tools aren't file changes (see tool_policy.py)
+        if get_tool_policy(tool_name) in (IGNORE, COUNT):
+            return []
 
-        return files
+        # Bash commands are parsed for redirections, sed -i, mv, skill CLIs, ...
+        return extract_file_paths(tool_name, tool_input, hook_data.get("cwd"))
 
     def log_user_message(self, message: str, session_id: Optional[str] = None):
         """
@@ -280,7 +341,8 @@ class ConversationLogger:
         self._append_to_file(session_file, log_entry)
 
     def log_claude_response(self, response: str, session_id: Optional[str] = None,
-                           response_type: str = "agent"):
+                           response_type: str = "agent",
+                           turn_diff: Optional[List[Dict[str, Any]]] = None):
         """
         Log Claude's response from transcript.
 
@@ -288,6 +350,7 @@ class ConversationLogger:
             response: Claude's response text
             session_id: Session ID (uses self.session_id if not provided)
             response_type: Type of response ("agent" or "subagent")
+            turn_diff: Optional files changed during the turn (logged under the response)
         """
         sid = session_id or self.session_id
         if not sid:
@@ -314,9 +377,10 @@ class ConversationLogger:
 
 {response}
 
----
-
 """
+            if turn_diff is not None:
+                log_entry += self._format_turn_diff(turn_diff) + "\n"
+            log_entry += "---\n\n"
 
         self._append_to_file(session_file, log_entry)
 
@@ -328,15 +392,21 @@ class ConversationLogger:
             file_path: Path to the file
             content: Content to append
         """
+        if not file_path.exists():
+            # Resumed after the finalized log was compressed
+            decompress_log(file_path)
         with open(file_path, "a", encoding="utf-8") as f:
             f.write(content)
 
-    def parse_transcript(self, transcript_path: str) -> List[Dict[str, Any]]:
+    def parse_transcript(self, transcript_path: str,
+                         end_offset: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Parse a JSONL transcript file.
 
         Args:
             transcript_path: Path to the transcript file
+            end_offset: Stop at this byte offset (the transcript size when the
+                        turn ended), so later turns aren't included
 
         Returns:
             List of message dictionaries
@@ -344,9 +414,13 @@ class ConversationLogger:
         messages = []
 
         try:
-            with open(transcript_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
+            with open(transcript_path, 'rb') as f:
+                position = 0
+                for raw_line in f:
+                    position += len(raw_line)
+                    if end_offset is not None and position > end_offset:
+                        break
+                    line = raw_line.decode('utf-8', 'replace').strip()
                     if line:
                         try:
                             msg = json.loads(line)
@@ -434,6 +508,8 @@ class ConversationLogger:
             "files_modified": session_data.get("file_changes", []),
             "prompts_count": len(session_data.get("prompts", [])),
             "responses_count": len(session_data.get("responses", [])),
+            "tool_stats": session_data.get("tool_stats", {}),
+            "tool_counts": session_data.get("tool_counts", {}),
             "git_status": self._get_git_status(),
             "git_diff": self._get_git_diff_summary(),
         }
@@ -450,7 +526,8 @@ class ConversationLogger:
             print("Warning: No session_id provided for finalizing session", file=sys.stderr)
             return
 
-        session_data = self.session_manager.load_session(sid)
+        # Pick up file changes and tool timings spooled since the last Stop
+        session_data = self.session_manager.merge_spools(sid, final=True)
         if not session_data:
             print(f"Warning: No session data found for session {sid}", file=sys.stderr)
             return
@@ -461,8 +538,7 @@ class ConversationLogger:
             return
 
         session_end = datetime.now()
-        session_start = datetime.fromisoformat(session_data.get("start_time", session_end.isoformat()))
-        duration = session_end - session_start
+        duration = timedelta(seconds=round(active_seconds(session_data, until=session_end)))
 
         files_modified = session_data.get("file_changes", [])
 
@@ -484,6 +560,15 @@ class ConversationLogger:
                 footer += f"- `{file_path}`\n"
             footer += "\n"
 
+        tool_table = self._format_tool_latency_table(session_data.get("tool_stats", {}))
+        if tool_table:
+            footer += f"**Tool Latency:**\n\n{tool_table}\n"
+
+        tool_counts = session_data.get("tool_counts", {})
+        if tool_counts:
+            ranked = sorted(tool_counts.items(), key=lambda item: item[1], reverse=True)
+            footer += "**Tool Calls (counted):** " + ", ".join(f"{tool} {count}" for tool, count in ranked) + "\n\n"
+
         git_status = self._get_git_status()
         if git_status:
             footer += f"**Final Git Status:**\n```\n{git_status}\n```\n\n"
@@ -497,11 +582,17 @@ class ConversationLogger:
         # Mark session as finalized in session manager
         self.session_manager.finalize_session(sid)
 
+        if COMPRESS_FINALIZED_LOGS:
+            submit("log_archive", {"session_id": sid, "log_file": str(session_file)})
+
 
 # Convenience functions for use in hooks
+_loggers: Dict[Optional[str], ConversationLogger] = {}
+
+
 def get_logger(session_id: Optional[str] = None) -> ConversationLogger:
     """
-    Get a ConversationLogger instance.
+    Get the per-process ConversationLogger instance for a session.
 
     Args:
         session_id: Optional session ID for session-aware operations
@@ -509,7 +600,9 @@ def get_logger(session_id: Optional[str] = None) -> ConversationLogger:
     Returns:
         ConversationLogger instance
     """
-    return ConversationLogger(session_id=session_id)
+    if session_id not in _loggers:
+        _loggers[session_id] = ConversationLogger(session_id=session_id)
+    return _loggers[session_id]
 
 
 def log_to_markdown(event_type: str, content: str, session_id: str,
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Rotating JSONL Debug Log
+=============================================
+Compact, size-capped debug log for hook payloads.
+
+Key Features:
+- One compact JSON object per line (valid JSONL)
+- Size-based rotation: hook_handler.jsonl → hook_handler.jsonl.1.gz → ... → .N.gz
+- Rotated segments are gzip-compressed; the oldest is dropped
+- Rotation is guarded by an flock so concurrent hooks rotate exactly once,
+  and the active file is renamed first so writers never lose lines
+- Optional per-event sampling rates
+
+Payload redaction happens upstream (payload_reader.read_hook_payload_redacted),
+so large tool_input bodies are never loaded just to be logged.
+"""
+
+import sys
+import os
+import json
+import gzip
+import fcntl
+import random
+import shutil
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+
+class RotatingJsonlLog:
+    """Append-only JSONL log with size-based, gzip-compressed rotation."""
+
+    def __init__(self, path: Path, max_bytes: int = 5 * 1024 * 1024, backups: int = 5,
+                 sample_rates: Optional[Dict[str, float]] = None):
+        """
+        Initialize the log.
+
+        Args:
+            path: Active log file path
+            max_bytes: Rotate once the active file grows past this size
+            backups: Number of gzip segments to keep
+            sample_rates: Fraction of events to keep per hook_event_name (default 1.0)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.sample_rates = sample_rates or {}
+
+    def _segment_path(self, index: int) -> Path:
+        """Get the path of rotated segment N (1 = newest)."""
+        return self.path.with_name(f"{self.path.name}.{index}.gz")
+
+    def should_log(self, event_name: str) -> bool:
+        """
+        Apply the sampling rate for an event type.
+
+        Args:
+            event_name: hook_event_name of the payload
+
+        Returns:
+            True if this event should be written
+        """
+        rate = self.sample_rates.get(event_name, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        """
+        Append one record, rotating afterwards if the file is over its cap.
+
+        Args:
+            record: JSON-serializable dictionary
+
+        Returns:
+            True if the record was written (False if sampled out or on error)
+        """
+        if not self.should_log(record.get("hook_event_name", "")):
+            return False
+
+        line = json.dumps({"logged_at": datetime.now().isoformat(), **record},
+                          ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                size = f.tell()
+        except IOError as e:
+            print(f"Warning: Failed to write debug log: {e}", file=sys.stderr)
+            return False
+
+        if size > self.max_bytes:
+            self.rotate()
+
+        return True
+
+    def rotate(self):
+        """Compress the active file into segment 1 and shift older segments."""
+        lock_path = self.path.with_name(f"{self.path.name}.lock")
+        with open(lock_path, "a") as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Another hook is already rotating
+                return
+
+            # Re-check: another process may have rotated before we got the lock
+            try:
+                if self.path.stat().st_size <= self.max_bytes:
+                    return
+            except FileNotFoundError:
+                return
+
+            # Move the active file aside first; new writes start a fresh file
+            pending = self.path.with_name(f"{self.path.name}.rotating")
+            os.replace(self.path, pending)
+
+            oldest = self._segment_path(self.backups)
+            if oldest.exists():
+                oldest.unlink()
+            for index in range(self.backups - 1, 0, -1):
+                segment = self._segment_path(index)
+                if segment.exists():
+                    os.replace(segment, self._segment_path(index + 1))
+
+            if self.backups > 0:
+                target = self._segment_path(1)
+                tmp_target = target.with_name(f"{target.name}.tmp")
+                with open(pending, "rb") as src, gzip.open(tmp_target, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp_target, target)
+            pending.unlink()
+
+
+def get_debug_log(path: Path, max_bytes: int, backups: int,
+                  sample_rates: Optional[Dict[str, float]] = None) -> RotatingJsonlLog:
+    """Get a RotatingJsonlLog instance."""
+    return RotatingJsonlLog(path, max_bytes=max_bytes, backups=backups, sample_rates=sample_rates)
+
+
+if __name__ == "__main__":
+    """Test rotation in a temporary directory."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log = RotatingJsonlLog(Path(tmp) / "test.jsonl", max_bytes=2000, backups=3)
+        for i in range(200):
+            log.write({"hook_event_name": "PreToolUse", "index": i, "tool_name": "Read"})
+
+        files = sorted(p.name for p in Path(tmp).iterdir())
+        print(f"Files after 200 writes: {files}", file=sys.stderr)
+
+        with gzip.open(Path(tmp) / "test.jsonl.1.gz", "rt", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        print(f"Segment 1 holds {len(records)} records", file=sys.stderr)
+        assert "test.jsonl.4.gz" not in files
+    print("Test completed successfully!", file=sys.stderr)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Git Working-Tree Snapshots
+=============================================
+Cheap per-turn diff stats: which turn produced which change.
+
+Key Features:
+- Snapshots the working tree (tracked + untracked, .gitignore respected) as a
+  git tree object with `git add -u` + `git write-tree` into a private index
+- Each session keeps its own index (.claude/data/sessions/{session_id}.index),
+  seeded from .git/index, so git's stat cache means only files changed since
+  the previous snapshot are re-hashed - no full `git status` per turn
+- New untracked files are added only if they are text and at most
+  SNAPSHOT_MAX_FILE_BYTES, so a dropped-in PDF or build artifact is never
+  hashed into .git/objects (it is left out of the diff stats instead)
+- The real index, HEAD and refs are never touched
+- The hooks' own output (session data, dev-logs) is excluded from snapshots
+- Turn diffs come from `git diff-tree --numstat` between two snapshot trees
+
+Snapshot trees are unreferenced objects; `git gc` prunes them after its usual
+expiry window.
+
+Usage:
+    from git_snapshot import snapshot_turn
+    changes = snapshot_turn(session_id)   # diff since the previous snapshot
+"""
+
+import sys
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+from session_manager import get_session_manager
+
+
+# ===== CONFIGURATION =====
+# Set to False to skip per-turn snapshots (no git calls from the hooks)
+ENABLE_TURN_DIFFS = True
+
+# Seconds allowed for each git call
+GIT_TIMEOUT = 10
+
+# Paths (relative to the project root) left out of snapshots: the hooks' own
+# session data, conversation logs and debug logs (older versions wrote
+# hook_handler.jsonl next to the hooks) change every turn
+SNAPSHOT_EXCLUDES = [".claude/data", "dev-logs", ".claude/hooks/hook_handler.jsonl*"]
+
+# New untracked files larger than this (bytes) are left out of snapshots
+SNAPSHOT_MAX_FILE_BYTES = 1024 * 1024
+
+# Bytes read to tell binary files (NUL byte, as git does) from text files
+BINARY_SNIFF_BYTES = 8000
+
+
+class GitSnapshot:
+    """Writes working-tree snapshots and diffs them."""
+
+    def __init__(self, index_path: Path, project_root: Optional[Path] = None,
+                 excludes: Optional[List[str]] = None):
+        """
+        Initialize the snapshotter.
+
+        Args:
+            index_path: Private index file used for snapshots (kept between turns)
+            project_root: Repository working directory (defaults to auto-detect)
+            excludes: Paths left out of snapshots (defaults to SNAPSHOT_EXCLUDES)
+        """
+        self.project_root = project_root or self._get_project_root()
+        self.index_path = Path(index_path)
+        self.excludes = SNAPSHOT_EXCLUDES if excludes is None else excludes
+
+    def _get_project_root(self) -> Path:
+        """Get the project root directory (parent of .claude folder)."""
+        return Path(__file__).parent.parent.parent
+
+    def _git(self, args: List[str], private_index: bool = False,
+             stdin: Optional[str] = None) -> Optional[str]:
+        """
+        Run a git command in the project root.
+
+        Args:
+            args: Arguments after "git"
+            private_index: Point GIT_INDEX_FILE at the snapshot index
+            stdin: Text fed to the command's standard input
+
+        Returns:
+            Command stdout, or None if git failed or isn't available
+        """
+        env = None
+        if private_index:
+            env = dict(os.environ, GIT_INDEX_FILE=str(self.index_path))
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=self.project_root,
+                env=env,
+                input=stdin,
+                capture_output=True,
+                text=True,
+                timeout=GIT_TIMEOUT
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+            return None
+        if result.returncode != 0:
+            return None
+        return result.stdout
+
+    def _seed_index(self):
+        """Copy the repository index so the first snapshot reuses its stat cache."""
+        if self.index_path.exists():
+            return
+        git_index = self._git(["rev-parse", "--git-path", "index"])
+        if not git_index:
+            return
+        source = self.project_root / git_index.strip()
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, self.index_path)
+        except OSError:
+            # No index yet (fresh repo) - git add builds one from scratch
+            pass
+
+    def _new_files(self, pathspec: List[str]) -> Optional[List[str]]:
+        """
+        List untracked files small enough and textual enough to snapshot.
+
+        Args:
+            pathspec: Paths to look in
+
+        Returns:
+            Paths relative to the project root, or None if git failed
+        """
+        output = self._git(["ls-files", "-z", "--others", "--exclude-standard", "--", *pathspec],
+                           private_index=True)
+        if output is None:
+            return None
+        return [path for path in output.split("\0") if path and _is_small_text(self.project_root / path)]
+
+    def write_tree(self) -> Optional[str]:
+        """
+        Snapshot the current working tree.
+
+        Files already in the snapshot index are refreshed with `git add -u`
+        (stat cache: only changed files are hashed); new files are added
+        only if they pass _new_files().
+
+        Returns:
+            Tree object id, or None outside a git repository
+        """
+        self._seed_index()
+        pathspec = ["."] + [f":(exclude){path}" for path in self.excludes]
+        if self._git(["add", "-u", "--", *pathspec], private_index=True) is None:
+            return None
+        new_files = self._new_files(pathspec)
+        if new_files is None:
+            return None
+        if new_files and self._git(["--literal-pathspecs", "add", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                                   private_index=True, stdin="\0".join(new_files)) is None:
+            return None
+        tree = self._git(["write-tree"], private_index=True)
+        return tree.strip() if tree else None
+
+    def diff_numstat(self, old_tree: str, new_tree: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Compare two snapshot trees.
+
+        Args:
+            old_tree: Earlier tree object id
+            new_tree: Later tree object id
+
+        Returns:
+            List of {"path", "insertions", "deletions", "binary"} (empty if
+            nothing changed), or None if git failed
+        """
+        if old_tree == new_tree:
+            return []
+
+        output = self._git(["diff-tree", "-r", "-z", "--numstat", old_tree, new_tree])
+        if output is None:
+            return None
+
+        changes = []
+        for record in output.split("\0"):
+            if not record:
+                continue
+            added, deleted, path = record.split("\t", 2)
+            binary = added == "-"
+            changes.append({
+                "path": path,
+                "insertions": 0 if binary else int(added),
+                "deletions": 0 if binary else int(deleted),
+                "binary": binary,
+            })
+        return changes
+
+    def remove_index(self):
+        """Delete the snapshot index (e.g. when the session ends)."""
+        try:
+            self.index_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _is_small_text(path: Path) -> bool:
+    """Check whether a new file is worth snapshotting (see SNAPSHOT_MAX_FILE_BYTES)."""
+    if path.is_symlink():
+        return True
+    try:
+        if path.stat().st_size > SNAPSHOT_MAX_FILE_BYTES:
+            return False
+        with open(path, "rb") as f:
+            return b"\0" not in f.read(BINARY_SNIFF_BYTES)
+    except OSError:
+        return False
+
+
+def summarize_changes(changes: List[Dict[str, Any]]) -> str:
+    """
+    Build a one-line summary in the style of `git diff --shortstat`.
+
+    Args:
+        changes: Output of GitSnapshot.diff_numstat
+
+    Returns:
+        Summary such as "2 files changed, 10 insertions(+), 3 deletions(-)"
+    """
+    insertions = sum(change["insertions"] for change in changes)
+    deletions = sum(change["deletions"] for change in changes)
+    files = len(changes)
+    return (f"{files} file{'s' if files != 1 else ''} changed, "
+            f"{insertions} insertion{'s' if insertions != 1 else ''}(+), "
+            f"{deletions} deletion{'s' if deletions != 1 else ''}(-)")
+
+
+def get_git_snapshot(session_id: str) -> GitSnapshot:
+    """Get a GitSnapshot using the session's private index."""
+    manager = get_session_manager()
+    return GitSnapshot(manager.get_snapshot_index_path(session_id), project_root=manager.project_root)
+
+
+def take_snapshot(session_id: str) -> Optional[str]:
+    """
+    Snapshot the working tree now, without diffing or touching the session JSON.
+
+    Called synchronously when a turn ends, so the tree reflects that turn
+    even if snapshot_turn() runs later from the work queue.
+
+    Args:
+        session_id: Unique session identifier
+
+    Returns:
+        Tree object id, or None if snapshots are disabled or git isn't available
+    """
+    if not ENABLE_TURN_DIFFS:
+        return None
+    return get_git_snapshot(session_id).write_tree()
+
+
+def snapshot_turn(session_id: str, tree: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Diff a snapshot of the working tree against the session's previous snapshot.
+
+    The new tree id is stored as "snapshot_tree" in the session JSON, so the
+    next call reports only changes made after this one.
+
+    Args:
+        session_id: Unique session identifier
+        tree: Tree taken by take_snapshot() when the turn ended (default:
+              snapshot the working tree now)
+
+    Returns:
+        Changes since the previous snapshot, or None if there was no previous
+        snapshot (baseline), snapshots are disabled or git isn't available
+    """
+    if not ENABLE_TURN_DIFFS:
+        return None
+
+    manager = get_session_manager()
+    session_data = manager.load_session(session_id)
+    if session_data is None:
+        return None
+
+    snapshot = get_git_snapshot(session_id)
+    tree = tree or snapshot.write_tree()
+    if tree is None:
+        return None
+
+    previous_tree = session_data.get("snapshot_tree")
+    changes = snapshot.diff_numstat(previous_tree, tree) if previous_tree else None
+    if tree != previous_tree:
+        manager.update_session(session_id, {"snapshot_tree": tree})
+    return changes
+
+
+if __name__ == "__main__":
+    """Snapshot a throwaway repository twice and diff the snapshots."""
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        (root / "a.txt").write_text("one\ntwo\n")
+
+        snapshot = GitSnapshot(root / "data" / "test.index", project_root=root, excludes=["data"])
+        first = snapshot.write_tree()
+
+        (root / "a.txt").write_text("one\nthree\nfour\n")
+        (root / "b.txt").write_text("new\n")
+        (root / "scan.pdf").write_bytes(b"%PDF-1.7\n\0\1\2")
+        (root / "big.txt").write_text("x" * (SNAPSHOT_MAX_FILE_BYTES + 1))
+        second = snapshot.write_tree()
+
+        changes = snapshot.diff_numstat(first, second)
+        print(f"Trees: {first} -> {second}", file=sys.stderr)
+        print(f"Changes: {changes}", file=sys.stderr)
+        print(f"Summary: {summarize_changes(changes)}", file=sys.stderr)
+        assert [change["path"] for change in changes] == ["a.txt", "b.txt"]
+
+        (root / "b.txt").unlink()
+        third = snapshot.write_tree()
+        assert [change["path"] for change in snapshot.diff_numstat(second, third)] == ["b.txt"]
+    print("Test completed successfully!", file=sys.stderr)
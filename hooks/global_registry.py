@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Global Session Registry
+=============================================
+Optional cross-project index of finished sessions under ~/.claude.
+
+Session data stays in each project's .claude/data/sessions/; SessionEnd
+additionally appends one compact summary line to a registry shared by every
+project, so cross-project questions never walk project trees on disk.
+
+Key Features:
+- Off by default: set GLOBAL_REGISTRY_ENABLED below or export
+  CLAUDE_GLOBAL_REGISTRY=1 to enable it for every project at once
+- One JSONL file per month in ~/.claude/data/registry/YYYY-MM.jsonl;
+  each summary is a single O_APPEND write, so concurrent projects don't
+  interleave lines
+- Queries read only the months in range; a resumed session's later summary
+  replaces its earlier one
+
+Usage:
+    python global_registry.py sessions --since 2026-09 [--project book]
+    python global_registry.py projects --since 4w
+"""
+
+import sys
+import os
+import json
+import argparse
+from pathlib import Path
+from datetime import datetime, date
+from typing import Dict, Any, Optional, List
+
+from session_manager import get_session_manager, active_seconds
+from activity_stats import parse_since
+
+
+# ===== CONFIGURATION =====
+# Append session summaries to the global registry at SessionEnd
+GLOBAL_REGISTRY_ENABLED = os.environ.get("CLAUDE_GLOBAL_REGISTRY") == "1"
+
+# Shared registry location (outside any project)
+GLOBAL_REGISTRY_DIR = Path.home() / ".claude" / "data" / "registry"
+
+# Top-level directories kept per summary
+SUMMARY_TOP_DIRECTORIES = 5
+
+
+class GlobalRegistry:
+    """Append-only, month-partitioned registry of session summaries."""
+
+    def __init__(self, registry_dir: Optional[Path] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            registry_dir: Registry directory (defaults to GLOBAL_REGISTRY_DIR)
+        """
+        self.registry_dir = Path(registry_dir or GLOBAL_REGISTRY_DIR)
+
+    def _month_path(self, month: str) -> Path:
+        """Get the registry file for a month ("YYYY-MM")."""
+        return self.registry_dir / f"{month}.jsonl"
+
+    def append(self, summary: Dict[str, Any]) -> bool:
+        """
+        Append one session summary.
+
+        Args:
+            summary: Output of summarize_session
+
+        Returns:
+            True if successful, False otherwise
+        """
+        month = summary.get("end_time", datetime.now().isoformat())[:7]
+        line = json.dumps(summary, ensure_ascii=False, separators=(",", ":")) + "\n"
+        try:
+            self.registry_dir.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self._month_path(month), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode("utf-8"))
+            finally:
+                os.close(fd)
+            return True
+        except OSError as e:
+            print(f"Warning: Failed to write global registry: {e}", file=sys.stderr)
+            return False
+
+    def sessions(self, since: date, until: date, project: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get session summaries that ended in a date range (inclusive).
+
+        Args:
+            since: First day
+            until: Last day
+            project: Only projects whose name or path contains this text
+
+        Returns:
+            Latest summary per (project, session), oldest first
+        """
+        latest: Dict[tuple, Dict[str, Any]] = {}
+        month = date(since.year, since.month, 1)
+        while month <= until:
+            path = self._month_path(month.strftime("%Y-%m"))
+            month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+            if not path.exists():
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        summary = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Partial line from an interrupted write
+                        continue
+                    if not since.isoformat() <= summary.get("end_time", "")[:10] <= until.isoformat():
+                        continue
+                    if project and project not in summary.get("project_path", ""):
+                        continue
+                    latest[(summary.get("project_path"), summary.get("session_id"))] = summary
+
+        return sorted(latest.values(), key=lambda summary: summary.get("end_time", ""))
+
+    def projects(self, since: date, until: date) -> List[Dict[str, Any]]:
+        """
+        Get per-project totals for a date range.
+
+        Args:
+            since: First day
+            until: Last day
+
+        Returns:
+            One totals dictionary per project, most active first
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        for summary in self.sessions(since, until):
+            entry = totals.setdefault(summary.get("project_path", "?"), {
+                "project": summary.get("project", "?"),
+                "project_path": summary.get("project_path", "?"),
+                "sessions": 0,
+                "prompts": 0,
+                "responses": 0,
+                "duration_seconds": 0.0,
+                "files_touched": 0,
+                "last_session": "",
+            })
+            entry["sessions"] += 1
+            entry["prompts"] += summary.get("prompts", 0)
+            entry["responses"] += summary.get("responses", 0)
+            entry["duration_seconds"] += summary.get("duration_seconds", 0.0)
+            entry["files_touched"] += summary.get("files_touched", 0)
+            entry["last_session"] = max(entry["last_session"], summary.get("end_time", ""))
+
+        return sorted(totals.values(), key=lambda entry: entry["duration_seconds"], reverse=True)
+
+
+def summarize_session(session_data: Dict[str, Any], project_root: Path) -> Dict[str, Any]:
+    """
+    Build the compact registry summary of a finalized session.
+
+    Args:
+        session_data: Session data from SessionManager
+        project_root: Project the session belongs to
+
+    Returns:
+        Summary dictionary (no prompt or response text)
+    """
+    end_time = session_data.get("end_time") or datetime.now().isoformat()
+    start_time = session_data.get("start_time") or end_time
+    duration = active_seconds(session_data)
+
+    directories: Dict[str, int] = {}
+    for file_path in session_data.get("file_changes", []):
+        path = Path(file_path)
+        if path.is_absolute():
+            try:
+                path = path.relative_to(project_root)
+            except ValueError:
+                continue
+        directory = path.parts[0] if len(path.parts) > 1 else "."
+        directories[directory] = directories.get(directory, 0) + 1
+    top = sorted(directories.items(), key=lambda item: item[1], reverse=True)[:SUMMARY_TOP_DIRECTORIES]
+
+    return {
+        "project": project_root.name,
+        "project_path": str(project_root),
+        "session_id": session_data.get("session_id"),
+        "start_time": start_time,
+        "end_time": end_time,
+        "duration_seconds": round(max(0.0, duration), 3),
+        "prompts": len(session_data.get("prompts", [])),
+        "responses": len(session_data.get("responses", [])),
+        "files_touched": len(session_data.get("file_changes", [])),
+        "top_directories": dict(top),
+        "log_file": str(project_root / session_data.get("log_file", "")),
+    }
+
+
+# Convenience functions for use in hooks
+def register_session(session_id: str) -> bool:
+    """
+    Append a finalized session's summary to the global registry (if enabled).
+
+    Args:
+        session_id: Unique session identifier
+
+    Returns:
+        True if a summary was written
+    """
+    if not GLOBAL_REGISTRY_ENABLED:
+        return False
+
+    manager = get_session_manager()
+    session_data = manager.load_session(session_id)
+    if session_data is None:
+        return False
+
+    project_root = manager.project_root.resolve()
+    return GlobalRegistry().append(summarize_session(session_data, project_root))
+
+
+def main():
+    """Query the registry from the command line."""
+    parser = argparse.ArgumentParser(description="Query the cross-project session registry")
+    parser.add_argument("command", choices=["sessions", "projects"])
+    parser.add_argument("--since", default="7d",
+                        help="Start date: YYYY-MM-DD, YYYY-MM, or relative like 7d / 4w (default: 7d)")
+    parser.add_argument("--until", default=None, help="End date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--project", default=None, help="Filter sessions by project name/path")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    try:
+        since = parse_since(args.since)
+        until = date.fromisoformat(args.until) if args.until else date.today()
+    except ValueError as e:
+        print(f"Error: Invalid date: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    registry = GlobalRegistry()
+    if args.command == "sessions":
+        rows = registry.sessions(since, until, project=args.project)
+    else:
+        rows = registry.projects(since, until)
+
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+
+    if not rows:
+        print("No sessions registered in this range.")
+        return
+
+    if args.command == "sessions":
+        print("| Ended | Project | Prompts | Responses | Minutes | Files | Log |")
+        print("|-------|---------|--------:|----------:|--------:|------:|-----|")
+        for row in rows:
+            print(f"| {row['end_time'][:16].replace('T', ' ')} | {row['project']} | {row['prompts']} | "
+                  f"{row['responses']} | {row['duration_seconds'] / 60:.0f} | {row['files_touched']} | "
+                  f"{row['log_file']} |")
+    else:
+        print("| Project | Sessions | Prompts | Responses | Hours | Files | Last session |")
+        print("|---------|---------:|--------:|----------:|------:|------:|--------------|")
+        for row in rows:
+            print(f"| {row['project']} | {row['sessions']} | {row['prompts']} | {row['responses']} | "
+                  f"{row['duration_seconds'] / 3600:.1f} | {row['files_touched']} | "
+                  f"{row['last_session'][:10]} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,14 @@ It also logs conversations to markdown files for development tracking.
 import sys
 import json
 import subprocess
+import time
 from pathlib import Path
 import re
 
+from payload_reader import PayloadReader
+from debug_log import get_debug_log
+from tool_policy import get_tool_policy, extract_file_paths, IGNORE, COUNT, FULL
+
 # Import conversation logger and session manager
 try:
     from conversation_logger import get_logger
@@ -25,9 +30,43 @@ except ImportError:
 # Choose which sound set to use: "voice" (spoken words) or "beeps" (simple tones)
 SOUNDS_TYPE = "beeps"
 
-# Enable/disable JSONL debug logging (set to False to prevent file bloat)
+# Enable/disable JSONL debug logging of hook payloads.
+# The log is compact, size-capped and rotated, with large strings redacted.
 ENABLE_JSONL_LOGGING = False
 
+# Debug log location (under .claude/data, so turn snapshots don't pick it up)
+DEBUG_LOG_PATH = Path(__file__).parent.parent / "data" / "hook_handler.jsonl"
+
+# Rotate hook_handler.jsonl past this size; keep this many gzip segments
+DEBUG_LOG_MAX_BYTES = 5 * 1024 * 1024
+DEBUG_LOG_BACKUPS = 5
+
+# Strings longer than this (e.g. Write contents) are logged as "<redacted: N chars>"
+DEBUG_LOG_MAX_STRING = 2000
+
+# Fraction of events to log per hook_event_name (unlisted events: 1.0)
+DEBUG_LOG_SAMPLING = {
+    "PreToolUse": 1.0,
+    "Notification": 1.0,
+}
+
+# Payload fields this handler needs. Everything else (e.g. Write contents) is
+# skipped while streaming stdin instead of being decoded into memory.
+# With ENABLE_JSONL_LOGGING on, these fields are never redacted.
+PAYLOAD_FIELDS = [
+    "hook_event_name",
+    "session_id",
+    "tool_name",
+    "tool_input.file_path",
+    "tool_input.notebook_path",
+    "tool_input.command",
+    "tool_use_id",
+    "cwd",
+    "tool_response.success",
+    "tool_response.is_error",
+    "tool_response.interrupted",
+]
+
 # ===== SOUND MAPPINGS =====
 # This dictionary maps Claude Code events and tools to sound files
 SOUND_MAP = {
@@ -99,49 +138,95 @@ def play_sound(sound_name):
     return False
 
 
-def log_hook_data(hook_data):
+def get_tool_outcome(hook_data):
     """
-    Log the full hook_data to hook_handler.jsonl for debugging/auditing.
-    Also tracks file changes in session JSON for persistent logging.
+    Classify a PostToolUse result for the tool latency profile.
+
+    Args:
+        hook_data: PostToolUse event data
+
+    Returns:
+        "error", "interrupted" or "ok"
+    """
+    tool_response = hook_data.get("tool_response", {})
+    if not isinstance(tool_response, dict):
+        return "ok"
+    if tool_response.get("is_error") or tool_response.get("success") is False:
+        return "error"
+    if tool_response.get("interrupted"):
+        return "interrupted"
+    return "ok"
+
+
+def log_hook_data(hook_data, payload_size=0, received_at=None):
+    """
+    Log hook_data to the rotating hook_handler.jsonl for debugging/auditing.
+    Also spools file changes, tool timings and tool counters for the session
+    (merged into session JSON at Stop), as allowed by the tool's policy.
+
+    Args:
+        hook_data: Dictionary containing event information from Claude
+        payload_size: Size of the raw payload in characters
+        received_at: Time the hook started (defaults to now)
     """
     try:
         # Log to JSONL for debugging (only if enabled)
         if ENABLE_JSONL_LOGGING:
-            log_path = Path(__file__).parent / "hook_handler.jsonl"
-            with open(log_path, "a", encoding="utf-8") as log_file:
-                log_file.write(json.dumps(
-                    hook_data, ensure_ascii=False, indent=2) + "\n")
-
-        # Track file changes in session JSON
-        if LOGGING_ENABLED:
-            session_id = hook_data.get("session_id", "unknown")
-
-            if session_id != "unknown":
-                # Extract file paths from tool events
-                tool_name = hook_data.get("tool_name", "")
-                tool_input = hook_data.get("tool_input", {})
-
-                file_path = None
-
-                # Extract file path based on tool type
-                if tool_name in ["Edit", "Write", "Read"]:
-                    file_path = tool_input.get("file_path")
-                elif tool_name == "NotebookEdit":
-                    file_path = tool_input.get("notebook_path")
-                elif tool_name == "Glob":
-                    # Glob returns multiple files, but we track the pattern instead
-                    pattern = tool_input.get("pattern")
-                    if pattern:
-                        file_path = f"glob:{pattern}"
-
-                # If we found a file path, track it in session JSON
-                if file_path:
-                    try:
-                        session_manager = get_session_manager()
-                        if session_manager.session_exists(session_id):
-                            session_manager.add_file_change(session_id, file_path)
-                    except Exception as e:
-                        print(f"Failed to track file change: {e}", file=sys.stderr)
+            debug_log = get_debug_log(
+                DEBUG_LOG_PATH,
+                max_bytes=DEBUG_LOG_MAX_BYTES,
+                backups=DEBUG_LOG_BACKUPS,
+                sample_rates=DEBUG_LOG_SAMPLING,
+            )
+            debug_log.write(hook_data)
+
+        if not LOGGING_ENABLED:
+            return
+
+        session_id = hook_data.get("session_id", "unknown")
+        event_name = hook_data.get("hook_event_name", "")
+        tool_name = hook_data.get("tool_name", "")
+        tool_use_id = hook_data.get("tool_use_id")
+
+        if session_id == "unknown" or event_name not in ("PreToolUse", "PostToolUse"):
+            return
+
+        # Decide what to record before touching the disk (see tool_policy.py)
+        policy = get_tool_policy(tool_name)
+        if policy == IGNORE or (event_name == "PostToolUse" and policy != FULL):
+            return
+
+        file_paths = []
+        if event_name == "PreToolUse" and policy != COUNT:
+            file_paths = extract_file_paths(tool_name, hook_data.get("tool_input", {}), hook_data.get("cwd"))
+
+        try:
+            session_manager = get_session_manager()
+            if not session_manager.session_exists(session_id):
+                return
+
+            # Read-only, high-frequency tools: one counter line, nothing else
+            if policy != FULL and event_name == "PreToolUse":
+                session_manager.spool_tool_count(session_id, tool_name)
+
+            # Spool written files (merged into session JSON at Stop/SessionEnd)
+            for file_path in file_paths:
+                session_manager.spool_file_change(session_id, file_path)
+
+            # Pair PreToolUse/PostToolUse by tool_use_id for the tool latency profile
+            if policy == FULL and tool_use_id:
+                event = {
+                    "id": tool_use_id,
+                    "phase": "pre" if event_name == "PreToolUse" else "post",
+                    "tool": tool_name,
+                    "time": round(received_at or time.time(), 3),
+                }
+                if event_name == "PostToolUse":
+                    event["size"] = payload_size
+                    event["outcome"] = get_tool_outcome(hook_data)
+                session_manager.spool_tool_event(session_id, event)
+        except Exception as e:
+            print(f"Failed to track tool event: {e}", file=sys.stderr)
 
     except Exception as e:
         # Fail silently, but print to stderr for visibility
@@ -164,6 +249,10 @@ def get_sound_for_event(hook_data):
     # e.g., "Edit", "Bash", "TodoWrite"
     tool_name = hook_data.get("tool_name", "")
 
+    # PostToolUse is only registered for timing; the PreToolUse already beeped
+    if event_name == "PostToolUse":
+        return None
+
     # Step 1: Check if this is a system event (like Claude starting up)
     if event_name in SOUND_MAP:
         return SOUND_MAP[event_name]
@@ -193,15 +282,21 @@ def main():
 
     How it works:
     1. Claude sends event data as JSON through stdin
-    2. We parse the JSON to understand what Claude is doing
+    2. We pull the fields we need from the JSON to understand what Claude is doing
     3. We decide which sound to play (if any)
     4. We play the sound and exit
     """
     try:
+        received_at = time.time()
+
         # Step 1: Read the event data from Claude
         # Claude sends JSON data through stdin (standard input)
-        input_data = json.load(sys.stdin)
-        log_hook_data(input_data)
+        reader = PayloadReader(sys.stdin)
+        if ENABLE_JSONL_LOGGING:
+            input_data = reader.read_redacted(DEBUG_LOG_MAX_STRING, keep=PAYLOAD_FIELDS)
+        else:
+            input_data = reader.extract(PAYLOAD_FIELDS)
+        log_hook_data(input_data, payload_size=reader.chars_read, received_at=received_at)
 
         # Step 2: Figure out which sound to play
         sound_name = get_sound_for_event(input_data)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Conversation Log Archive
+=============================================
+Compresses finalized conversation logs and reads them back transparently.
+
+Key Features:
+- Finalized dev-logs/**/*-conversation.md files are compressed to .md.gz
+  (or .md.zst when the optional `zstandard` package is installed)
+- Compression runs from the background work queue, so SessionEnd doesn't wait
+- Atomic: the compressed file is written under a temporary name and renamed;
+  the plain log is removed only if it didn't change while being compressed
+- A resumed session's log is decompressed again before new entries are appended
+- open_log/read_log/find_logs accept plain and compressed logs alike, for
+  log_conversation.py and the HTML browser
+
+Usage:
+    python log_archive.py compress [dev-logs]   # compress existing, inactive logs
+    python log_archive.py cat <log file>        # print a (compressed) log
+"""
+
+import sys
+import os
+import io
+import gzip
+import time
+import shutil
+from pathlib import Path
+from typing import Dict, Any, Optional, List, IO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# ===== CONFIGURATION =====
+# Compress conversation logs when their session is finalized
+COMPRESS_FINALIZED_LOGS = False
+
+# "gzip" or "zstd" (zstd needs `pip install zstandard`; falls back to gzip)
+LOG_COMPRESSION = "gzip"
+
+# Compression suffixes recognised when reading, in lookup order
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+# Bulk `compress` skips logs modified more recently than this (likely still active)
+BULK_MIN_AGE_SECONDS = 3600
+
+
+def _compressed_variants(path: Path) -> List[Path]:
+    """Get the possible compressed names of a log file."""
+    return [path.with_name(path.name + suffix) for suffix in COMPRESSED_SUFFIXES]
+
+
+def resolve_log(path: Path) -> Optional[Path]:
+    """
+    Find a log on disk, whichever form it is stored in.
+
+    Args:
+        path: Plain log path (e.g. from the session JSON)
+
+    Returns:
+        Existing plain or compressed path, or None
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+    for candidate in _compressed_variants(path):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def open_log(path: Path) -> IO[str]:
+    """
+    Open a plain or compressed log for reading text.
+
+    Args:
+        path: Plain or compressed log path (plain paths are resolved)
+
+    Returns:
+        Text file handle
+
+    Raises:
+        FileNotFoundError: If no form of the log exists
+        RuntimeError: If the log is zstd-compressed and zstandard isn't installed
+    """
+    resolved = resolve_log(path)
+    if resolved is None:
+        raise FileNotFoundError(f"Log not found: {path}")
+
+    if resolved.suffix == ".gz":
+        return gzip.open(resolved, "rt", encoding="utf-8")
+    if resolved.suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError(f"{resolved} is zstd-compressed; install zstandard to read it")
+        reader = zstandard.ZstdDecompressor().stream_reader(open(resolved, "rb"), closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return open(resolved, "r", encoding="utf-8")
+
+
+def read_log(path: Path) -> str:
+    """Read a whole plain or compressed log."""
+    with open_log(path) as f:
+        return f.read()
+
+
+def find_logs(base_dir: Path) -> List[Path]:
+    """
+    List conversation logs under a directory, compressed or not.
+
+    Args:
+        base_dir: Log root (e.g. <project>/dev-logs)
+
+    Returns:
+        Sorted log paths (one entry per log, preferring the plain file)
+    """
+    logs: Dict[str, Path] = {}
+    for pattern in ["*-conversation.md"] + [f"*-conversation.md{suffix}" for suffix in COMPRESSED_SUFFIXES]:
+        for path in Path(base_dir).rglob(pattern):
+            plain = str(path)
+            for suffix in COMPRESSED_SUFFIXES:
+                if plain.endswith(suffix):
+                    plain = plain[:-len(suffix)]
+            if plain not in logs or path.suffix == ".md":
+                logs[plain] = path
+    return [logs[key] for key in sorted(logs)]
+
+
+def compress_log(path: Path, method: str = LOG_COMPRESSION) -> Optional[Path]:
+    """
+    Compress a plain log in place (path.md -> path.md.gz / path.md.zst).
+
+    Args:
+        path: Plain log path
+        method: "gzip" or "zstd"
+
+    Returns:
+        Compressed path, or None if the log was missing or changed meanwhile
+    """
+    path = Path(path)
+    if method == "zstd" and zstandard is None:
+        print("Warning: zstandard not installed, compressing with gzip", file=sys.stderr)
+        method = "gzip"
+
+    try:
+        before = path.stat()
+    except FileNotFoundError:
+        return None
+
+    target = path.with_name(path.name + (".zst" if method == "zstd" else ".gz"))
+    tmp_target = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    with open(path, "rb") as src:
+        if method == "zstd":
+            with open(tmp_target, "wb") as raw:
+                with zstandard.ZstdCompressor(level=10).stream_writer(raw) as dst:
+                    shutil.copyfileobj(src, dst)
+        else:
+            with gzip.open(tmp_target, "wb", compresslevel=9) as dst:
+                shutil.copyfileobj(src, dst)
+
+    after = path.stat()
+    if (after.st_mtime_ns, after.st_size) != (before.st_mtime_ns, before.st_size):
+        # A resumed session appended meanwhile; its next SessionEnd retries
+        tmp_target.unlink()
+        return None
+
+    os.replace(tmp_target, target)
+    path.unlink()
+    return target
+
+
+def decompress_log(path: Path) -> bool:
+    """
+    Restore the plain form of a compressed log (before appending to it).
+
+    Args:
+        path: Plain log path
+
+    Returns:
+        True if a compressed log was restored
+    """
+    path = Path(path)
+    if path.exists():
+        return False
+    resolved = resolve_log(path)
+    if resolved is None:
+        return False
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open_log(resolved) as src, open(tmp_path, "w", encoding="utf-8") as dst:
+        shutil.copyfileobj(src, dst)
+    os.replace(tmp_path, path)
+    resolved.unlink()
+    return True
+
+
+def process(hook_data: Dict[str, Any]):
+    """
+    Compress a finalized session's log (runs from the work queue).
+
+    Args:
+        hook_data: {"session_id": ..., "log_file": absolute plain log path}
+    """
+    log_file = hook_data.get("log_file")
+    if log_file:
+        compress_log(Path(log_file))
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "compress"
+
+    if command == "compress":
+        base_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else Path(__file__).parent.parent.parent / "dev-logs"
+        cutoff = time.time() - BULK_MIN_AGE_SECONDS
+        compressed = [path for path in find_logs(base_dir)
+                      if path.suffix == ".md" and path.stat().st_mtime < cutoff and compress_log(path)]
+        print(f"✓ Compressed {len(compressed)} log(s) in {base_dir}", file=sys.stderr)
+    elif command == "cat" and len(sys.argv) > 2:
+        sys.stdout.write(read_log(Path(sys.argv[2])))
+    else:
+        print("Usage: log_archive.py compress [dir] | cat <log file>", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+Static HTML Conversation Browser
+=============================================
+Renders dev-logs conversation logs into a paginated static site with a
+client-side search index.
+
+Key Features:
+- One directory of paginated HTML pages per session (ENTRIES_PER_PAGE
+  prompts/responses per page), so multi-megabyte logs open instantly
+- Incremental: manifest.json records each log's size/mtime and content hash;
+  only new or changed logs are re-rendered, deleted logs are pruned
+- Search index (search-index.json, plus search-index.js for file:// use)
+  merged from per-session fragments, searched by search.html in the browser
+- Reads compressed logs transparently (log_archive)
+- Uses the `markdown` package when installed, a small built-in renderer otherwise
+
+Usage:
+    python log_browser.py                   # build dev-logs/_browser/
+    python log_browser.py --force           # re-render every session
+    python log_conversation.py browse       # same as the first form
+"""
+
+import sys
+import os
+import re
+import html
+import json
+import shutil
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+from log_archive import find_logs, read_log, COMPRESSED_SUFFIXES
+
+try:
+    import markdown
+except ImportError:
+    markdown = None
+
+
+# ===== CONFIGURATION =====
+# Log entries (## sections) per session page
+ENTRIES_PER_PAGE = 40
+
+# Sessions per index page
+SESSIONS_PER_INDEX_PAGE = 100
+
+# Characters of each entry kept in the search index
+SEARCH_TEXT_CHARS = 2000
+
+# Output directory name inside dev-logs/
+OUTPUT_DIR_NAME = "_browser"
+
+STYLE = """
+body { font-family: -apple-system, "Segoe UI", sans-serif; max-width: 960px; margin: 2em auto; padding: 0 1em; color: #222; }
+a { color: #0366d6; text-decoration: none; } a:hover { text-decoration: underline; }
+nav { margin: 1em 0; } nav a, nav span { margin-right: .6em; }
+pre { background: #f6f8fa; padding: .8em; overflow-x: auto; }
+code { background: #f6f8fa; padding: .1em .3em; }
+table { border-collapse: collapse; } td, th { border: 1px solid #ddd; padding: .3em .6em; }
+.entry { border-top: 1px solid #eee; padding-top: .5em; }
+.muted { color: #777; font-size: .9em; }
+#results li { margin-bottom: .6em; }
+"""
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Search conversations</title>
+<link rel="stylesheet" href="style.css"></head>
+<body>
+<nav><a href="index.html">All sessions</a></nav>
+<h1>Search conversations</h1>
+<input id="q" type="search" placeholder="Search prompts and responses" autofocus style="width:100%;font-size:1.1em">
+<ul id="results"></ul>
+<script src="search-index.js"></script>
+<script>
+const input = document.getElementById("q"), results = document.getElementById("results");
+function escapeHtml(s) { return s.replace(/[&<>"]/g, c => ({"&":"&amp;","<":"&lt;",">":"&gt;",'"':"&quot;"}[c])); }
+input.addEventListener("input", () => {
+  const terms = input.value.toLowerCase().split(/\\s+/).filter(Boolean);
+  results.innerHTML = "";
+  if (!terms.length) return;
+  let shown = 0;
+  for (const entry of window.SEARCH_INDEX) {
+    const text = entry.text.toLowerCase();
+    if (!terms.every(t => text.includes(t) || entry.heading.toLowerCase().includes(t))) continue;
+    const at = Math.max(0, text.indexOf(terms[0]) - 60);
+    const li = document.createElement("li");
+    li.innerHTML = `<a href="${entry.url}">${escapeHtml(entry.session)} &middot; ${escapeHtml(entry.heading)}</a>` +
+      `<div class="muted">${escapeHtml(entry.text.slice(at, at + 200))}</div>`;
+    results.appendChild(li);
+    if (++shown >= 200) break;
+  }
+});
+</script>
+</body></html>
+"""
+
+
+LIST_ITEM = re.compile(r"^\s*([-*]|\d+\.) ")
+
+_markdown_renderer = None
+
+
+def _get_markdown_renderer():
+    """
+    Get the per-process `markdown` renderer, with raw HTML passthrough disabled.
+
+    Prompts and responses may contain HTML (even <script>); without its
+    html_block/html handlers, Markdown escapes it like any other text.
+    """
+    global _markdown_renderer
+    if _markdown_renderer is None:
+        _markdown_renderer = markdown.Markdown(extensions=["fenced_code", "tables"])
+        _markdown_renderer.preprocessors.deregister("html_block")
+        _markdown_renderer.inlinePatterns.deregister("html")
+    return _markdown_renderer
+
+
+def _inline(text: str) -> str:
+    """Render inline markdown (code, bold, italics, links) in escaped text."""
+    parts = re.split(r"(`[^`]+`)", text)
+    rendered = []
+    for part in parts:
+        if part.startswith("`") and part.endswith("`") and len(part) > 1:
+            rendered.append(f"<code>{html.escape(part[1:-1])}</code>")
+            continue
+        part = html.escape(part)
+        part = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", part)
+        part = re.sub(r"(?<!\*)\*(?!\s)(.+?)(?<!\s)\*(?!\*)", r"<em>\1</em>", part)
+        part = re.sub(r"\[([^\]]+)\]\((https?://[^)\s]+)\)", r'<a href="\2">\1</a>', part)
+        rendered.append(part)
+    return "".join(rendered)
+
+
+def render_markdown(text: str) -> str:
+    """
+    Convert markdown to HTML.
+
+    Uses the `markdown` package when available; otherwise a small renderer
+    covering what the conversation logs contain (headings, fenced code,
+    lists, tables, rules, emphasis, inline code). Raw HTML in the text is
+    escaped either way.
+
+    Args:
+        text: Markdown source
+
+    Returns:
+        HTML fragment
+    """
+    if markdown is not None:
+        return _get_markdown_renderer().reset().convert(text)
+
+    out: List[str] = []
+    paragraph: List[str] = []
+    lines = text.split("\n")
+    index = 0
+
+    def flush_paragraph():
+        if paragraph:
+            out.append("<p>" + "<br>\n".join(_inline(line) for line in paragraph) + "</p>")
+            paragraph.clear()
+
+    while index < len(lines):
+        line = lines[index]
+        stripped = line.strip()
+
+        if stripped.startswith("```"):
+            flush_paragraph()
+            code = []
+            index += 1
+            while index < len(lines) and not lines[index].strip().startswith("```"):
+                code.append(lines[index])
+                index += 1
+            out.append(f"<pre><code>{html.escape(chr(10).join(code))}</code></pre>")
+        elif re.match(r"^#{1,6} ", stripped):
+            flush_paragraph()
+            level = len(stripped) - len(stripped.lstrip("#"))
+            out.append(f"<h{level}>{_inline(stripped[level + 1:])}</h{level}>")
+        elif stripped in ("---", "***"):
+            flush_paragraph()
+            out.append("<hr>")
+        elif LIST_ITEM.match(stripped):
+            flush_paragraph()
+            tag = "ol" if stripped[0].isdigit() else "ul"
+            items = []
+            while index < len(lines) and LIST_ITEM.match(lines[index]):
+                items.append("<li>" + _inline(LIST_ITEM.sub("", lines[index])) + "</li>")
+                index += 1
+            out.append(f"<{tag}>{''.join(items)}</{tag}>")
+            continue
+        elif stripped.startswith("|") and stripped.endswith("|"):
+            flush_paragraph()
+            rows = []
+            while index < len(lines) and lines[index].strip().startswith("|"):
+                cells = [cell.strip() for cell in lines[index].strip().strip("|").split("|")]
+                if not all(re.match(r"^:?-+:?$", cell) for cell in cells):
+                    tag = "th" if not rows else "td"
+                    rows.append("<tr>" + "".join(f"<{tag}>{_inline(cell)}</{tag}>" for cell in cells) + "</tr>")
+                index += 1
+            out.append(f"<table>{''.join(rows)}</table>")
+            continue
+        elif not stripped:
+            flush_paragraph()
+        else:
+            paragraph.append(line)
+        index += 1
+
+    flush_paragraph()
+    return "\n".join(out)
+
+
+def split_entries(text: str) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Split a conversation log into its header and "## " entries.
+
+    Args:
+        text: Log markdown
+
+    Returns:
+        (header markdown, [(heading, entry markdown), ...])
+    """
+    header: List[str] = []
+    entries: List[Tuple[str, List[str]]] = []
+    in_code = False
+    for line in text.split("\n"):
+        if line.strip().startswith("```"):
+            in_code = not in_code
+        if not in_code and line.startswith("## "):
+            entries.append((line[3:].strip(), [line]))
+        elif entries:
+            entries[-1][1].append(line)
+        else:
+            header.append(line)
+    return "\n".join(header), [(heading, "\n".join(body)) for heading, body in entries]
+
+
+class LogBrowserBuilder:
+    """Incremental builder for the static conversation browser."""
+
+    def __init__(self, logs_dir: Path, output_dir: Optional[Path] = None):
+        """
+        Initialize the builder.
+
+        Args:
+            logs_dir: dev-logs directory
+            output_dir: Site directory (defaults to dev-logs/_browser)
+        """
+        self.logs_dir = Path(logs_dir)
+        self.output_dir = Path(output_dir or self.logs_dir / OUTPUT_DIR_NAME)
+        self.sessions_dir = self.output_dir / "sessions"
+        self.manifest_path = self.output_dir / "manifest.json"
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        """
+        Load the build manifest.
+
+        Returns:
+            {session key: {"source": {"stat", "sha256"}, "meta": {...}}} ({} on first build)
+        """
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("sessions", {})
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, path: Path, content: str):
+        """Write a site file atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _page(self, title: str, body: str, css: str) -> str:
+        """Wrap a body fragment in an HTML page."""
+        return (f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{html.escape(title)}</title>'
+                f'<link rel="stylesheet" href="{css}"></head>\n<body>\n{body}\n</body></html>\n')
+
+    def _pager(self, current: int, total: int, name) -> str:
+        """Build page navigation links (name(n) gives the file name of page n)."""
+        if total <= 1:
+            return ""
+        links = []
+        for number in range(1, total + 1):
+            if number == current:
+                links.append(f"<span>{number}</span>")
+            else:
+                links.append(f'<a href="{name(number)}">{number}</a>')
+        return "<nav>Page " + " ".join(links) + "</nav>"
+
+    def render_session(self, key: str, text: str) -> Dict[str, Any]:
+        """
+        Render one session's pages and search fragment.
+
+        Args:
+            key: Session key (log file stem)
+            text: Log markdown
+
+        Returns:
+            Manifest metadata (title, date, pages, counts)
+        """
+        header, entries = split_entries(text)
+        session_dir = self.sessions_dir / key
+        if session_dir.exists():
+            shutil.rmtree(session_dir)
+
+        title = next((body.split("\n", 2)[-1].strip().split("\n")[0]
+                      for heading, body in entries if "User Prompt" in heading), "") or key
+        title = title[:100]
+        pages = max(1, -(-len(entries) // ENTRIES_PER_PAGE))
+        search_entries = []
+
+        for number in range(1, pages + 1):
+            chunk = entries[(number - 1) * ENTRIES_PER_PAGE:number * ENTRIES_PER_PAGE]
+            pager = self._pager(number, pages, lambda n: f"page-{n}.html")
+            body = ['<nav><a href="../../index.html">All sessions</a><a href="../../search.html">Search</a></nav>',
+                    f"<h1>{html.escape(key)}</h1>", render_markdown(header) if number == 1 else "", pager]
+            for offset, (heading, entry) in enumerate(chunk):
+                anchor = f"e{(number - 1) * ENTRIES_PER_PAGE + offset + 1}"
+                body.append(f'<div class="entry" id="{anchor}">{render_markdown(entry)}</div>')
+                search_entries.append({
+                    "session": key,
+                    "heading": heading,
+                    "url": f"sessions/{key}/page-{number}.html#{anchor}",
+                    "text": entry.split("\n", 1)[-1].strip()[:SEARCH_TEXT_CHARS],
+                })
+            body.append(pager)
+            self._write(session_dir / f"page-{number}.html",
+                        self._page(f"{key} ({number}/{pages})", "\n".join(body), "../../style.css"))
+
+        self._write(session_dir / "search.json", json.dumps(search_entries, ensure_ascii=False))
+
+        return {
+            "key": key,
+            "title": title,
+            "date": key[:10],
+            "pages": pages,
+            "prompts": sum(1 for heading, _ in entries if "User Prompt" in heading),
+            "responses": sum(1 for heading, _ in entries if "Claude Response" in heading),
+        }
+
+    def _write_index(self, manifest: Dict[str, Any]):
+        """Write the paginated session list, newest first."""
+        sessions = sorted((entry["meta"] for entry in manifest.values()),
+                          key=lambda meta: meta["key"], reverse=True)
+        pages = max(1, -(-len(sessions) // SESSIONS_PER_INDEX_PAGE))
+
+        def name(number: int) -> str:
+            return "index.html" if number == 1 else f"index-{number}.html"
+
+        for number in range(1, pages + 1):
+            chunk = sessions[(number - 1) * SESSIONS_PER_INDEX_PAGE:number * SESSIONS_PER_INDEX_PAGE]
+            rows = "".join(
+                f'<tr><td>{html.escape(entry["date"])}</td>'
+                f'<td><a href="sessions/{entry["key"]}/page-1.html">{html.escape(entry["title"])}</a></td>'
+                f'<td>{entry["prompts"]}</td><td>{entry["responses"]}</td><td>{entry["pages"]}</td></tr>'
+                for entry in chunk
+            )
+            pager = self._pager(number, pages, name)
+            body = (f'<nav><a href="search.html">Search</a></nav><h1>Conversations</h1>'
+                    f'<p class="muted">{len(sessions)} sessions</p>{pager}'
+                    f"<table><tr><th>Date</th><th>First prompt</th><th>Prompts</th><th>Responses</th>"
+                    f"<th>Pages</th></tr>{rows}</table>{pager}")
+            self._write(self.output_dir / name(number), self._page("Conversations", body, "style.css"))
+
+        # Drop index pages left over from a larger build
+        for stale in self.output_dir.glob("index-*.html"):
+            if int(stale.stem.split("-")[1]) > pages:
+                stale.unlink()
+
+    def _write_search_index(self, manifest: Dict[str, Any]):
+        """Merge per-session search fragments into the site-wide index."""
+        entries = []
+        for key in sorted(manifest, reverse=True):
+            try:
+                with open(self.sessions_dir / key / "search.json", "r", encoding="utf-8") as f:
+                    entries.extend(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+        data = json.dumps(entries, ensure_ascii=False, separators=(",", ":"))
+        self._write(self.output_dir / "search-index.json", data)
+        self._write(self.output_dir / "search-index.js", f"window.SEARCH_INDEX = {data};\n")
+
+    def build(self, force: bool = False) -> Dict[str, int]:
+        """
+        Render new/changed sessions and refresh the index pages.
+
+        Args:
+            force: Re-render every session
+
+        Returns:
+            Counts of rendered, unchanged and removed sessions
+        """
+        manifest = {} if force else self._load_manifest()
+        stats = {"rendered": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+
+        for path in find_logs(self.logs_dir):
+            if self.output_dir in path.parents:
+                continue
+            key = path.name
+            for suffix in COMPRESSED_SUFFIXES:
+                key = key[:-len(suffix)] if key.endswith(suffix) else key
+            key = key[:-len(".md")]
+            seen.add(key)
+
+            stat = path.stat()
+            stat_key = [path.name, stat.st_mtime_ns, stat.st_size]
+            entry = manifest.get(key)
+            if entry and entry["source"]["stat"] == stat_key:
+                stats["unchanged"] += 1
+                continue
+
+            # Stat changed (e.g. the log was compressed): compare content hashes
+            text = read_log(path)
+            digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+            if entry and entry["source"]["sha256"] == digest:
+                entry["source"]["stat"] = stat_key
+                stats["unchanged"] += 1
+                continue
+
+            manifest[key] = {
+                "source": {"stat": stat_key, "sha256": digest},
+                "meta": self.render_session(key, text),
+            }
+            stats["rendered"] += 1
+
+        for key in [key for key in manifest if key not in seen]:
+            shutil.rmtree(self.sessions_dir / key, ignore_errors=True)
+            manifest.pop(key)
+            stats["removed"] += 1
+
+        self._write(self.output_dir / "style.css", STYLE)
+        self._write(self.output_dir / "search.html", SEARCH_PAGE)
+        if stats["rendered"] or stats["removed"] or not (self.output_dir / "index.html").exists():
+            self._write_index(manifest)
+            self._write_search_index(manifest)
+
+        self._write(self.manifest_path, json.dumps({"sessions": manifest}, ensure_ascii=False))
+        return stats
+
+
+def build_browser(project_root: Optional[Path] = None, force: bool = False) -> Dict[str, int]:
+    """
+    Build the conversation browser for a project (convenience function).
+
+    Args:
+        project_root: Project root (defaults to auto-detect)
+        force: Re-render every session
+
+    Returns:
+        Counts of rendered, unchanged and removed sessions
+    """
+    project_root = project_root or Path(__file__).parent.parent.parent
+    return LogBrowserBuilder(project_root / "dev-logs").build(force=force)
+
+
+def main(args: Optional[List[str]] = None):
+    """Build the browser from the command line."""
+    parser = argparse.ArgumentParser(description="Render dev-logs into a static HTML browser")
+    parser.add_argument("--logs", type=Path, default=None, help="Log directory (default: <project>/dev-logs)")
+    parser.add_argument("--output", type=Path, default=None, help="Site directory (default: <logs>/_browser)")
+    parser.add_argument("--force", action="store_true", help="Re-render every session")
+    options = parser.parse_args(args)
+
+    logs_dir = options.logs or Path(__file__).parent.parent.parent / "dev-logs"
+    builder = LogBrowserBuilder(logs_dir, options.output)
+    stats = builder.build(force=options.force)
+    print(f"✓ Browser: {stats['rendered']} rendered, {stats['unchanged']} unchanged, "
+          f"{stats['removed']} removed → {builder.output_dir / 'index.html'}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
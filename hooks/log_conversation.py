@@ -8,6 +8,12 @@ Usage:
     python log_conversation.py user "Your prompt text here"
     python log_conversation.py summary "Claude's summary text here"
     python log_conversation.py finalize
+    python log_conversation.py report --since 2026-01-01 [--until 2026-03-31] [--by week] [--json]
+    python log_conversation.py show <session_id | log file>
+    python log_conversation.py search "text"
+    python log_conversation.py browse [--force]     # static HTML browser (log_browser.py)
+
+show and search read compressed (.md.gz / .md.zst) logs transparently.
 
 You can also use it from Claude Code by invoking it via Bash:
     python .claude/hooks/log_conversation.py summary "Task completed successfully"
@@ -15,18 +21,111 @@ You can also use it from Claude Code by invoking it via Bash:
 
 import sys
 import json
+import argparse
+from datetime import date
 from pathlib import Path
 from conversation_logger import get_logger
+from activity_stats import ActivityAggregates, parse_since, format_report
+from log_archive import find_logs, open_log, read_log
+import log_browser
+from session_manager import get_session_manager
+
+
+def report(args):
+    """
+    Print activity aggregates for a date range.
+
+    Args:
+        args: Arguments after "report"
+    """
+    parser = argparse.ArgumentParser(prog="log_conversation.py report",
+                                     description="Show daily/weekly activity from the incremental aggregates")
+    parser.add_argument("--since", default="7d",
+                        help="Start date: YYYY-MM-DD, YYYY-MM, or relative like 7d / 4w (default: 7d)")
+    parser.add_argument("--until", default=None, help="End date, YYYY-MM-DD (default: today)")
+    parser.add_argument("--by", choices=["day", "week", "month"], default="day", help="Row period")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    options = parser.parse_args(args)
+
+    try:
+        since = parse_since(options.since)
+        until = date.fromisoformat(options.until) if options.until else date.today()
+    except ValueError as e:
+        print(f"Error: Invalid date: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    rows = ActivityAggregates().report(since, until, by=options.by)
+    if options.json:
+        print(json.dumps([{"period": label, **record} for label, record in rows], indent=2))
+    else:
+        print(f"Activity {since.isoformat()} → {until.isoformat()}\n")
+        print(format_report(rows), end="")
+
+
+def show(target: str):
+    """
+    Print a session log, compressed or not.
+
+    Args:
+        target: Session ID or log file path
+    """
+    manager = get_session_manager()
+    log_file = manager.get_log_file_path(target) if manager.session_exists(target) else None
+    path = manager.project_root / log_file if log_file else Path(target)
+
+    try:
+        sys.stdout.write(read_log(path))
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def search(text: str):
+    """
+    Print matching lines from every conversation log (case-insensitive).
+
+    Args:
+        text: Text to look for
+    """
+    needle = text.lower()
+    project_root = get_session_manager().project_root
+    matches = 0
+    for path in find_logs(project_root / "dev-logs"):
+        try:
+            with open_log(path) as f:
+                for line_number, line in enumerate(f, 1):
+                    if needle in line.lower():
+                        print(f"{path.relative_to(project_root)}:{line_number}: {line.rstrip()}")
+                        matches += 1
+        except RuntimeError as e:
+            print(f"Warning: {e}", file=sys.stderr)
+    print(f"{matches} match(es)", file=sys.stderr)
 
 
 def main():
     """Main entry point for manual logging."""
     if len(sys.argv) < 2:
         print("Usage: log_conversation.py <command> [text]", file=sys.stderr)
-        print("Commands: user, summary, finalize, status", file=sys.stderr)
+        print("Commands: user, summary, finalize, status, report, show, search, browse", file=sys.stderr)
         sys.exit(1)
 
     command = sys.argv[1].lower()
+    if command == "report":
+        report(sys.argv[2:])
+        return
+    if command == "browse":
+        log_browser.main(sys.argv[2:])
+        return
+    if command in ("show", "search"):
+        if len(sys.argv) < 3:
+            print(f"Error: '{command}' command requires an argument", file=sys.stderr)
+            sys.exit(1)
+        if command == "show":
+            show(sys.argv[2])
+        else:
+            search(" ".join(sys.argv[2:]))
+        return
+
     logger = get_logger()
 
     if command == "user":
@@ -64,7 +163,7 @@ def main():
 
     else:
         print(f"Error: Unknown command '{command}'", file=sys.stderr)
-        print("Valid commands: user, summary, finalize, status", file=sys.stderr)
+        print("Valid commands: user, summary, finalize, status, report, show, search, browse", file=sys.stderr)
         sys.exit(1)
 
 
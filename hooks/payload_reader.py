@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Streaming Hook Payload Reader
+=============================================
+Extracts selected fields from a hook's JSON payload without decoding the whole
+document.
+
+Write/Edit events carry entire file contents in tool_input, so a multi-MB Write
+would otherwise be decoded and held in memory just to read tool_name and
+file_path. This reader scans stdin in fixed-size chunks and:
+
+- Decodes only the requested fields (dotted paths, e.g. "tool_input.file_path")
+- Descends only into objects that contain a requested field
+- Skips every other value (including huge strings) by scanning for delimiters,
+  never materializing it
+- Drains the rest of the stream so the writer never sees a broken pipe
+- Can alternatively read the whole payload with long strings redacted
+  (read_hook_payload_redacted), for debug logging with bounded memory
+
+The result is a nested dictionary shaped like the original payload, so code
+using hook_data.get("tool_input", {}).get("file_path") works unchanged.
+"""
+
+import re
+import json
+from typing import Dict, Any, Iterable, IO, List, Optional
+
+
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_CONTAINER_SPECIAL = re.compile(r'["{}\[\]]')
+_SCALAR_END = re.compile(r'[,\]\}\s]')
+
+
+class PayloadReader:
+    """Incremental JSON field extractor over a text stream."""
+
+    def __init__(self, stream: IO[str], chunk_size: int = CHUNK_SIZE):
+        """
+        Initialize the reader.
+
+        Args:
+            stream: Text stream positioned at the start of a JSON object
+            chunk_size: Number of characters to read per chunk
+        """
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.chars_read = 0
+
+    def _fill(self) -> bool:
+        """
+        Read the next chunk, dropping already-consumed text.
+
+        Returns:
+            True if more text was read, False at end of stream
+        """
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.chars_read += len(chunk)
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        """Build a decode error pointing into the current buffer."""
+        return json.JSONDecodeError(message, self.buf, self.pos)
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character (empty at EOF)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str):
+        """Consume the given structural character."""
+        if self._peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self.pos += 1
+
+    def _scan_string(self, sink: Optional[List[str]], limit: Optional[int] = None) -> int:
+        """
+        Consume a string starting at the opening quote.
+
+        Jumps from quote to quote with str.find and only inspects the
+        backslashes right before each quote, so long strings are skipped at
+        C speed.
+
+        Args:
+            sink: List collecting the raw text (None to skip without storing)
+            limit: Stop collecting into sink once the content exceeds this many characters
+
+        Returns:
+            Raw length of the string in the payload, including quotes
+        """
+        start = self.pos
+        total = 0
+        self.pos += 1
+        while True:
+            quote = self.buf.find('"', self.pos)
+            if quote == -1:
+                # Keep a trailing run of backslashes: it may escape the next chunk's quote
+                end = len(self.buf)
+                while end > self.pos and self.buf[end - 1] == "\\":
+                    end -= 1
+                total += end - start
+                if sink is not None:
+                    sink.append(self.buf[start:end])
+                    if limit is not None and total - 1 > limit:
+                        sink = None
+                self.pos = end
+                if not self._fill():
+                    raise self._error("Unterminated string")
+                start = self.pos
+                continue
+
+            backslashes = 0
+            while quote - backslashes - 1 >= self.pos and self.buf[quote - backslashes - 1] == "\\":
+                backslashes += 1
+            self.pos = quote + 1
+            if backslashes % 2 == 0:
+                total += self.pos - start
+                if sink is not None:
+                    sink.append(self.buf[start:self.pos])
+                return total
+
+    def _scan_scalar(self, sink: Optional[List[str]]):
+        """Consume a number or literal (true/false/null)."""
+        while True:
+            match = _SCALAR_END.search(self.buf, self.pos)
+            if match is None and self._fill():
+                continue
+            end = match.start() if match else len(self.buf)
+            if sink is not None:
+                sink.append(self.buf[self.pos:end])
+            self.pos = end
+            return
+
+    def _scan_container(self, sink: Optional[List[str]]):
+        """Consume an object or array starting at its opening bracket."""
+        depth = 0
+        start = self.pos
+        while True:
+            match = _CONTAINER_SPECIAL.search(self.buf, self.pos)
+            if match is None:
+                if sink is not None:
+                    sink.append(self.buf[start:])
+                start = self.pos = len(self.buf)
+                if not self._fill():
+                    raise self._error("Unterminated container")
+                start = self.pos
+                continue
+
+            char = match.group()
+            if char == '"':
+                if sink is not None:
+                    sink.append(self.buf[start:match.start()])
+                self.pos = match.start()
+                self._scan_string(sink)
+                start = self.pos
+                continue
+
+            self.pos = match.end()
+            depth += 1 if char in "{[" else -1
+            if depth == 0:
+                if sink is not None:
+                    sink.append(self.buf[start:self.pos])
+                return
+
+    def _read_value(self, path: str, fields: set, prefixes: set, result: Dict[str, Any]):
+        """
+        Consume one value, capturing it if requested or descending into it if needed.
+
+        Args:
+            path: Dotted path of this value
+            fields: Requested field paths
+            prefixes: Paths of objects that contain requested fields
+            result: Flat path → value dictionary being filled
+        """
+        char = self._peek()
+        if not char:
+            raise self._error("Expecting value")
+
+        if path in fields:
+            sink: List[str] = []
+            if char == '"':
+                self._scan_string(sink)
+            elif char in "{[":
+                self._scan_container(sink)
+            else:
+                self._scan_scalar(sink)
+            result[path] = json.loads("".join(sink))
+        elif char == "{" and (not path or path in prefixes):
+            self._read_object(path, fields, prefixes, result)
+        elif char == '"':
+            self._scan_string(None)
+        elif char in "{[":
+            self._scan_container(None)
+        else:
+            self._scan_scalar(None)
+
+    def _read_object(self, path: str, fields: set, prefixes: set, result: Dict[str, Any]):
+        """Consume an object, visiting each member value."""
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            if self._peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key_raw: List[str] = []
+            self._scan_string(key_raw)
+            key = json.loads("".join(key_raw))
+            self._expect(":")
+
+            self._read_value(f"{path}.{key}" if path else key, fields, prefixes, result)
+
+            char = self._peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                self.pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def _read_redacted(self, path: str, max_chars: int, keep: set) -> Any:
+        """
+        Consume one value into Python objects, redacting long strings.
+
+        Args:
+            path: Dotted path of this value (array items share their array's path)
+            max_chars: Strings longer than this are replaced by a placeholder
+            keep: Paths whose strings are never redacted
+
+        Returns:
+            The decoded (and possibly redacted) value
+        """
+        char = self._peek()
+        if not char:
+            raise self._error("Expecting value")
+
+        if char == '"':
+            limit = None if path in keep else max_chars
+            sink: List[str] = []
+            length = self._scan_string(sink, limit)
+            if limit is not None and length > limit + 2:
+                return f"<redacted: {length - 2} chars>"
+            return json.loads("".join(sink))
+
+        if char not in "{[":
+            sink = []
+            self._scan_scalar(sink)
+            return json.loads("".join(sink))
+
+        closing = "}" if char == "{" else "]"
+        container: Any = {} if char == "{" else []
+        self.pos += 1
+        if self._peek() == closing:
+            self.pos += 1
+            return container
+
+        while True:
+            if char == "{":
+                if self._peek() != '"':
+                    raise self._error("Expecting property name enclosed in double quotes")
+                key_raw: List[str] = []
+                self._scan_string(key_raw)
+                key = json.loads("".join(key_raw))
+                self._expect(":")
+                container[key] = self._read_redacted(f"{path}.{key}" if path else key, max_chars, keep)
+            else:
+                container.append(self._read_redacted(path, max_chars, keep))
+
+            delimiter = self._peek()
+            self.pos += 1
+            if delimiter == closing:
+                return container
+            if delimiter != ",":
+                self.pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def read_redacted(self, max_chars: int, keep: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Read the whole payload, replacing strings longer than max_chars.
+
+        Long strings (e.g. Write contents) are skipped without being stored, so
+        memory stays bounded while every other field is kept.
+
+        Args:
+            max_chars: Maximum string length kept verbatim
+            keep: Dotted paths that are never redacted (e.g. "tool_input.command")
+
+        Returns:
+            Payload dictionary with long strings replaced by "<redacted: N chars>"
+        """
+        if self._peek() != "{":
+            raise self._error("Expecting object")
+        result = self._read_redacted("", max_chars, set(keep))
+
+        # Drain trailing input so the writer never gets a broken pipe
+        while self._fill():
+            self.pos = len(self.buf)
+
+        return result
+
+    def extract(self, fields: Iterable[str]) -> Dict[str, Any]:
+        """
+        Extract the requested fields from the stream.
+
+        Args:
+            fields: Dotted field paths (e.g. "tool_name", "tool_input.file_path")
+
+        Returns:
+            Nested dictionary containing only the fields present in the payload
+        """
+        fields = set(fields)
+        prefixes = set()
+        for field in fields:
+            parts = field.split(".")
+            for i in range(1, len(parts)):
+                prefixes.add(".".join(parts[:i]))
+
+        flat: Dict[str, Any] = {}
+        if self._peek() != "{":
+            raise self._error("Expecting object")
+        self._read_object("", fields, prefixes, flat)
+
+        # Drain trailing input so the writer never gets a broken pipe
+        while self._fill():
+            self.pos = len(self.buf)
+
+        result: Dict[str, Any] = {}
+        for field, value in flat.items():
+            node = result
+            parts = field.split(".")
+            for part in parts[:-1]:
+                node = node.setdefault(part, {})
+            node[parts[-1]] = value
+
+        return result
+
+
+def read_hook_fields(stream: IO[str], fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Extract selected fields from a hook payload stream (convenience function).
+
+    Args:
+        stream: Text stream containing the JSON payload (e.g. sys.stdin)
+        fields: Dotted field paths to extract
+
+    Returns:
+        Nested dictionary containing only the requested fields
+
+    Raises:
+        json.JSONDecodeError: If the payload is not a valid JSON object
+    """
+    return PayloadReader(stream).extract(fields)
+
+
+def read_hook_payload_redacted(stream: IO[str], max_chars: int,
+                               keep: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    Read a full hook payload with long strings redacted (convenience function).
+
+    Args:
+        stream: Text stream containing the JSON payload (e.g. sys.stdin)
+        max_chars: Maximum string length kept verbatim
+        keep: Dotted paths that are never redacted
+
+    Returns:
+        Payload dictionary with long strings replaced by placeholders
+
+    Raises:
+        json.JSONDecodeError: If the payload is not a valid JSON object
+    """
+    return PayloadReader(stream).read_redacted(max_chars, keep)
+
+
+if __name__ == "__main__":
+    """Test the reader against json.loads on a large synthetic payload."""
+    import io
+    import sys
+    import time
+
+    payload = {
+        "session_id": "test-session-123",
+        "hook_event_name": "PreToolUse",
+        "tool_name": "Write",
+        "tool_input": {
+            "content": "line with \"quotes\" and \\ backslashes\n" * 200000,
+            "file_path": "/tmp/example.md",
+            "nested": {"a": [1, 2, {"b": "}"}]},
+        },
+        "stop_hook_active": False,
+    }
+    text = json.dumps(payload)
+    wanted = ["session_id", "hook_event_name", "tool_name", "tool_input.file_path",
+              "tool_input.command", "stop_hook_active"]
+
+    start = time.perf_counter()
+    extracted = read_hook_fields(io.StringIO(text), wanted)
+    elapsed = time.perf_counter() - start
+
+    print(f"Payload size: {len(text) / 1024 / 1024:.1f} MB", file=sys.stderr)
+    print(f"Extracted in {elapsed * 1000:.1f} ms: {extracted}", file=sys.stderr)
+
+    assert extracted == {
+        "session_id": "test-session-123",
+        "hook_event_name": "PreToolUse",
+        "tool_name": "Write",
+        "tool_input": {"file_path": "/tmp/example.md"},
+        "stop_hook_active": False,
+    }
+
+    redacted = read_hook_payload_redacted(io.StringIO(text), 200, keep=["tool_input.file_path"])
+    print(f"Redacted content: {redacted['tool_input']['content']}", file=sys.stderr)
+    assert redacted["tool_input"]["content"].startswith("<redacted: ")
+    assert redacted["tool_input"]["nested"] == payload["tool_input"]["nested"]
+    print("Test completed successfully!", file=sys.stderr)
@@ -10,12 +10,21 @@ Key Improvements:
 - Reads file changes from session JSON (persistent storage)
 - Writes comprehensive session summary to markdown
 - Marks session as finalized in session JSON
+- Writes a per-tool latency table (from paired Pre/PostToolUse events)
+- Flushes queued hook work first so the log is complete before the summary
+- Removes the session's private git snapshot index
+- Adds the session's activity to the daily aggregates (activity_stats.py)
+- Optionally registers a session summary in the global ~/.claude registry
 """
 
 import sys
 import json
 from session_manager import get_session_manager
 from conversation_logger import get_logger
+from work_queue import flush_queue
+from git_snapshot import get_git_snapshot
+from activity_stats import record_session_activity
+from global_registry import register_session
 
 
 def main():
@@ -32,6 +41,9 @@ def main():
             print("Warning: No valid session_id in SessionEnd hook", file=sys.stderr)
             sys.exit(0)
 
+        # Write any prompts/responses still waiting in the work queue
+        flush_queue()
+
         # Initialize session manager
         session_manager = get_session_manager()
 
@@ -46,6 +58,15 @@ def main():
         # Finalize session (reads file changes from session JSON)
         logger.finalize_session(session_id)
 
+        # The snapshot index is only needed between turns (a resume re-seeds it)
+        get_git_snapshot(session_id).remove_index()
+
+        # Incremental daily aggregates for `log_conversation.py report`
+        record_session_activity(session_id)
+
+        # Cross-project registry (no-op unless enabled)
+        register_session(session_id)
+
         # Get session summary
         summary = logger.get_session_summary(session_id)
         log_file = summary.get("session_file", "unknown")
@@ -57,6 +78,17 @@ def main():
         print(f"  Responses logged: {summary.get('responses_count', 0)}", file=sys.stderr)
         print(f"  Files modified: {len(summary.get('files_modified', []))}", file=sys.stderr)
 
+        tool_stats = summary.get("tool_stats", {})
+        if tool_stats:
+            slowest = max(tool_stats, key=lambda tool: tool_stats[tool].get("total_seconds", 0))
+            print(f"  Most time spent in: {slowest} "
+                  f"({tool_stats[slowest].get('total_seconds', 0):.1f}s over "
+                  f"{tool_stats[slowest].get('count', 0)} calls)", file=sys.stderr)
+
+        tool_counts = summary.get("tool_counts", {})
+        if tool_counts:
+            print(f"  Read-only tool calls: {sum(tool_counts.values())}", file=sys.stderr)
+
         # Exit successfully
         sys.exit(0)
 
@@ -9,16 +9,36 @@ Key Features:
 - Uses session_id to maintain continuity
 - Stores session data in .claude/data/sessions/{session_id}.json
 - Generates consistent log file paths per session
+- Per-process singleton with a read-through cache validated by mtime/size,
+  so a hook invocation reads each session file at most once
+- Spools file changes ({session_id}.files), tool timings ({session_id}.tools)
+  and tool counters ({session_id}.counts) with one append per tool call,
+  merged into the session JSON at Stop/SessionEnd
+- Keeps each session's private git snapshot index ({session_id}.index)
+- Tracks active time per run (SessionStart to SessionEnd), so the idle gap
+  before a resume isn't counted as session time
 
 This solves the problem of creating multiple log files per session by storing
 session metadata (log file path, timestamps, prompts, file changes) in a persistent
 JSON file that all hooks can read/write to.
 """
 
+import sys
+import os
+import copy
 import json
+import fcntl
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+
+# PreToolUse events without a PostToolUse (interrupted or crashed tools) are
+# dropped from "tool_pending" after this many seconds, and at SessionEnd
+TOOL_PENDING_TTL = 3600
+
+# Per-tool "durations" keep only the most recent samples (for the p95);
+# count, total and max cover every call
+TOOL_DURATION_SAMPLES = 200
 
 
 class SessionManager:
@@ -33,7 +53,9 @@ class SessionManager:
         """
         self.project_root = project_root or self._get_project_root()
         self.sessions_dir = self.project_root / ".claude" / "data" / "sessions"
-        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+
+        # Read-through cache: session_id -> ((mtime_ns, size), session data)
+        self._cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
 
     def _get_project_root(self) -> Path:
         """Get the project root directory (parent of .claude folder)."""
@@ -51,6 +73,32 @@ class SessionManager:
         """
         return self.sessions_dir / f"{session_id}.json"
 
+    def get_spool_file_path(self, session_id: str, kind: str = "files") -> Path:
+        """
+        Get the path to one of a session's append-only spools.
+
+        Args:
+            session_id: Unique session identifier
+            kind: Spool kind ("files" for file changes, "tools" for tool events,
+                  "counts" for tool counters; "lock" is the merge lock file)
+
+        Returns:
+            Path to the spool file (one record per line)
+        """
+        return self.sessions_dir / f"{session_id}.{kind}"
+
+    def get_snapshot_index_path(self, session_id: str) -> Path:
+        """
+        Get the path to a session's private git index (see git_snapshot.py).
+
+        Args:
+            session_id: Unique session identifier
+
+        Returns:
+            Path to the snapshot index file
+        """
+        return self.sessions_dir / f"{session_id}.index"
+
     def session_exists(self, session_id: str) -> bool:
         """
         Check if a session exists.
@@ -63,10 +111,23 @@ class SessionManager:
         """
         return self.get_session_file_path(session_id).exists()
 
+    def _stat_key(self, session_file: Path) -> Optional[Tuple[int, int]]:
+        """Get the (mtime_ns, size) cache validator of a file, or None if missing."""
+        try:
+            stat = session_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     def load_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Load session data from file.
 
+        Reads go through a per-process cache validated by the file's mtime and
+        size, so repeated loads within one hook cost a single stat(). Each call
+        returns its own copy: changes reach the cache (and the file) only
+        through save_session().
+
         Args:
             session_id: Unique session identifier
 
@@ -75,16 +136,25 @@ class SessionManager:
         """
         session_file = self.get_session_file_path(session_id)
 
-        if not session_file.exists():
+        key = self._stat_key(session_file)
+        if key is None:
+            self._cache.pop(session_id, None)
             return None
 
+        cached = self._cache.get(session_id)
+        if cached is not None and cached[0] == key:
+            return copy.deepcopy(cached[1])
+
         try:
             with open(session_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                data = json.load(f)
         except (json.JSONDecodeError, IOError) as e:
             print(f"Warning: Failed to load session {session_id}: {e}", file=sys.stderr)
             return None
 
+        self._cache[session_id] = (key, data)
+        return copy.deepcopy(data)
+
     def save_session(self, session_id: str, data: Dict[str, Any]) -> bool:
         """
         Save session data to file.
@@ -99,13 +169,24 @@ class SessionManager:
         session_file = self.get_session_file_path(session_id)
 
         try:
-            with open(session_file, 'w', encoding='utf-8') as f:
+            try:
+                f = open(session_file, 'w', encoding='utf-8')
+            except FileNotFoundError:
+                # First session in this project: create the directory once
+                self.sessions_dir.mkdir(parents=True, exist_ok=True)
+                f = open(session_file, 'w', encoding='utf-8')
+            with f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
-            return True
         except IOError as e:
+            self._cache.pop(session_id, None)
             print(f"Error: Failed to save session {session_id}: {e}", file=sys.stderr)
             return False
 
+        key = self._stat_key(session_file)
+        if key is not None:
+            self._cache[session_id] = (key, copy.deepcopy(data))
+        return True
+
     def create_session(self, session_id: str, log_file_path: str) -> Dict[str, Any]:
         """
         Create a new session with initial data.
@@ -127,6 +208,8 @@ class SessionManager:
             "responses": [],
             "file_changes": [],
             "finalized": False,
+            "run_start": now.isoformat(),
+            "active_seconds": 0.0,
             "created_at": now.isoformat(),
             "updated_at": now.isoformat()
         }
@@ -205,7 +288,8 @@ class SessionManager:
         return self.save_session(session_id, session_data)
 
     def add_response(self, session_id: str, response: str, response_type: str = "agent",
-                     timestamp: Optional[str] = None) -> bool:
+                     timestamp: Optional[str] = None,
+                     turn_diff: Optional[List[Dict[str, Any]]] = None) -> bool:
         """
         Add a Claude response to the session.
 
@@ -214,6 +298,7 @@ class SessionManager:
             response: Response text
             response_type: Type of response ("agent" or "subagent")
             timestamp: Optional timestamp (defaults to now)
+            turn_diff: Optional per-file changes made during the turn
 
         Returns:
             True if successful, False otherwise
@@ -228,6 +313,8 @@ class SessionManager:
             "content": response,
             "type": response_type
         }
+        if turn_diff is not None:
+            response_entry["turn_diff"] = turn_diff
 
         session_data["responses"].append(response_entry)
         session_data["updated_at"] = datetime.now().isoformat()
@@ -258,6 +345,239 @@ class SessionManager:
 
         return True
 
+    def _append_to_spool(self, session_id: str, kind: str, line: str) -> bool:
+        """
+        Append one line to a session spool (single small O_APPEND write).
+
+        Args:
+            session_id: Unique session identifier
+            kind: Spool kind
+            line: Record without trailing newline
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with open(self.get_spool_file_path(session_id, kind), 'a', encoding='utf-8') as f:
+                f.write(line.replace("\n", " ") + "\n")
+            return True
+        except IOError as e:
+            print(f"Error: Failed to append to {kind} spool for {session_id}: {e}", file=sys.stderr)
+            return False
+
+    def _claim_spool(self, session_id: str, kind: str) -> Tuple[List[str], List[Path]]:
+        """
+        Take ownership of a spool's lines for merging (call with the merge lock held).
+
+        The spool is renamed before reading so hooks appending concurrently
+        start a fresh spool instead of losing lines. Spools claimed by an
+        earlier merge that failed to save are picked up again; the merge lock
+        guarantees no other merge is holding them.
+
+        Args:
+            session_id: Unique session identifier
+            kind: Spool kind
+
+        Returns:
+            Tuple of (spooled lines, claimed files to delete after saving)
+        """
+        spool_file = self.get_spool_file_path(session_id, kind)
+        claimed = spool_file.with_name(f"{spool_file.name}.{os.getpid()}")
+
+        try:
+            os.replace(spool_file, claimed)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: Failed to claim {kind} spool for {session_id}: {e}", file=sys.stderr)
+
+        claimed_spools = sorted(self.sessions_dir.glob(f"{spool_file.name}.*"))
+        lines = []
+        for spool in claimed_spools:
+            try:
+                with open(spool, 'r', encoding='utf-8') as f:
+                    lines.extend(line.rstrip("\n") for line in f if line.strip())
+            except IOError as e:
+                print(f"Warning: Failed to read spool {spool.name}: {e}", file=sys.stderr)
+
+        return lines, claimed_spools
+
+    def spool_file_change(self, session_id: str, file_path: str) -> bool:
+        """
+        Record a file change by appending one line to the session spool.
+
+        This is the per-tool-call fast path: no session JSON load or rewrite.
+        The spool is merged into "file_changes" by merge_spools().
+
+        Args:
+            session_id: Unique session identifier
+            file_path: Path to the changed file
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._append_to_spool(session_id, "files", file_path)
+
+    def spool_tool_event(self, session_id: str, event: Dict[str, Any]) -> bool:
+        """
+        Record a PreToolUse/PostToolUse timing event in the session spool.
+
+        Args:
+            session_id: Unique session identifier
+            event: Dictionary with "id" (tool_use_id), "phase" ("pre"/"post"),
+                   "tool", "time" and, for "post", "size" and "outcome"
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._append_to_spool(session_id, "tools", json.dumps(event, separators=(",", ":")))
+
+    def spool_tool_count(self, session_id: str, tool_name: str) -> bool:
+        """
+        Count one call of a tool whose policy is "count".
+
+        Args:
+            session_id: Unique session identifier
+            tool_name: Tool name
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._append_to_spool(session_id, "counts", tool_name)
+
+    def _apply_tool_counts(self, session_data: Dict[str, Any], spooled: List[str]) -> bool:
+        """Add spooled tool calls to the "tool_counts" counters."""
+        counts = session_data.setdefault("tool_counts", {})
+        for tool_name in spooled:
+            counts[tool_name] = counts.get(tool_name, 0) + 1
+        return bool(spooled)
+
+    def _apply_file_changes(self, session_data: Dict[str, Any], spooled: List[str]) -> bool:
+        """Merge spooled file paths into "file_changes" (set-backed de-duplication)."""
+        file_changes = session_data.setdefault("file_changes", [])
+        seen = set(file_changes)
+        added = False
+        for file_path in spooled:
+            if file_path not in seen:
+                seen.add(file_path)
+                file_changes.append(file_path)
+                added = True
+        return added
+
+    def _apply_tool_events(self, session_data: Dict[str, Any], spooled: List[str],
+                           final: bool = False) -> bool:
+        """
+        Pair spooled PreToolUse/PostToolUse events by tool_use_id into "tool_stats".
+
+        PreToolUse events still waiting for their PostToolUse are kept in
+        "tool_pending" so they can pair at a later merge, for at most
+        TOOL_PENDING_TTL seconds (none are kept once the session ends).
+        """
+        pending = session_data.setdefault("tool_pending", {})
+        if not spooled and not pending:
+            return False
+
+        stats = session_data.setdefault("tool_stats", {})
+
+        for line in spooled:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            tool_use_id = event.get("id")
+            if not tool_use_id:
+                continue
+
+            if event.get("phase") == "pre":
+                pending[tool_use_id] = {"tool": event.get("tool", "unknown"), "time": event.get("time")}
+                continue
+
+            start = pending.pop(tool_use_id, None)
+            if start is None or start.get("time") is None or event.get("time") is None:
+                continue
+
+            tool = start["tool"]
+            duration = max(0.0, event["time"] - start["time"])
+            entry = stats.setdefault(tool, {
+                "count": 0, "total_seconds": 0.0, "max_seconds": 0.0, "durations": [],
+                "payload_chars": 0, "outcomes": {}
+            })
+            entry["count"] += 1
+            entry["total_seconds"] = round(entry["total_seconds"] + duration, 3)
+            entry["max_seconds"] = max(entry.get("max_seconds", 0.0), round(duration, 3))
+            entry["durations"].append(round(duration, 3))
+            del entry["durations"][:-TOOL_DURATION_SAMPLES]
+            entry["payload_chars"] += event.get("size", 0)
+            outcome = event.get("outcome", "ok")
+            entry["outcomes"][outcome] = entry["outcomes"].get(outcome, 0) + 1
+
+        if final:
+            pending.clear()
+        else:
+            cutoff = datetime.now().timestamp() - TOOL_PENDING_TTL
+            for tool_use_id in [key for key, start in pending.items() if (start.get("time") or 0) < cutoff]:
+                del pending[tool_use_id]
+
+        return True
+
+    def merge_spools(self, session_id: str, final: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Merge all spooled hook records into the session JSON in one load/save.
+
+        - "files": file paths → "file_changes"
+        - "tools": Pre/PostToolUse timings → "tool_stats"
+        - "counts": counted tool calls → "tool_counts"
+
+        Merges are serialized by a per-session lock file, so a background
+        Stop merge and a SessionEnd merge never read the same spool twice.
+
+        Args:
+            session_id: Unique session identifier
+            final: The session is ending (drops unpaired PreToolUse events)
+
+        Returns:
+            Updated session data dictionary or None if session doesn't exist
+        """
+        if not self.session_exists(session_id):
+            return None
+
+        with open(self.get_spool_file_path(session_id, "lock"), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            return self._merge_spools_locked(session_id, final)
+
+    def _merge_spools_locked(self, session_id: str, final: bool) -> Optional[Dict[str, Any]]:
+        """Body of merge_spools(), run with the merge lock held."""
+        session_data = self.load_session(session_id)
+
+        if session_data is None:
+            return None
+
+        file_lines, file_spools = self._claim_spool(session_id, "files")
+        tool_lines, tool_spools = self._claim_spool(session_id, "tools")
+        count_lines, count_spools = self._claim_spool(session_id, "counts")
+        claimed_spools = file_spools + tool_spools + count_spools
+        if not claimed_spools and not (final and session_data.get("tool_pending")):
+            return session_data
+
+        changed = self._apply_file_changes(session_data, file_lines)
+        changed = self._apply_tool_events(session_data, tool_lines, final) or changed
+        changed = self._apply_tool_counts(session_data, count_lines) or changed
+
+        if changed:
+            session_data["updated_at"] = datetime.now().isoformat()
+            if not self.save_session(session_id, session_data):
+                # Leave the claimed spools in place; they are re-read on the next merge
+                return session_data
+
+        for spool in claimed_spools:
+            try:
+                spool.unlink()
+            except OSError:
+                pass
+
+        return session_data
+
     def get_log_file_path(self, session_id: str) -> Optional[str]:
         """
         Get the log file path for a session.
@@ -296,10 +616,61 @@ class SessionManager:
         Returns:
             True if successful, False otherwise
         """
-        return self.update_session(session_id, {
-            "finalized": True,
-            "end_time": datetime.now().isoformat()
-        })
+        session_data = self.load_session(session_id)
+        if session_data is None:
+            print(f"Warning: Cannot update non-existent session {session_id}", file=sys.stderr)
+            return False
+
+        now = datetime.now()
+        self._close_run(session_data, now)
+        session_data["finalized"] = True
+        session_data["end_time"] = now.isoformat()
+        session_data["updated_at"] = now.isoformat()
+        return self.save_session(session_id, session_data)
+
+    def _close_run(self, session_data: Dict[str, Any], end: datetime):
+        """
+        Add the open run (SessionStart to now) to the session's active time.
+
+        Args:
+            session_data: Session data (modified in place)
+            end: When the run ended
+        """
+        run_start = session_data.pop("run_start", None)
+        if run_start:
+            run_seconds = (end - datetime.fromisoformat(run_start)).total_seconds()
+            session_data["active_seconds"] = round(session_data.get("active_seconds", 0.0)
+                                                   + max(0.0, run_seconds), 3)
+
+    def start_run(self, session_id: str) -> bool:
+        """
+        Start a new run of a resumed session.
+
+        Time between runs isn't counted as active. A run left open by a
+        session that never reached SessionEnd is closed at its last update.
+
+        Args:
+            session_id: Unique session identifier
+
+        Returns:
+            True if successful, False otherwise
+        """
+        session_data = self.load_session(session_id)
+        if session_data is None:
+            return False
+
+        if "active_seconds" not in session_data and session_data.get("end_time"):
+            # Sessions from before runs were tracked ended a single run
+            session_data["active_seconds"] = round(max(0.0, (
+                datetime.fromisoformat(session_data["end_time"])
+                - datetime.fromisoformat(session_data["start_time"])).total_seconds()), 3)
+        if session_data.get("run_start"):
+            self._close_run(session_data, datetime.fromisoformat(session_data["updated_at"]))
+
+        now = datetime.now().isoformat()
+        session_data["run_start"] = now
+        session_data["updated_at"] = now
+        return self.save_session(session_id, session_data)
 
     def cleanup_old_sessions(self, days: int = 30) -> int:
         """
@@ -314,7 +685,10 @@ class SessionManager:
         cutoff_date = datetime.now().timestamp() - (days * 24 * 60 * 60)
         deleted_count = 0
 
-        for session_file in self.sessions_dir.glob("*.json"):
+        stale_files = []
+        for pattern in ("*.json", "*.files*", "*.tools*", "*.counts*", "*.index", "*.lock"):
+            stale_files.extend(self.sessions_dir.glob(pattern))
+        for session_file in stale_files:
             if session_file.stat().st_mtime < cutoff_date:
                 try:
                     session_file.unlink()
@@ -326,9 +700,43 @@ class SessionManager:
 
 
 # Convenience functions for use in hooks
+_session_manager: Optional[SessionManager] = None
+
+
 def get_session_manager() -> SessionManager:
-    """Get a SessionManager instance."""
-    return SessionManager()
+    """Get the per-process SessionManager instance (shares its session cache)."""
+    global _session_manager
+    if _session_manager is None:
+        _session_manager = SessionManager()
+    return _session_manager
+
+
+def active_seconds(session_data: Dict[str, Any], until: Optional[datetime] = None) -> float:
+    """
+    Get the time a session was active: the sum of its runs (SessionStart to
+    SessionEnd), excluding gaps between a SessionEnd and a resume.
+
+    Args:
+        session_data: Session data dictionary
+        until: End of a still-open run (default: the session's last update)
+
+    Returns:
+        Active time in seconds
+    """
+    if "active_seconds" not in session_data and "run_start" not in session_data:
+        # Sessions from before runs were tracked: one run, start to end
+        end_time = session_data.get("end_time") or session_data.get("updated_at")
+        if not end_time:
+            return 0.0
+        start_time = session_data.get("start_time") or end_time
+        return max(0.0, (datetime.fromisoformat(end_time) - datetime.fromisoformat(start_time)).total_seconds())
+
+    seconds = session_data.get("active_seconds", 0.0)
+    run_start = session_data.get("run_start")
+    run_end = until or (datetime.fromisoformat(session_data["updated_at"]) if session_data.get("updated_at") else None)
+    if run_start and run_end:
+        seconds += max(0.0, (run_end - datetime.fromisoformat(run_start)).total_seconds())
+    return seconds
 
 
 def load_session_data(session_id: str) -> Optional[Dict[str, Any]]:
@@ -362,8 +770,6 @@ def save_session_data(session_id: str, data: Dict[str, Any]) -> bool:
 
 if __name__ == "__main__":
     """Test the session manager."""
-    import sys
-
     print("Testing SessionManager...", file=sys.stderr)
 
     manager = SessionManager()
@@ -10,6 +10,7 @@ Key Improvements:
 - Creates or loads existing session based on session_id
 - Creates markdown log file only once per session (not per prompt)
 - Enables one session = one log file
+- Takes the baseline git snapshot for per-turn diff stats
 """
 
 import sys
@@ -17,6 +18,7 @@ import json
 from pathlib import Path
 from session_manager import SessionManager, get_session_manager
 from conversation_logger import get_logger
+from git_snapshot import snapshot_turn
 
 
 def main():
@@ -44,6 +46,9 @@ def main():
             session_data = session_manager.load_session(session_id)
             log_file = session_data.get("log_file", "unknown") if session_data else "unknown"
 
+            # Time since the session last ended isn't counted as active
+            session_manager.start_run(session_id)
+
             print(f"📝 Conversation logging resumed: {log_file}", file=sys.stderr)
             print(f"   Session ID: {session_id}", file=sys.stderr)
         else:
@@ -59,6 +64,10 @@ def main():
             print(f"   Session ID: {session_id}", file=sys.stderr)
             print(f"   Session file: {session_manager.get_session_file_path(session_id)}", file=sys.stderr)
 
+        # Baseline for the first turn's diff (on resume, changes made between
+        # sessions aren't attributed to a turn)
+        snapshot_turn(session_id)
+
         # Exit successfully
         sys.exit(0)
 
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Claude Code Statusline
+=============================================
+Python replacement for statusline-command.sh.
+
+Renders: <dir> on 🌱 <branch> [+staged !modified ?untracked xdeleted] via 🐍 <venv> via ⬢ <node>
+
+Key Features:
+- One `git status --porcelain=v2 --branch` call instead of four
+  `git status --porcelain` runs plus jq
+- All counters computed in a single pass over the porcelain output
+- Git status and node version cached per directory in .claude/data/statusline/, keyed on
+  .git/index and HEAD mtimes with a short TTL, so most refreshes never start
+  a subprocess
+- Uses --no-optional-locks so the status call never rewrites .git/index
+  (which would invalidate the cache on every refresh)
+
+Usage (settings.json):
+    "statusLine": {"type": "command", "command": "python3 ~/.claude/hooks/statusline.py"}
+"""
+
+import sys
+import os
+import json
+import time
+import hashlib
+import subprocess
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+
+# ===== CONFIGURATION =====
+# Seconds a cached git status stays valid while .git/index and HEAD are unchanged.
+# Working-tree edits don't touch either file, so this bounds how stale counts get.
+CACHE_TTL = 5.0
+
+# Seconds a cached node version stays valid
+NODE_CACHE_TTL = 300.0
+
+CYAN = "\033[36m"
+MAGENTA = "\033[35m"
+YELLOW = "\033[33m"
+GREEN = "\033[32m"
+RESET = "\033[0m"
+
+
+def find_git_dir(start: Path) -> Optional[Path]:
+    """
+    Locate the .git directory for a path without running git.
+
+    Args:
+        start: Directory to search upwards from
+
+    Returns:
+        Path to the git directory (resolving worktree .git files) or None
+    """
+    for directory in [start, *start.parents]:
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:"):].strip())
+                return git_dir if git_dir.is_absolute() else (directory / git_dir).resolve()
+            return None
+    return None
+
+
+def _mtime(path: Path) -> int:
+    """File mtime in nanoseconds (0 if missing)."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def parse_porcelain_v2(output: str) -> Dict[str, Any]:
+    """
+    Compute branch and status counters from `git status --porcelain=v2 --branch`.
+
+    Counters match statusline-command.sh: staged = index status M/A/R/C,
+    modified/deleted = worktree M/D with a clean index, untracked = "?" entries.
+
+    Args:
+        output: Porcelain v2 output
+
+    Returns:
+        Dictionary with branch, staged, modified, untracked, deleted
+    """
+    info = {"branch": "", "staged": 0, "modified": 0, "untracked": 0, "deleted": 0}
+    oid = ""
+
+    for line in output.splitlines():
+        if line.startswith("# branch.head "):
+            info["branch"] = line[len("# branch.head "):]
+        elif line.startswith("# branch.oid "):
+            oid = line[len("# branch.oid "):]
+        elif line.startswith(("1 ", "2 ", "u ")):
+            index_status, worktree_status = line[2], line[3]
+            if index_status in "MARC":
+                info["staged"] += 1
+            elif index_status == ".":
+                if worktree_status == "M":
+                    info["modified"] += 1
+                elif worktree_status == "D":
+                    info["deleted"] += 1
+        elif line.startswith("? "):
+            info["untracked"] += 1
+
+    if info["branch"] in ("", "(detached)"):
+        info["branch"] = oid[:7] if oid and oid != "(initial)" else info["branch"]
+
+    return info
+
+
+class StatuslineCache:
+    """Per-directory cache of the expensive statusline parts."""
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Cache directory (defaults to .claude/data/statusline)
+        """
+        self.cache_dir = cache_dir or Path(__file__).parent.parent / "data" / "statusline"
+
+    def _path(self, cwd: Path, name: str) -> Path:
+        """Cache file for a working directory and entry name."""
+        digest = hashlib.sha1(str(cwd).encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{digest}-{name}.json"
+
+    def load(self, cwd: Path, name: str, key: Dict[str, Any], ttl: float) -> Optional[Dict[str, Any]]:
+        """
+        Get cached info if the validator matches and the TTL hasn't expired.
+
+        Args:
+            cwd: Working directory
+            name: Entry name ("git" or "node")
+            key: Validator (e.g. index/HEAD mtimes)
+            ttl: Maximum age in seconds
+
+        Returns:
+            Cached info dictionary or None
+        """
+        try:
+            with open(self._path(cwd, name), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+        if entry.get("key") != key or time.time() - entry.get("time", 0) > ttl:
+            return None
+        return entry.get("info")
+
+    def store(self, cwd: Path, name: str, key: Dict[str, Any], info: Dict[str, Any]):
+        """Write info to the cache (atomic replace; failures are ignored)."""
+        path = self._path(cwd, name)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "time": time.time(), "info": info}, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+
+def get_git_info(cwd: Path, cache: StatuslineCache) -> Optional[Dict[str, Any]]:
+    """
+    Get branch and status counters, from cache when possible.
+
+    Args:
+        cwd: Working directory
+        cache: Statusline cache
+
+    Returns:
+        Git info dictionary or None outside a repository
+    """
+    git_dir = find_git_dir(cwd)
+    if git_dir is None:
+        return None
+
+    key = {
+        "index": _mtime(git_dir / "index"),
+        "head": _mtime(git_dir / "HEAD"),
+    }
+    cached = cache.load(cwd, "git", key, CACHE_TTL)
+    if cached is not None:
+        return cached
+
+    try:
+        result = subprocess.run(
+            ["git", "--no-optional-locks", "status", "--porcelain=v2", "--branch"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
+    if result.returncode != 0:
+        return None
+
+    info = parse_porcelain_v2(result.stdout)
+    cache.store(cwd, "git", key, info)
+    return info
+
+
+def get_node_version(cwd: Path, cache: StatuslineCache) -> Optional[str]:
+    """
+    Get the node version when the directory is a node project.
+
+    Args:
+        cwd: Working directory
+        cache: Statusline cache
+
+    Returns:
+        Version string without the leading "v", or None
+    """
+    package_json = cwd / "package.json"
+    if not package_json.exists():
+        return None
+
+    key = {"package_json": _mtime(package_json)}
+    cached = cache.load(cwd, "node", key, NODE_CACHE_TTL)
+    if cached is not None:
+        return cached.get("version")
+
+    version = None
+    try:
+        result = subprocess.run(["node", "--version"], capture_output=True, text=True, timeout=2)
+        if result.returncode == 0:
+            version = result.stdout.strip().lstrip("v")
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        pass
+
+    cache.store(cwd, "node", key, {"version": version})
+    return version
+
+
+def render(hook_input: Dict[str, Any], cache: Optional[StatuslineCache] = None) -> str:
+    """
+    Build the statusline string.
+
+    Args:
+        hook_input: Statusline JSON from Claude Code
+        cache: Statusline cache (defaults to .claude/data/statusline)
+
+    Returns:
+        ANSI-colored statusline
+    """
+    cache = cache or StatuslineCache()
+    cwd_value = (hook_input.get("workspace") or {}).get("current_dir") or os.getcwd()
+    cwd = Path(cwd_value)
+    if not cwd.is_dir():
+        cwd = Path.home()
+
+    line = f"{CYAN}{cwd.name}{RESET}"
+
+    git_info = get_git_info(cwd, cache)
+    if git_info:
+        parts = []
+        if git_info["staged"]:
+            parts.append(f"+{git_info['staged']}")
+        if git_info["modified"]:
+            parts.append(f"!{git_info['modified']}")
+        if git_info["untracked"]:
+            parts.append(f"?{git_info['untracked']}")
+        if git_info["deleted"]:
+            parts.append(f"x{git_info['deleted']}")
+        status = f" [{' '.join(parts)}]" if parts else ""
+        line += f" on {MAGENTA}🌱 {git_info['branch']}{RESET}{YELLOW}{status}{RESET}"
+
+    virtual_env = os.environ.get("VIRTUAL_ENV")
+    conda_env = os.environ.get("CONDA_DEFAULT_ENV")
+    if virtual_env:
+        line += f" via {GREEN}🐍 {Path(virtual_env).name}{RESET}"
+    elif conda_env and conda_env != "base":
+        line += f" via {GREEN}🐍 {conda_env}{RESET}"
+
+    node_version = get_node_version(cwd, cache)
+    if node_version:
+        line += f" via {GREEN}⬢ {node_version}{RESET}"
+
+    return line
+
+
+def main():
+    """Read the statusline JSON from stdin and print the statusline."""
+    try:
+        hook_input = json.load(sys.stdin)
+    except json.JSONDecodeError:
+        hook_input = {}
+
+    sys.stdout.write(render(hook_input))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ Key Features:
 - Parses transcript_path to extract sub-agent messages
 - Appends to existing session markdown file
 - Updates session JSON with sub-agent response data
+- Runs the heavy work from the background work queue so Claude isn't blocked
 
 Examples of sub-agents:
 - Task tool agents (Explore, Plan, generator-*, associator-*, etc.)
@@ -25,6 +26,75 @@ import os
 from pathlib import Path
 from session_manager import get_session_manager
 from conversation_logger import get_logger
+from work_queue import submit
+
+
+def process(hook_data):
+    """
+    Log the sub-agent's responses from the transcript (runs from the work queue).
+
+    Args:
+        hook_data: SubagentStop hook payload
+    """
+    # Extract session ID, transcript path, and subagent info
+    session_id = hook_data.get("session_id", "unknown")
+    transcript_path = hook_data.get("transcript_path", "")
+    subagent_type = hook_data.get("subagent_type", "unknown")
+    subagent_description = hook_data.get("description", "")
+
+    if not transcript_path or not os.path.exists(transcript_path):
+        print(f"Warning: Transcript path not found: {transcript_path}", file=sys.stderr)
+        return
+
+    # Initialize session manager
+    session_manager = get_session_manager()
+
+    # Verify session exists
+    if not session_manager.session_exists(session_id):
+        print(f"Warning: Session {session_id} not found in SubagentStop hook", file=sys.stderr)
+        return
+
+    # Get logger instance
+    logger = get_logger(session_id)
+
+    # Parse transcript to extract messages
+    messages = logger.parse_transcript(transcript_path)
+
+    # Extract sub-agent responses
+    subagent_responses = logger.extract_claude_responses(messages)
+
+    if not subagent_responses:
+        # No responses to log
+        return
+
+    # Create a summary of sub-agent activity
+    subagent_header = f"Sub-Agent: {subagent_type}"
+    if subagent_description:
+        subagent_header += f" - {subagent_description}"
+
+    # Combine all responses with header
+    combined_response = f"**{subagent_header}**\n\n"
+
+    # For sub-agents, we typically want the final response or a summary
+    # You can customize this logic based on your needs
+    if len(subagent_responses) == 1:
+        combined_response += subagent_responses[0]
+    else:
+        # Multiple responses - include all or just the last one
+        # For now, include all for completeness
+        for i, response in enumerate(subagent_responses, 1):
+            if len(subagent_responses) > 1:
+                combined_response += f"\n**Response {i}:**\n{response}\n"
+            else:
+                combined_response += response
+
+    # Log sub-agent response to markdown file (inline with [Sub-Agent] marker)
+    logger.log_claude_response(combined_response, session_id, response_type="subagent")
+
+    # Update session JSON
+    session_manager.add_response(session_id, combined_response, response_type="subagent")
+
+    print(f"✓ Logged sub-agent ({subagent_type}) activity to session {session_id}", file=sys.stderr)
 
 
 def main():
@@ -33,69 +103,15 @@ def main():
         # Read hook data from stdin
         hook_data = json.load(sys.stdin)
 
-        # Extract session ID, transcript path, and subagent info
+        # Extract session ID
         session_id = hook_data.get("session_id", "unknown")
-        transcript_path = hook_data.get("transcript_path", "")
-        subagent_type = hook_data.get("subagent_type", "unknown")
-        subagent_description = hook_data.get("description", "")
 
         if session_id == "unknown":
             print("Warning: No valid session_id in SubagentStop hook", file=sys.stderr)
             sys.exit(0)
 
-        if not transcript_path or not os.path.exists(transcript_path):
-            print(f"Warning: Transcript path not found: {transcript_path}", file=sys.stderr)
-            sys.exit(0)
-
-        # Initialize session manager
-        session_manager = get_session_manager()
-
-        # Verify session exists
-        if not session_manager.session_exists(session_id):
-            print(f"Warning: Session {session_id} not found in SubagentStop hook", file=sys.stderr)
-            sys.exit(0)
-
-        # Get logger instance
-        logger = get_logger(session_id)
-
-        # Parse transcript to extract messages
-        messages = logger.parse_transcript(transcript_path)
-
-        # Extract sub-agent responses
-        subagent_responses = logger.extract_claude_responses(messages)
-
-        if not subagent_responses:
-            # No responses to log
-            sys.exit(0)
-
-        # Create a summary of sub-agent activity
-        subagent_header = f"Sub-Agent: {subagent_type}"
-        if subagent_description:
-            subagent_header += f" - {subagent_description}"
-
-        # Combine all responses with header
-        combined_response = f"**{subagent_header}**\n\n"
-
-        # For sub-agents, we typically want the final response or a summary
-        # You can customize this logic based on your needs
-        if len(subagent_responses) == 1:
-            combined_response += subagent_responses[0]
-        else:
-            # Multiple responses - include all or just the last one
-            # For now, include all for completeness
-            for i, response in enumerate(subagent_responses, 1):
-                if len(subagent_responses) > 1:
-                    combined_response += f"\n**Response {i}:**\n{response}\n"
-                else:
-                    combined_response += response
-
-        # Log sub-agent response to markdown file (inline with [Sub-Agent] marker)
-        logger.log_claude_response(combined_response, session_id, response_type="subagent")
-
-        # Update session JSON
-        session_manager.add_response(session_id, combined_response, response_type="subagent")
-
-        print(f"✓ Logged sub-agent ({subagent_type}) activity to session {session_id}", file=sys.stderr)
+        # Hand the transcript parsing off to the background worker
+        submit("sub_agent_stop", hook_data)
 
         # Exit successfully
         sys.exit(0)
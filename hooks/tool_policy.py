@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Tool Tracking Policy
+=============================================
+Declares how much session tracking each tool gets. The policy is evaluated
+from the already-parsed payload, before any disk I/O.
+
+Policies:
+- "ignore": no session tracking at all
+- "count":  one counter per call (PreToolUse only) - for high-frequency,
+            read-only tools such as Read, Glob and Grep
+- "full":   the files the tool writes, recorded as file changes, + paired
+            Pre/PostToolUse timing for the latency profile
+
+Keys are tool names or fnmatch patterns (e.g. "mcp__*"); exact names win.
+Counters are spooled ({session_id}.counts) and merged into the session JSON
+as "tool_counts" at Stop/SessionEnd, like file changes and tool timings.
+
+PostToolUse is only needed for "full" tools, so counted tools start a single
+hook process (PreToolUse) per call. Unlisted tools (e.g. MCP tools) are only
+counted: they never get a PostToolUse, so timing them would leave unpaired
+events. Keep the matchers in settings.local.json equal to hook_matchers()
+(`python3 tool_policy.py` checks them).
+
+Files written through Bash are found by parsing the command (bash_files.py),
+imported only when a Bash call is actually seen.
+"""
+
+import re
+from fnmatch import fnmatchcase
+from typing import Dict, Any, Optional, List
+
+
+# ===== CONFIGURATION =====
+IGNORE = "ignore"
+COUNT = "count"
+FULL = "full"
+
+TOOL_POLICY = {
+    # Tools that modify files
+    "Edit": FULL,
+    "MultiEdit": FULL,
+    "Write": FULL,
+    "NotebookEdit": FULL,
+    "Bash": FULL,
+    "Task": FULL,
+
+    # High-frequency read-only tools: counters only
+    "Read": COUNT,
+    "Glob": COUNT,
+    "Grep": COUNT,
+    "LS": COUNT,
+    "NotebookRead": COUNT,
+    "WebFetch": COUNT,
+    "WebSearch": COUNT,
+    "TodoWrite": COUNT,
+}
+
+# Policy for tools not listed above (anything but "full" needs no PostToolUse)
+DEFAULT_POLICY = COUNT
+
+# Input field holding the written file, per tool (used by "full")
+FILE_PATH_FIELDS = {
+    "Edit": "file_path",
+    "MultiEdit": "file_path",
+    "Write": "file_path",
+    "NotebookEdit": "notebook_path",
+}
+
+
+def get_tool_policy(tool_name: str) -> str:
+    """
+    Look up the tracking policy for a tool.
+
+    Args:
+        tool_name: Tool name from the hook payload
+
+    Returns:
+        One of "ignore", "count", "full"
+    """
+    policy = TOOL_POLICY.get(tool_name)
+    if policy is not None:
+        return policy
+    for pattern, pattern_policy in TOOL_POLICY.items():
+        if "*" in pattern and fnmatchcase(tool_name, pattern):
+            return pattern_policy
+    return DEFAULT_POLICY
+
+
+def hook_matchers() -> Dict[str, str]:
+    """
+    Build the PreToolUse/PostToolUse matchers settings.local.json needs for TOOL_POLICY.
+
+    Returns:
+        {"PreToolUse": matcher, "PostToolUse": matcher} (regex alternations)
+    """
+    def matcher(names: List[str]) -> str:
+        return "|".join(re.escape(name).replace(r"\*", ".*") for name in names)
+
+    tracked = [name for name, policy in TOOL_POLICY.items() if policy != IGNORE]
+    timed = [name for name, policy in TOOL_POLICY.items() if policy == FULL]
+    return {
+        "PreToolUse": "*" if DEFAULT_POLICY != IGNORE else matcher(tracked),
+        "PostToolUse": "*" if DEFAULT_POLICY == FULL else matcher(timed),
+    }
+
+
+def extract_file_path(tool_name: str, tool_input: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the file a tool call writes, if the tool names it in its input.
+
+    Args:
+        tool_name: Tool name from the hook payload
+        tool_input: The tool's input dictionary
+
+    Returns:
+        File path or None
+    """
+    field = FILE_PATH_FIELDS.get(tool_name)
+    if not field or not isinstance(tool_input, dict):
+        return None
+    return tool_input.get(field) or None
+
+
+def extract_file_paths(tool_name: str, tool_input: Dict[str, Any], cwd: Optional[str] = None) -> List[str]:
+    """
+    Get every file a tool call writes, including files written by Bash commands.
+
+    Args:
+        tool_name: Tool name from the hook payload
+        tool_input: The tool's input dictionary
+        cwd: Working directory of the call (resolves relative Bash targets)
+
+    Returns:
+        List of file paths (may be empty)
+    """
+    if tool_name == "Bash" and isinstance(tool_input, dict):
+        command = tool_input.get("command")
+        if not command:
+            return []
+        from bash_files import extract_bash_targets
+        return list(extract_bash_targets(command, cwd))
+
+    file_path = extract_file_path(tool_name, tool_input)
+    return [file_path] if file_path else []
+
+
+if __name__ == "__main__":
+    """Print the effective policy for common tools and check settings.local.json."""
+    import json
+    import sys
+    from pathlib import Path
+
+    for tool in ["Edit", "Write", "Bash", "Read", "Glob", "Grep", "TodoWrite", "mcp__github__get_issue"]:
+        print(f"{tool:24} {get_tool_policy(tool)}", file=sys.stderr)
+
+    settings_path = Path(__file__).parent.parent / "settings.local.json"
+    if settings_path.exists():
+        hooks = json.loads(settings_path.read_text()).get("hooks", {})
+        for event, expected in hook_matchers().items():
+            configured = [entry.get("matcher") for entry in hooks.get(event, [])]
+            status = "ok" if configured == [expected] else f"expected {expected!r}"
+            print(f"{event} matcher {configured}: {status}", file=sys.stderr)
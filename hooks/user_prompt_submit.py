@@ -9,6 +9,7 @@ Key Improvements:
 - Uses session_id to load existing session
 - Appends to existing markdown file (doesn't create new file)
 - Updates session JSON with prompt data
+- Logging runs from the background work queue, in order with Stop hooks
 - Enables one session = one log file
 """
 
@@ -16,6 +17,38 @@ import sys
 import json
 from session_manager import get_session_manager
 from conversation_logger import get_logger
+from work_queue import submit
+
+
+def process(hook_data):
+    """
+    Append the prompt to the session log and JSON (runs from the work queue).
+
+    Args:
+        hook_data: UserPromptSubmit hook payload
+    """
+    prompt = hook_data.get("prompt", "")
+    session_id = hook_data.get("session_id", "unknown")
+
+    # Initialize session manager
+    session_manager = get_session_manager()
+
+    # Verify session exists (should be created by SessionStart hook)
+    if not session_manager.session_exists(session_id):
+        print(f"Warning: Session {session_id} not found, creating new session", file=sys.stderr)
+        # Create session if it doesn't exist (fallback)
+        session_data = session_manager.get_or_create_session(session_id)
+        logger = get_logger(session_id)
+        logger.create_session_file(session_id, session_data.get("log_file"))
+
+    # Get logger instance with session ID
+    logger = get_logger(session_id)
+
+    # Log the user prompt to markdown file (appends to existing file)
+    logger.log_user_message(prompt, session_id)
+
+    # Update session JSON with prompt data
+    session_manager.add_prompt(session_id, prompt)
 
 
 def main():
@@ -35,25 +68,8 @@ def main():
             print("Warning: No valid session_id in UserPromptSubmit hook", file=sys.stderr)
             sys.exit(0)
 
-        # Initialize session manager
-        session_manager = get_session_manager()
-
-        # Verify session exists (should be created by SessionStart hook)
-        if not session_manager.session_exists(session_id):
-            print(f"Warning: Session {session_id} not found, creating new session", file=sys.stderr)
-            # Create session if it doesn't exist (fallback)
-            session_data = session_manager.get_or_create_session(session_id)
-            logger = get_logger(session_id)
-            logger.create_session_file(session_id, session_data.get("log_file"))
-
-        # Get logger instance with session ID
-        logger = get_logger(session_id)
-
-        # Log the user prompt to markdown file (appends to existing file)
-        logger.log_user_message(prompt, session_id)
-
-        # Update session JSON with prompt data
-        session_manager.add_prompt(session_id, prompt)
+        # Queue the logging so it stays ordered with the Stop hook's responses
+        submit("user_prompt_submit", hook_data)
 
         # Write confirmation to stderr (for debugging)
         # print(f"✓ Logged user prompt to session {session_id}", file=sys.stderr)
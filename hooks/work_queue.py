@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Background Work Queue for Hooks
+=============================================
+Lets hooks hand off heavy work (transcript parsing, markdown rendering, git
+probes) and exit immediately instead of blocking Claude's next step.
+
+Key Features:
+- Maildir-style on-disk queue in .claude/data/queue/{tmp,new,cur,failed}
+- Jobs are written to tmp/ and renamed into new/ (atomic enqueue)
+- Job filenames start with a nanosecond timestamp, so draining in name order
+  keeps every session's events in the order the hooks fired
+- A single detached worker (guarded by an flock on worker.lock) drains the
+  queue; hooks spawn it only when no worker holds the lock
+- Jobs interrupted by a crash are moved from cur/ back to new/ on restart
+- flush() drains the queue synchronously; SessionEnd uses it so everything is
+  written before the session is finalized
+
+Job handlers are the process(hook_data) functions of the hook scripts listed
+in HANDLERS.
+
+Usage:
+    python work_queue.py worker    # drain the queue (normally spawned by hooks)
+    python work_queue.py status    # show queue counts
+"""
+
+import sys
+import os
+import json
+import time
+import fcntl
+import importlib
+import subprocess
+import traceback
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+
+# ===== CONFIGURATION =====
+# Set to False to run all hook work inline (the pre-queue behaviour)
+OFFLOAD_ENABLED = True
+
+# Hook modules whose process(hook_data) may run from the queue
+HANDLERS = {"user_prompt_submit", "agent_stop", "sub_agent_stop", "log_archive"}
+
+# Seconds SessionEnd waits for a running worker before draining itself
+FLUSH_TIMEOUT = 30
+
+
+class WorkQueue:
+    """Maildir-style queue of deferred hook work."""
+
+    def __init__(self, project_root: Optional[Path] = None):
+        """
+        Initialize the queue directories.
+
+        Args:
+            project_root: Project root directory (defaults to auto-detect)
+        """
+        self.project_root = project_root or self._get_project_root()
+        self.queue_dir = self.project_root / ".claude" / "data" / "queue"
+        self.tmp_dir = self.queue_dir / "tmp"
+        self.new_dir = self.queue_dir / "new"
+        self.cur_dir = self.queue_dir / "cur"
+        self.failed_dir = self.queue_dir / "failed"
+        self.lock_path = self.queue_dir / "worker.lock"
+
+        for directory in (self.tmp_dir, self.new_dir, self.cur_dir, self.failed_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def _get_project_root(self) -> Path:
+        """Get the project root directory (parent of .claude folder)."""
+        return Path(__file__).parent.parent.parent
+
+    def enqueue(self, handler: str, hook_data: Dict[str, Any]) -> Path:
+        """
+        Add a job to the queue.
+
+        Args:
+            handler: Hook module name whose process() will run the job
+            hook_data: Hook payload passed to the handler
+
+        Returns:
+            Path to the queued job file
+        """
+        session_id = hook_data.get("session_id", "unknown")
+        name = f"{time.time_ns():020d}-{os.getpid()}-{session_id}.json"
+        job = {
+            "handler": handler,
+            "session_id": session_id,
+            "enqueued_at": datetime.now().isoformat(),
+            "hook_data": hook_data,
+        }
+
+        tmp_path = self.tmp_dir / name
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(job, f, ensure_ascii=False)
+        new_path = self.new_dir / name
+        os.replace(tmp_path, new_path)
+        return new_path
+
+    def pending(self) -> List[Path]:
+        """Get queued jobs in processing order."""
+        return sorted(self.new_dir.glob("*.json"))
+
+    def _try_lock(self, blocking_timeout: Optional[float] = None):
+        """
+        Acquire the worker lock.
+
+        Args:
+            blocking_timeout: Seconds to keep retrying (None = single attempt)
+
+        Returns:
+            Open lock file handle if acquired, None otherwise
+        """
+        handle = open(self.lock_path, "a")
+        deadline = time.monotonic() + (blocking_timeout or 0)
+        while True:
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return handle
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    handle.close()
+                    return None
+                time.sleep(0.05)
+
+    def worker_running(self) -> bool:
+        """Check whether a worker currently holds the lock."""
+        handle = self._try_lock()
+        if handle is None:
+            return True
+        handle.close()
+        return False
+
+    def ensure_worker(self) -> bool:
+        """
+        Start a detached worker unless one is already draining the queue.
+
+        A running worker re-checks new/ after releasing its lock, so a job
+        enqueued before this check is never stranded.
+
+        Returns:
+            True if a worker was spawned
+        """
+        if self.worker_running():
+            return False
+
+        try:
+            subprocess.Popen(
+                [sys.executable, str(Path(__file__).resolve()), "worker"],
+                cwd=self.project_root,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,       # Survive the hook process exiting
+            )
+            return True
+        except OSError as e:
+            print(f"Warning: Failed to start queue worker: {e}", file=sys.stderr)
+            return False
+
+    def _recover_interrupted(self):
+        """Move jobs left in cur/ by a crashed worker back to new/."""
+        for job_path in self.cur_dir.glob("*.json"):
+            try:
+                os.replace(job_path, self.new_dir / job_path.name)
+            except OSError:
+                pass
+
+    def _run_job(self, job_path: Path):
+        """
+        Run one job, moving it through cur/ and deleting it on success.
+
+        Args:
+            job_path: Path to the job file in new/
+        """
+        cur_path = self.cur_dir / job_path.name
+        try:
+            os.replace(job_path, cur_path)
+        except FileNotFoundError:
+            return
+
+        try:
+            with open(cur_path, "r", encoding="utf-8") as f:
+                job = json.load(f)
+
+            handler = job.get("handler")
+            if handler not in HANDLERS:
+                raise ValueError(f"Unknown queue handler: {handler}")
+
+            importlib.import_module(handler).process(job.get("hook_data", {}))
+            cur_path.unlink()
+
+        except Exception as e:
+            print(f"Queue job {job_path.name} failed: {e}", file=sys.stderr)
+            try:
+                with open(cur_path, "r", encoding="utf-8") as f:
+                    job = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                job = {}
+            job["error"] = traceback.format_exc()
+            job["failed_at"] = datetime.now().isoformat()
+            failed_path = self.failed_dir / job_path.name
+            with open(failed_path, "w", encoding="utf-8") as f:
+                json.dump(job, f, ensure_ascii=False, indent=2)
+            cur_path.unlink(missing_ok=True)
+
+    def _drain_locked(self) -> int:
+        """Process queued jobs until new/ is empty (lock must be held)."""
+        processed = 0
+        self._recover_interrupted()
+        while True:
+            jobs = self.pending()
+            if not jobs:
+                return processed
+            for job_path in jobs:
+                self._run_job(job_path)
+                processed += 1
+
+    def drain(self) -> int:
+        """
+        Worker loop: drain the queue, then re-check after releasing the lock.
+
+        Returns:
+            Number of jobs processed
+        """
+        processed = 0
+        while True:
+            handle = self._try_lock()
+            if handle is None:
+                return processed
+            try:
+                processed += self._drain_locked()
+            finally:
+                handle.close()
+            if not self.pending():
+                return processed
+
+    def flush(self, timeout: float = FLUSH_TIMEOUT) -> int:
+        """
+        Synchronously drain the queue, waiting for a running worker if needed.
+
+        Args:
+            timeout: Seconds to wait for the worker lock
+
+        Returns:
+            Number of jobs processed by this call (-1 if the lock wasn't acquired)
+        """
+        handle = self._try_lock(blocking_timeout=timeout)
+        if handle is None:
+            print(f"Warning: Queue worker still busy after {timeout}s", file=sys.stderr)
+            return -1
+        try:
+            return self._drain_locked()
+        finally:
+            handle.close()
+
+    def status(self) -> Dict[str, Any]:
+        """Get counts of queued, in-progress and failed jobs."""
+        return {
+            "queue_dir": str(self.queue_dir),
+            "pending": len(self.pending()),
+            "in_progress": len(list(self.cur_dir.glob("*.json"))),
+            "failed": len(list(self.failed_dir.glob("*.json"))),
+            "worker_running": self.worker_running(),
+        }
+
+
+# Convenience functions for use in hooks
+_work_queue: Optional[WorkQueue] = None
+
+
+def get_work_queue() -> WorkQueue:
+    """Get the per-process WorkQueue instance."""
+    global _work_queue
+    if _work_queue is None:
+        _work_queue = WorkQueue()
+    return _work_queue
+
+
+def submit(handler: str, hook_data: Dict[str, Any]):
+    """
+    Queue hook work for the background worker (or run it inline if disabled).
+
+    Args:
+        handler: Hook module name whose process() will run the job
+        hook_data: Hook payload passed to the handler
+    """
+    if not OFFLOAD_ENABLED:
+        importlib.import_module(handler).process(hook_data)
+        return
+
+    queue = get_work_queue()
+    queue.enqueue(handler, hook_data)
+    queue.ensure_worker()
+
+
+def flush_queue(timeout: float = FLUSH_TIMEOUT) -> int:
+    """
+    Drain all queued hook work before returning (convenience function).
+
+    Args:
+        timeout: Seconds to wait for a running worker
+
+    Returns:
+        Number of jobs processed by this call (-1 on timeout)
+    """
+    if not OFFLOAD_ENABLED:
+        return 0
+    return get_work_queue().flush(timeout)
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+
+    if command == "worker":
+        get_work_queue().drain()
+    elif command == "status":
+        print(json.dumps(get_work_queue().status(), indent=2))
+    else:
+        print(f"Error: Unknown command '{command}'", file=sys.stderr)
+        print("Valid commands: worker, status", file=sys.stderr)
+        sys.exit(1)
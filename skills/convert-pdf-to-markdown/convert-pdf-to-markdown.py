@@ -6,69 +6,1494 @@ This script converts PDF files to Markdown format using the pymupdf4llm library,
 which provides fast conversion with accurate table extraction.
 
 Usage:
-    python 13-convert-pdf-to-markdown.py <file|files|folder>
+    python 13-convert-pdf-to-markdown.py <file|files|folder> [--jobs N]
 
 Input Modes:
     1. Single file: python 13-convert-pdf-to-markdown.py "./path/to/file.pdf"
     2. Multiple files (comma-separated): python 13-convert-pdf-to-markdown.py "file1.pdf,file2.pdf"
     3. Folder: python 13-convert-pdf-to-markdown.py "./path/to/folder"
 
+    4. List file: python 13-convert-pdf-to-markdown.py "@retry-list.txt" (one PDF per line)
+    5. Folder tree: python 13-convert-pdf-to-markdown.py "./archive" --recursive --batch
+
+Options:
+    --jobs N, -j N:  Convert N files at once in worker processes
+                     (default: number of CPUs)
+    --force:         Reconvert PDFs even if their Markdown is up to date
+    --timeout S:     Wall-clock limit per file (or page chunk), in seconds
+    --memory-limit MB, --max-tasks-per-worker N, --retry-list PATH
+    --recursive, -r: Folder mode: include subfolders
+    --include GLOB, --exclude GLOB: Folder mode: filter files and folders
+    --output-dir DIR: Write Markdown to DIR (folder mode mirrors the tree)
+    --batch, -y:     Folder mode: skip the test-first prompt and convert
+                     files while the folder is still being scanned
+    --ocr-language LANG, --no-ocr: OCR for scanned pages (see below)
+    --strip-boilerplate: Remove headers/footers repeated across pages
+    --chunks [TOKENS]: Also write heading-bounded chunks plus an index
+                     (<name>.chunks/index.json) for partial loading
+    --report [PATH]: Write per-file and total metrics as JSON
+
+Pages are triaged first (text layer length and image coverage, no
+rendering): only pages that look scanned are OCR'd with Tesseract through
+PyMuPDF, the rest go through pymupdf4llm as usual.
+
+Each conversion runs in a supervised worker process. A file that exceeds the
+timeout or memory limit (or crashes its worker) fails on its own: the worker
+is replaced and the file is written to a retry list. Workers are also
+replaced after a number of files, so leaked memory doesn't pile up.
+
+Unchanged PDFs are skipped: each folder keeps a manifest (MANIFEST_NAME) of
+the PDF content hashes its Markdown files were converted from.
+
+Markdown is streamed to a temporary file a few pages at a time and renamed
+into place when the conversion succeeds, so memory use doesn't grow with
+document length. Large documents (CHUNK_MIN_PAGES pages or more) are split
+into page chunks that are converted in parallel and written in page order;
+heading levels are identified once per document, in a worker task the
+chunks wait for, and shared by every chunk.
+
 Output:
     - Markdown files saved in same directory as source PDFs
     - Same filename with .md extension
     - Example: document.pdf → document.md
 
 Dependencies:
-    - pymupdf4llm (install via: pip install pymupdf4llm)
+    - pymupdf4llm 1.28 (install via: pip install pymupdf4llm), with or without
+      pymupdf-layout
+    - tesseract (optional, for scanned pages: apt/brew install tesseract)
 
 Author: Claude Code
 Date: 2025-11-19
 """
 
+import os
+import re
 import sys
+import json
+import shutil
+import time
+import hashlib
+import argparse
+import multiprocessing
 import pymupdf4llm
+from collections import Counter, deque
+from fnmatch import fnmatchcase
+from multiprocessing.connection import wait
 from pathlib import Path
 
+try:
+    import pymupdf
+except ImportError:
+    # PyMuPDF < 1.24.3 only provides the legacy module name
+    import fitz as pymupdf
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows: memory limits are skipped
+    resource = None
+
+# Documents with at least this many pages are split into chunks (with --jobs > 1)
+CHUNK_MIN_PAGES = 100
+
+# Pages converted per worker task
+PAGES_PER_CHUNK = 50
+
+# Pages converted and written at a time when converting in one process
+STREAM_PAGES = 10
+
+# Wall-clock seconds allowed per file or page chunk (0 = no limit)
+FILE_TIMEOUT = 600
+
+# Address-space limit per worker in MB, via resource.RLIMIT_AS (0 = no limit)
+MEMORY_LIMIT_MB = 4096
+
+# MuPDF reports an allocation that fails at that limit as an ordinary
+# exception ("code=2: malloc (24 bytes) failed"), not as MemoryError
+MUPDF_ALLOC_FAILED = re.compile(r"\b(?:malloc|calloc|realloc)\b.*\bfailed\b")
+
+# Replace a worker after this many files or page chunks (0 = never)
+MAX_TASKS_PER_WORKER = 25
+
+# Files that timed out or ran out of memory are listed here (pass back as "@file")
+RETRY_LIST_NAME = "convert-pdf-to-markdown-retry.txt"
+
+# Folder mode: files to convert / skip (matched against the path relative to
+# the folder and against the file name, case-insensitively)
+DEFAULT_INCLUDE = ("*.pdf",)
+
+# Page triage: a page with fewer text characters than this whose images cover
+# at least SCAN_IMAGE_COVERAGE of its area is a scan and is sent to OCR
+MIN_TEXT_CHARS = 20
+SCAN_IMAGE_COVERAGE = 0.5
+
+# Tesseract language(s) for scanned pages (needs tesseract + its language data)
+OCR_LANGUAGE = "eng"
+OCR_DPI = 300
+
+# Written after every page (pymupdf4llm writes none by default); page
+# counts, boilerplate stripping and chunk page ranges rely on it
+PAGE_SEPARATOR = "\n-----\n\n"
+# Its "-----" line; a page ends where this line is followed by a blank line
+PAGE_SEPARATOR_LINE = PAGE_SEPARATOR.strip() + "\n"
+
+# --strip-boilerplate: a line among the first/last BOILERPLATE_EDGE_LINES
+# lines of a page that recurs on at least BOILERPLATE_MIN_FRACTION of the pages
+# (running headers, footers, page counters) is removed. Documents with fewer
+# than BOILERPLATE_MIN_PAGES pages, and pages with 2 * BOILERPLATE_EDGE_LINES
+# lines or fewer, are left alone. Digits only vary on page-number lines.
+BOILERPLATE_EDGE_LINES = 3
+BOILERPLATE_MIN_FRACTION = 0.5
+BOILERPLATE_MIN_PAGES = 3
+PAGE_NUMBER_PATTERN = re.compile(r"^(?:(?:page|halaman|hal\.?)\s*)?[-–—]?\s*\d+\s*(?:(?:of|dari|/)\s*\d+)?\s*[-–—]?$")
+
+# --chunks: token budget per chunk file (estimated at BYTES_PER_TOKEN bytes
+# per token); chunks break at headings, or at paragraphs inside long sections
+CHUNK_TOKENS = 2000
+BYTES_PER_TOKEN = 4
+HEADING_PATTERN = re.compile(rb"^(#{1,6})\s+(.+?)\s*$")
+
+# --report: default report path, and the thresholds that flag a file as
+# "slow" (pages per second of worker time) or "mostly_empty" (fraction of
+# pages with no text in the Markdown)
+REPORT_NAME = "convert-pdf-to-markdown-report.json"
+SLOW_PAGES_PER_SECOND = 1.0
+EMPTY_PAGE_FRACTION = 0.5
+TABLE_DELIMITER_PATTERN = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+
+# Per-folder manifest of converted PDFs (content hash -> up-to-date Markdown)
+MANIFEST_NAME = ".convert-pdf-to-markdown.json"
+
+# Bump when a change to this script changes the Markdown it produces
+OUTPUT_FORMAT_VERSION = 4
+
 
 def is_interactive():
     """Check if the script is running in an interactive terminal."""
     return sys.stdin.isatty()
 
 
-def convert_pdf_to_markdown(pdf_path):
+def format_size(size):
+    """Format a byte count for display (e.g. "1.4 MB")."""
+    for unit in ("bytes", "KB", "MB"):
+        if size < 1024 or unit == "MB":
+            return f"{size} {unit}" if unit == "bytes" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def file_sha256(path):
+    """Hash a file's content in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """
+    Tracks which PDFs already have up-to-date Markdown.
+
+    Each folder gets a MANIFEST_NAME file mapping PDF names to the content
+    hash, size and mtime they were converted from, plus a key of the
+    converter version and options. A PDF whose size and mtime are unchanged
+    is skipped without reading it; otherwise its hash decides.
+    """
+
+    def __init__(self, options=None, force=False):
+        """
+        Initialize the cache.
+
+        Args:
+            options (dict): Conversion options that affect the output
+            force (bool): Treat every PDF as changed
+        """
+        self.force = force
+        self.key = json.dumps({
+            "format": OUTPUT_FORMAT_VERSION,
+            "pymupdf4llm": getattr(pymupdf4llm, "__version__", "unknown"),
+            "options": options or {},
+        }, sort_keys=True)
+        self.manifests = {}
+        self.dirty = set()
+        self.hashes = {}
+
+    def _manifest(self, folder):
+        """Load a folder's manifest (cached per run)."""
+        if folder not in self.manifests:
+            try:
+                with open(folder / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                    self.manifests[folder] = json.load(f).get("files", {})
+            except (OSError, ValueError):
+                self.manifests[folder] = {}
+        return self.manifests[folder]
+
+    def is_fresh(self, pdf_path, output_path):
+        """
+        Check whether a PDF's Markdown is up to date.
+
+        Args:
+            pdf_path (Path): Path to the PDF file
+            output_path (Path): Where its Markdown goes
+
+        Returns:
+            bool: True if the PDF can be skipped
+        """
+        if self.force or not output_path.exists():
+            return False
+
+        entry = self._manifest(pdf_path.parent).get(pdf_path.name)
+        if not entry or entry.get("key") != self.key or entry.get("output", str(pdf_path.with_suffix('.md'))) != str(output_path):
+            return False
+
+        stat = pdf_path.stat()
+        if (entry.get("size"), entry.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns):
+            return True
+
+        # Touched or copied: compare content
+        digest = self.hashes[pdf_path] = file_sha256(pdf_path)
+        if digest != entry.get("sha256"):
+            return False
+        entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        self.dirty.add(pdf_path.parent)
+        return True
+
+    def record(self, pdf_path, output_path):
+        """
+        Record a successful conversion.
+
+        Args:
+            pdf_path (Path): Path to the converted PDF file
+            output_path (Path): Where its Markdown was written
+        """
+        stat = pdf_path.stat()
+        self._manifest(pdf_path.parent)[pdf_path.name] = {
+            "sha256": self.hashes.pop(pdf_path, None) or file_sha256(pdf_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "key": self.key,
+            "output": str(output_path),
+        }
+        self.dirty.add(pdf_path.parent)
+
+    def save(self):
+        """Write changed manifests (atomically, via a temporary file)."""
+        for folder in self.dirty:
+            manifest_path = folder / MANIFEST_NAME
+            tmp_path = manifest_path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+            try:
+                tmp_path.write_text(json.dumps({"files": self.manifests[folder]}, indent=2), encoding='utf-8')
+                os.replace(tmp_path, manifest_path)
+            except OSError as e:
+                print(f"Warning: Could not save {manifest_path}: {e}")
+        self.dirty.clear()
+
+
+def page_ranges(page_count, size):
+    """Split page numbers 0..page_count-1 into consecutive lists of `size` pages."""
+    return [list(range(first, min(first + size, page_count)))
+            for first in range(0, page_count, size)]
+
+
+def plan_chunks(pdf_path, jobs=1):
     """
-    Convert a single PDF file to Markdown format.
+    Split a document into page chunks for parallel conversion.
 
     Args:
         pdf_path (Path): Path to the PDF file
+        jobs (int): Number of worker processes available
 
     Returns:
-        tuple: (success: bool, output_path: Path or None, error_message: str or None)
+        list: 0-based page lists in page order, or None to convert the
+              document in a single process
     """
+    if jobs <= 1:
+        return None
+
     try:
-        # Convert PDF to markdown
-        md_text = pymupdf4llm.to_markdown(str(pdf_path))
+        with pymupdf.open(str(pdf_path)) as doc:
+            page_count = doc.page_count
+    except Exception:
+        # Let the conversion itself report the error
+        return None
+
+    if page_count < CHUNK_MIN_PAGES:
+        return None
+    return page_ranges(page_count, PAGES_PER_CHUNK)
 
-        # Create output path (same directory, .md extension)
-        output_path = pdf_path.with_suffix('.md')
 
-        # Save markdown to file
-        output_path.write_text(md_text, encoding='utf-8')
+def identify_headers(doc):
+    """
+    Map font sizes to heading levels from the whole document.
+
+    pymupdf4llm otherwise derives the levels from the pages of each call, so
+    the same heading could get a different level in each page run or chunk.
+
+    In layout mode (pymupdf-layout installed) pymupdf4llm detects headings
+    itself, page by page, and has no IdentifyHeaders; nothing is needed then.
+
+    Args:
+        doc (pymupdf.Document): Open document
 
-        return True, output_path, None
+    Returns:
+        IdentifyHeaders: Pass as hdr_info to to_markdown, or None in layout mode
+    """
+    if getattr(pymupdf4llm, "_use_layout", False):
+        return None
+    try:
+        from pymupdf4llm.helpers.pymupdf_rag import IdentifyHeaders
+    except ImportError:
+        return None
+    return IdentifyHeaders(doc)
+
+
+def document_headers(pdf_path):
+    """
+    Identify a document's heading levels once for all its page chunks (runs in a worker).
 
+    Args:
+        pdf_path (Path): Path to the PDF file
+
+    Returns:
+        IdentifyHeaders: See identify_headers (None in layout mode)
+    """
+    with pymupdf.open(str(pdf_path)) as doc:
+        return identify_headers(doc)
+
+
+def classify_page(page):
+    """
+    Triage a page from its text layer and image coverage (no rendering).
+
+    Args:
+        page (pymupdf.Page): Page to classify
+
+    Returns:
+        str: "text" (text layer, or blank), "scan" (little or no text,
+             mostly image) or "mixed" (text layer plus large images)
+    """
+    text_chars = len(page.get_text("text").strip())
+    page_area = abs(page.rect) or 1.0
+    image_area = sum(abs(pymupdf.Rect(info["bbox"]) & page.rect) for info in page.get_image_info())
+    covered = min(1.0, image_area / page_area) >= SCAN_IMAGE_COVERAGE
+
+    if text_chars >= MIN_TEXT_CHARS:
+        return "mixed" if covered else "text"
+    return "scan" if covered else "text"
+
+
+def ocr_page(page, ocr_language, hdr_info=None):
+    """
+    OCR a scanned page with Tesseract (through PyMuPDF) into Markdown paragraphs.
+
+    Args:
+        page (pymupdf.Page): Scanned page
+        ocr_language (str): Tesseract language(s), e.g. "eng" or "ind+eng"
+        hdr_info (IdentifyHeaders): Document heading levels for the text-layer fallback
+
+    Returns:
+        str: Markdown for the page, ending with the page separator
+    """
+    try:
+        textpage = page.get_textpage_ocr(language=ocr_language, dpi=OCR_DPI, full=True)
     except Exception as e:
-        return False, None, str(e)
+        # Tesseract missing or language data not installed: keep the text-layer output
+        return (f"<!-- Page {page.number + 1} looks scanned; OCR failed: {e} -->\n\n" +
+                markdown_pages(page.parent, [page.number], hdr_info))
+
+    paragraphs = [" ".join(block[4].split())
+                  for block in page.get_text("blocks", textpage=textpage)
+                  if block[6] == 0 and block[4].strip()]
+    return "\n\n".join(paragraphs) + "\n" + PAGE_SEPARATOR
+
+
+def markdown_pages(doc, pages, hdr_info=None):
+    """
+    Convert pages with pymupdf4llm, ending each one with PAGE_SEPARATOR.
+
+    Args:
+        doc (pymupdf.Document): Open document
+        pages (list): 0-based page numbers, in order
+        hdr_info (IdentifyHeaders): Heading levels, or None
+
+    Returns:
+        str: Markdown for the pages
+    """
+    chunks = pymupdf4llm.to_markdown(doc, pages=pages, hdr_info=hdr_info, page_chunks=True)
+    return "".join(chunk["text"].rstrip("\n") + "\n" + PAGE_SEPARATOR for chunk in chunks)
+
+
+def convert_page_range(doc, pages, ocr_language=None, hdr_info=None):
+    """
+    Convert pages to Markdown, routing scanned pages to OCR.
+
+    Text and mixed pages go through pymupdf4llm, STREAM_PAGES at a time;
+    with OCR enabled, pages that triage as "scan" are OCR'd one by one.
+    Every run uses the same heading levels.
+
+    Args:
+        doc (pymupdf.Document): Open document
+        pages (iterable): 0-based page numbers, in order
+        ocr_language (str): Tesseract language(s), or None to disable OCR
+        hdr_info (IdentifyHeaders): Heading levels (default: identify_headers(doc))
+
+    Yields:
+        str: Markdown pieces in page order
+    """
+    if hdr_info is None:
+        hdr_info = identify_headers(doc)
+
+    run = []
+    for number in pages:
+        if ocr_language and classify_page(doc[number]) == "scan":
+            if run:
+                yield markdown_pages(doc, run, hdr_info)
+                run = []
+            yield ocr_page(doc[number], ocr_language, hdr_info)
+            continue
+
+        run.append(number)
+        if len(run) >= STREAM_PAGES:
+            yield markdown_pages(doc, run, hdr_info)
+            run = []
+    if run:
+        yield markdown_pages(doc, run, hdr_info)
+
+
+def convert_pages(pdf_path, pages, ocr_language=None, hdr_info=None):
+    """
+    Convert some pages of a PDF to Markdown (runs in worker processes).
+
+    Args:
+        pdf_path (Path): Path to the PDF file
+        pages (list): 0-based page numbers
+        ocr_language (str): Tesseract language(s) for scanned pages, or None
+        hdr_info (IdentifyHeaders): Heading levels of the whole document (from document_headers)
+
+    Returns:
+        str: Markdown text
+    """
+    with pymupdf.open(str(pdf_path)) as doc:
+        return "".join(convert_page_range(doc, pages, ocr_language, hdr_info))
+
+
+class MarkdownWriter:
+    """
+    Streams Markdown to a temporary file and renames it into place on success.
+
+    Pages (or page chunks) are written as soon as they are converted, in page
+    order, so the whole document is never held in memory. pymupdf4llm ends
+    every page with PAGE_SEPARATOR (markdown_pages), so the pieces need no joining.
+    A failed conversion leaves any previous .md untouched.
+    """
+
+    def __init__(self, output_path):
+        """
+        Initialize the writer.
+
+        Args:
+            output_path (Path): Final Markdown path
+        """
+        self.path = output_path
+        self.tmp_path = self.temp_path(output_path)
+        self.file = None
+
+    @staticmethod
+    def temp_path(output_path):
+        """Get the temporary file an output is streamed to."""
+        return output_path.with_name(f".{output_path.name}.tmp")
+
+    def __enter__(self):
+        self.file = open(self.tmp_path, 'w', encoding='utf-8')
+        return self
+
+    def write(self, md_text):
+        """Append converted Markdown."""
+        self.file.write(md_text)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            self.tmp_path.unlink(missing_ok=True)
+        return False
+
+
+def _boilerplate_key(line):
+    """
+    Normalize a line for boilerplate matching and hash it.
+
+    Markdown markup and case are ignored. Digits are collapsed only on a
+    line that is just a page number, so "**Page 3 of 40**" and "Page 4 of 40"
+    match but numbered headings don't. Table rows, blank lines and page
+    separators are never boilerplate.
+
+    Returns:
+        bytes: 8-byte hash, or None if the line can't be boilerplate
+    """
+    stripped = line.strip()
+    if not stripped or stripped.startswith('|') or stripped == PAGE_SEPARATOR.strip():
+        return None
+    text = re.sub(r"[#*_`>\[\]()]+", " ", stripped.lower())
+    text = " ".join(text.split())
+    if not text:
+        return None
+    if PAGE_NUMBER_PATTERN.match(text):
+        text = re.sub(r"\d+", "0", text)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+
+
+def _iter_pages(md_path):
+    """
+    Yield the lines of each page (separator lines included) from a Markdown file.
+
+    A page ends with the separator the converter writes: a "-----" line
+    followed by a blank line. A "-----" line without the blank line after
+    it stays part of the page.
+    """
+    page = []
+    after_separator = False
+    with open(md_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            page.append(line)
+            if after_separator and line == "\n":
+                yield page
+                page = []
+            after_separator = line == PAGE_SEPARATOR_LINE
+    if page:
+        yield page
+
+
+def _edge_indexes(lines):
+    """
+    Indexes of the first and last BOILERPLATE_EDGE_LINES non-blank lines of a
+    page (none on a page with 2 * BOILERPLATE_EDGE_LINES lines or fewer).
+    """
+    candidates = [index for index, line in enumerate(lines)
+                  if line.strip() and line.strip() != PAGE_SEPARATOR.strip()]
+    if len(candidates) <= 2 * BOILERPLATE_EDGE_LINES:
+        return set()
+    return set(candidates[:BOILERPLATE_EDGE_LINES] + candidates[-BOILERPLATE_EDGE_LINES:])
+
+
+def strip_boilerplate(md_path):
+    """
+    Remove page headers, footers and counters repeated across pages.
+
+    Pass 1 hashes the normalized first and last lines of every page and
+    counts on how many pages each one appears. Lines found on at least
+    BOILERPLATE_MIN_FRACTION of the pages are boilerplate; pass 2 rewrites
+    the file without them (only where they sit at a page edge). Only the
+    hash counts and one page are held in memory.
+
+    Args:
+        md_path (Path): Converted Markdown file (rewritten atomically)
+
+    Returns:
+        dict: {"lines_removed", "bytes_before", "bytes_after"}
+    """
+    bytes_before = md_path.stat().st_size
+    stats = {"lines_removed": 0, "bytes_before": bytes_before, "bytes_after": bytes_before}
+
+    page_count = 0
+    counts = Counter()
+    for lines in _iter_pages(md_path):
+        if not any(line.strip() for line in lines):
+            continue
+        page_count += 1
+        keys = {_boilerplate_key(lines[index]) for index in _edge_indexes(lines)}
+        counts.update(key for key in keys if key is not None)
+
+    if page_count < BOILERPLATE_MIN_PAGES:
+        return stats
+    boilerplate = {key for key, count in counts.items() if count >= page_count * BOILERPLATE_MIN_FRACTION}
+    if not boilerplate:
+        return stats
+
+    with MarkdownWriter(md_path) as out:
+        for lines in _iter_pages(md_path):
+            edges = _edge_indexes(lines)
+            after_removed = False
+            for index, line in enumerate(lines):
+                if index in edges and _boilerplate_key(line) in boilerplate:
+                    stats["lines_removed"] += 1
+                    after_removed = True
+                elif after_removed and not line.strip():
+                    # Drop the blank line that followed the removed one
+                    after_removed = False
+                else:
+                    after_removed = False
+                    out.write(line)
+
+    stats["bytes_after"] = md_path.stat().st_size
+    return stats
+
+
+def chunk_dir_for(md_path):
+    """Get the chunk directory of a Markdown file (document.md -> document.chunks/)."""
+    return md_path.with_name(f"{md_path.stem}.chunks")
+
+
+def _heading_text(raw):
+    """Plain text of a Markdown heading (markup stripped)."""
+    return raw.decode('utf-8', 'replace').strip().strip('*_').strip()
+
+
+def _make_block(start, lines):
+    """Build a _markdown_blocks block from (line, page) pairs starting at byte offset start."""
+    pages = [page for line, page in lines if line.strip()] or [lines[0][1]]
+    return {
+        "start": start,
+        "end": start + sum(len(line) for line, _ in lines),
+        "first_page": pages[0],
+        "last_page": pages[-1],
+        "blank": not any(line.strip() for line, _ in lines),
+        "heading": HEADING_PATTERN.match(lines[0][0]),
+        "lines": [line for line, _ in lines],
+    }
+
+
+def _split_point(lines, max_bytes):
+    """
+    Find where to cut an over-budget block: after the last blank line that
+    keeps the first part within max_bytes, else after the last line that does.
+    """
+    size = 0
+    last_fit = last_break = 0
+    for index, (line, _) in enumerate(lines[:-1], 1):
+        size += len(line)
+        if size > max_bytes:
+            break
+        last_fit = index
+        if not line.strip():
+            last_break = index
+    return last_break or last_fit or 1
+
+
+def _markdown_blocks(md_file, max_bytes):
+    """
+    Split Markdown into blocks that start at a heading or a paragraph break.
+
+    A block ends before the next heading. A longer block is cut at the last
+    paragraph break (or line) that keeps it within max_bytes; only a single
+    line longer than max_bytes exceeds it. A page ends at the separator
+    line plus the blank line after it (see _iter_pages).
+
+    Yields:
+        dict: start/end byte offsets, first/last page, heading match or None,
+              blank flag and the raw lines
+    """
+    separator = PAGE_SEPARATOR_LINE.encode()
+    page = 1
+    start = size = 0
+    lines = []  # (line, page) pairs of the current block
+    after_separator = False
+
+    for line in md_file:
+        if lines and HEADING_PATTERN.match(line):
+            block = _make_block(start, lines)
+            yield block
+            start, size, lines = block["end"], 0, []
+        lines.append((line, page))
+        size += len(line)
+        if after_separator and line == b"\n":
+            page += 1
+        after_separator = line == separator
+
+        while size > max_bytes and len(lines) > 1:
+            cut = _split_point(lines, max_bytes)
+            block = _make_block(start, lines[:cut])
+            yield block
+            lines = lines[cut:]
+            start, size = block["end"], size - (block["end"] - block["start"])
+
+    if lines:
+        yield _make_block(start, lines)
+
+
+def write_chunks(md_path, max_tokens=CHUNK_TOKENS):
+    """
+    Split a converted Markdown file into token-bounded chunk files plus an index.
+
+    Consecutive sections are packed into one chunk while they fit in
+    max_tokens; a section that doesn't fit on its own is split at paragraph
+    breaks. The chunks and index.json are written to a temporary directory
+    that replaces chunk_dir_for(md_path) when done. The index records, per
+    chunk, its heading, page range, byte offsets into the .md file and token
+    estimate, so a reader can load only the chunks it needs.
+
+    Args:
+        md_path (Path): Converted Markdown file
+        max_tokens (int): Token budget per chunk
+
+    Returns:
+        int: Number of chunks written
+    """
+    chunk_dir = chunk_dir_for(md_path)
+    tmp_dir = chunk_dir.with_name(f".{chunk_dir.name}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir()
+    max_bytes = max_tokens * BYTES_PER_TOKEN
+
+    entries = []
+    current = None      # index entry of the chunk being written
+    out = None
+    section = None      # (heading, level) of the last heading seen
+
+    try:
+        with open(md_path, 'rb') as md_file:
+            for block in _markdown_blocks(md_file, max_bytes):
+                if block["heading"]:
+                    section = (_heading_text(block["heading"].group(2)), len(block["heading"].group(1)))
+                size = block["end"] - block["start"]
+                if current and current["end"] - current["start"] + size > max_bytes:
+                    out.close()
+                    current = None
+                if current is None:
+                    current = {
+                        "file": f"{len(entries) + 1:04d}.md",
+                        "heading": section[0] if section else None,
+                        "level": section[1] if section else 0,
+                        "continued": bool(section) and not block["heading"],
+                        "pages": [block["first_page"], block["last_page"]],
+                        "start": block["start"],
+                        "end": block["end"],
+                    }
+                    entries.append(current)
+                    out = open(tmp_dir / current["file"], 'wb')
+                out.writelines(block["lines"])
+                if not block["blank"]:
+                    current["pages"][1] = block["last_page"]
+                current["end"] = block["end"]
+        if out:
+            out.close()
+
+        for entry in entries:
+            entry["tokens"] = -(-(entry["end"] - entry["start"]) // BYTES_PER_TOKEN)
+        index = {
+            "markdown": md_path.name,
+            "max_tokens": max_tokens,
+            "bytes_per_token": BYTES_PER_TOKEN,
+            "chunks": entries,
+        }
+        with open(tmp_dir / "index.json", 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=1)
+
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+        os.replace(tmp_dir, chunk_dir)
+    except BaseException:
+        if out:
+            out.close()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return len(entries)
+
+
+def markdown_metrics(md_path):
+    """
+    Count pages, empty pages and tables in a converted Markdown file.
+
+    A page is empty if it has no lines besides blank lines and comments
+    (e.g. an OCR failure note). Tables are counted by their delimiter row
+    (|---|---|).
+
+    Returns:
+        dict: {"pages", "empty_pages", "tables"}
+    """
+    metrics = {"pages": 0, "empty_pages": 0, "tables": 0}
+    for lines in _iter_pages(md_path):
+        if not any(line.strip() for line in lines):
+            continue
+        metrics["pages"] += 1
+        content = [line.strip() for line in lines
+                   if line.strip() and line.strip() != PAGE_SEPARATOR.strip()]
+        if not any(not line.startswith("<!--") for line in content):
+            metrics["empty_pages"] += 1
+        metrics["tables"] += sum(1 for line in content if '|' in line and TABLE_DELIMITER_PATTERN.match(line))
+    return metrics
 
 
-def process_single_file(file_path):
+def finish_markdown(md_path, strip=False, chunk_tokens=0, measure=False, page_count=None):
+    """
+    Post-process a converted Markdown file.
+
+    Args:
+        md_path (Path): Converted Markdown file
+        strip (bool): Remove repeated headers/footers (strip_boilerplate)
+        chunk_tokens (int): Also write token-bounded chunks (0 = don't)
+        measure (bool): Add markdown_metrics for the --report
+        page_count (int): Pages in the PDF (reported instead of the
+                          separators counted in the Markdown)
+
+    Returns:
+        dict: strip_boilerplate stats, plus "chunks" when chunks were written
+              and markdown_metrics when measuring
+    """
+    stats = strip_boilerplate(md_path) if strip else {}
+    if chunk_tokens:
+        stats["chunks"] = write_chunks(md_path, chunk_tokens)
+    if measure:
+        stats.update(markdown_metrics(md_path))
+        if page_count is not None:
+            stats["pages"] = page_count
+    return stats
+
+
+def convert_pdf_to_markdown(pdf_path, output_path=None, ocr_language=None, strip=False, chunk_tokens=0,
+                            measure=False):
+    """
+    Convert a single PDF file to Markdown format (runs in worker processes).
+
+    The Markdown is streamed to disk STREAM_PAGES pages at a time.
+
+    Args:
+        pdf_path (Path): Path to the PDF file
+        output_path (Path): Markdown path (default: same directory, .md extension)
+        ocr_language (str): Tesseract language(s) for scanned pages, or None
+        strip (bool): Remove repeated headers/footers afterwards
+        chunk_tokens (int): Also write token-bounded chunks (0 = don't)
+        measure (bool): Also count pages, empty pages and tables
+
+    Returns:
+        tuple: (output_path: Path, stats: dict from finish_markdown)
+
+    Raises:
+        Exception: Whatever pymupdf4llm raises for an unreadable PDF
+    """
+    output_path = output_path or pdf_path.with_suffix('.md')
+    with pymupdf.open(str(pdf_path)) as doc, MarkdownWriter(output_path) as out:
+        page_count = doc.page_count
+        for md_text in convert_page_range(doc, range(page_count), ocr_language):
+            out.write(md_text)
+    return out.path, finish_markdown(out.path, strip, chunk_tokens, measure, page_count)
+
+
+class TaskFailed(Exception):
+    """A worker task failed; kind is "error", "timeout", "memory" or "crashed"."""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+
+
+def _reset_peak_rss():
+    """Reset this process's peak RSS (VmHWM) so it covers the next task only (Linux)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb():
+    """
+    Get this process's peak resident memory in MB.
+
+    Uses VmHWM on Linux (reset per task by _reset_peak_rss), otherwise
+    ru_maxrss, which is the peak over the worker's lifetime.
+
+    Returns:
+        float: Peak RSS in MB, or None if it can't be measured
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError):
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _worker_main(conn, memory_limit_mb, max_tasks):
+    """
+    Worker loop: run (function, args) tasks from the pipe until told to stop.
+
+    Each result is sent back as (status, value, usage), where usage holds
+    the task's "seconds" and "peak_rss_mb".
+
+    Args:
+        conn (Connection): Pipe to the supervisor
+        memory_limit_mb (int): Address-space limit (0 = none)
+        max_tasks (int): Exit after this many tasks (0 = never)
+    """
+    if memory_limit_mb and resource is not None:
+        # Lower only the soft limit, never above an existing hard limit (e.g. ulimit -v)
+        limit = memory_limit_mb * 1024 * 1024
+        try:
+            soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        except (ValueError, OSError) as e:
+            print(f"Warning: Could not set the {memory_limit_mb} MB memory limit: {e}")
+
+    done = 0
+    while not max_tasks or done < max_tasks:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        func, args = task
+        _reset_peak_rss()
+        started = time.perf_counter()
+
+        def usage():
+            return {"seconds": time.perf_counter() - started, "peak_rss_mb": _peak_rss_mb()}
+
+        out_of_memory = ("memory", f"exceeded the {memory_limit_mb} MB memory limit")
+        try:
+            outcome = ("ok", func(*args))
+        except MemoryError:
+            outcome = out_of_memory
+        except Exception as e:
+            message = str(e) or type(e).__name__
+            outcome = out_of_memory if MUPDF_ALLOC_FAILED.search(message) else ("error", message)
+        # Sent outside the except blocks, so the failed task's frames are freed first
+        try:
+            conn.send((*outcome, usage()))
+        except MemoryError:
+            conn.send((*out_of_memory, None))
+        done += 1
+    conn.close()
+
+
+class WorkerPool:
+    """
+    Supervised worker processes with per-task timeouts.
+
+    Unlike ProcessPoolExecutor, a hung or crashed task costs only its own
+    worker: the supervisor kills it, reports the task as failed and starts a
+    fresh worker for the rest of the queue. Workers are also replaced after
+    max_tasks tasks, so memory leaked by the PDF library doesn't accumulate.
+
+    The run time and peak memory of each finished task are kept in usage
+    (task id -> {"seconds", "peak_rss_mb"}) until popped by the caller.
+
+    A task can wait for another one (submit(..., after=task_id)) and gets
+    that task's result as its last argument; if that task fails, so does
+    the waiting one, without running.
+    """
+
+    def __init__(self, workers=1, timeout=0, memory_limit_mb=0, max_tasks=0):
+        """
+        Initialize the pool (workers start on demand).
+
+        Args:
+            workers (int): Maximum number of worker processes
+            timeout (float): Wall-clock limit per task in seconds (0 = none)
+            memory_limit_mb (int): Address-space limit per worker (0 = none)
+            max_tasks (int): Tasks per worker before it is replaced (0 = never)
+        """
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks = max_tasks
+        self.queue = deque()
+        self.idle = []
+        self.busy = {}
+        self.done = {}
+        self.usage = {}
+        self.inputs = {}  # task id -> outcome, kept while queued tasks wait for it
+        self.discarded = set()
+        self.next_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def submit(self, func, *args, after=None):
+        """
+        Queue a task.
+
+        Args:
+            func: Module-level function to run in a worker
+            *args: Picklable arguments
+            after (int): Run only once this task has succeeded, with its
+                         result appended to args
+
+        Returns:
+            int: Task id for result()
+        """
+        task_id = self.next_id
+        self.next_id += 1
+        self.queue.append((task_id, func, args, after))
+        return task_id
+
+    def result(self, task_id):
+        """
+        Wait for a task's result.
+
+        Args:
+            task_id (int): Id returned by submit()
+
+        Returns:
+            The function's return value
+
+        Raises:
+            TaskFailed: If the task raised, timed out, ran out of memory or
+                        its worker died
+        """
+        while task_id not in self.done:
+            self._step()
+        status, value = self.done.pop(task_id)
+        if status != "ok":
+            raise TaskFailed(status, value)
+        return value
+
+    def discard(self, task_ids):
+        """Drop tasks whose results are no longer needed."""
+        task_ids = set(task_ids)
+        self.queue = deque(task for task in self.queue if task[0] not in task_ids)
+        for task_id in task_ids:
+            if self.done.pop(task_id, None) is None:
+                self.discarded.add(task_id)
+
+    def close(self):
+        """Stop all workers (killing any still running a task)."""
+        for worker in self.idle:
+            try:
+                worker["conn"].send(None)
+            except OSError:
+                pass
+            self._retire(worker)
+        for worker in list(self.busy.values()):
+            self._retire(worker, kill=True)
+        self.idle, self.busy = [], {}
+
+    def _start_worker(self):
+        """Start a worker process."""
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_worker_main, args=(child_conn, self.memory_limit_mb, self.max_tasks), daemon=True)
+        process.start()
+        child_conn.close()
+        return {"process": process, "conn": parent_conn, "tasks": 0}
+
+    def _retire(self, worker, kill=False):
+        """Stop tracking a worker and reap its process."""
+        if kill:
+            worker["process"].kill()
+        worker["conn"].close()
+        worker["process"].join()
+
+    def _dispatch(self):
+        """
+        Hand queued tasks to idle (or new) workers.
+
+        Tasks waiting for an unfinished task stay queued, in order.
+
+        Returns:
+            bool: True if a task failed without running (the task it waited for failed)
+        """
+        failed = False
+        waiting = deque()
+        while self.queue and (self.idle or len(self.busy) < self.workers):
+            task_id, func, args, after = self.queue.popleft()
+            if after is not None:
+                if after not in self.inputs:
+                    waiting.append((task_id, func, args, after))
+                    continue
+                status, value = self.inputs[after]
+                if status != "ok":
+                    self.done[task_id] = (status, value)
+                    failed = True
+                    continue
+                args = args + (value,)
+
+            worker = self.idle.pop() if self.idle else self._start_worker()
+            worker["conn"].send((func, args))
+            worker["task_id"] = task_id
+            worker["tasks"] += 1
+            worker["started"] = time.monotonic()
+            worker["deadline"] = worker["started"] + self.timeout if self.timeout else None
+            self.busy[worker["conn"]] = worker
+
+        waiting.extend(self.queue)
+        self.queue = waiting
+        needed = {task[3] for task in self.queue}
+        for task_id in [task_id for task_id in self.inputs if task_id not in needed]:
+            del self.inputs[task_id]
+        return failed
+
+    def _finish(self, worker, status, value, usage=None):
+        """Store a task outcome; keep the worker only if it is healthy and not used up."""
+        del self.busy[worker["conn"]]
+        if any(task[3] == worker["task_id"] for task in self.queue):
+            self.inputs[worker["task_id"]] = (status, value)
+        if worker["task_id"] in self.discarded:
+            self.discarded.discard(worker["task_id"])
+        else:
+            self.done[worker["task_id"]] = (status, value)
+            self.usage[worker["task_id"]] = usage or {
+                "seconds": time.monotonic() - worker["started"], "peak_rss_mb": None}
+
+        if status in ("ok", "error"):
+            if self.max_tasks and worker["tasks"] >= self.max_tasks:
+                # The worker exits by itself after its last task
+                self._retire(worker)
+            else:
+                self.idle.append(worker)
+        else:
+            self._retire(worker, kill=True)
+
+    def _step(self):
+        """Dispatch work, then wait for the next result or deadline."""
+        if self._dispatch() and not self.busy:
+            return
+        if not self.busy:
+            raise RuntimeError("No task is queued or running")
+
+        deadlines = [worker["deadline"] for worker in self.busy.values() if worker["deadline"]]
+        wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+        for conn in wait(list(self.busy), timeout=wait_for):
+            worker = self.busy[conn]
+            usage = None
+            try:
+                status, value, usage = conn.recv()
+            except (EOFError, OSError):
+                # Killed by the OS (e.g. out of memory) or crashed in C code
+                worker["process"].join()
+                exitcode = worker["process"].exitcode
+                reason = f"killed by signal {-exitcode}" if exitcode and exitcode < 0 else f"exit code {exitcode}"
+                status, value = "crashed", f"worker died ({reason})"
+            self._finish(worker, status, value, usage)
+
+        now = time.monotonic()
+        for worker in list(self.busy.values()):
+            if worker["deadline"] and worker["deadline"] <= now:
+                self._finish(worker, "timeout", f"timed out after {self.timeout:g}s")
+
+
+class Converter:
+    """
+    Converts PDFs in supervised workers and tracks the batch outcome.
+
+    Small files are one task each; large files are split into page-chunk
+    tasks whose results are written here in page order. Files that time
+    out, exceed the memory limit or crash their worker are collected in
+    retry_files.
+    """
+
+    def __init__(self, jobs=1, timeout=FILE_TIMEOUT, memory_limit_mb=MEMORY_LIMIT_MB,
+                 max_tasks=MAX_TASKS_PER_WORKER, cache=None, output_dir=None, ocr_language=None,
+                 strip=False, chunk_tokens=0, measure=False):
+        """
+        Initialize the converter.
+
+        Args:
+            jobs (int): Number of worker processes
+            timeout (float): Wall-clock limit per file or page chunk (0 = none)
+            memory_limit_mb (int): Address-space limit per worker (0 = none)
+            max_tasks (int): Tasks per worker before it is replaced (0 = never)
+            cache (ConversionCache): Records successful conversions
+            output_dir (Path): Write Markdown here instead of next to each PDF
+            ocr_language (str): Tesseract language(s) for scanned pages, or None
+            strip (bool): Remove repeated headers/footers from the Markdown
+            chunk_tokens (int): Also write token-bounded chunks (0 = don't)
+            measure (bool): Collect per-file metrics for write_report()
+        """
+        self.jobs = jobs
+        self.ocr_language = ocr_language
+        self.strip = strip
+        self.chunk_tokens = chunk_tokens
+        self.stripped = {"lines_removed": 0, "bytes_before": 0, "bytes_after": 0, "chunks": 0}
+        self.cache = cache
+        self.output_dir = output_dir
+        self.source_root = None
+        self.pool = WorkerPool(jobs, timeout, memory_limit_mb, max_tasks)
+        self.retry_files = []
+        self.report = [] if measure else None
+        self.unchanged = 0
+        self.started = time.monotonic()
+
+    def output_path(self, pdf_path):
+        """
+        Get the Markdown path for a PDF.
+
+        Without an output directory the Markdown goes next to the PDF. With
+        one, folder mode mirrors the tree below source_root into it; other
+        modes put every file directly in it.
+
+        Args:
+            pdf_path (Path): Path to the PDF file
+
+        Returns:
+            Path: Markdown path
+        """
+        if self.output_dir is None:
+            return pdf_path.with_suffix('.md')
+        if self.source_root is not None:
+            relative = pdf_path.relative_to(self.source_root)
+        else:
+            relative = Path(pdf_path.name)
+        return self.output_dir / relative.with_suffix('.md')
+
+    def is_fresh(self, pdf_path):
+        """Check whether a PDF's Markdown (and chunk index) is up to date (see ConversionCache)."""
+        if not self.cache:
+            return False
+        output_path = self.output_path(pdf_path)
+        if self.chunk_tokens and not (chunk_dir_for(output_path) / "index.json").exists():
+            return False
+        if not self.cache.is_fresh(pdf_path, output_path):
+            return False
+        self.unchanged += 1
+        return True
+
+    def split(self, file_paths):
+        """
+        Separate PDFs that need converting from up-to-date ones.
+
+        Returns:
+            tuple: (to_convert: list, unchanged: list)
+        """
+        to_convert, unchanged = [], []
+        for file_path in file_paths:
+            (unchanged if self.is_fresh(file_path) else to_convert).append(file_path)
+        return to_convert, unchanged
+
+    def summary_notes(self):
+        """Extra summary lines (boilerplate removed, chunks written)."""
+        notes = []
+        if self.stripped["lines_removed"]:
+            before, after = self.stripped["bytes_before"], self.stripped["bytes_after"]
+            notes.append(f"Boilerplate removed: {self.stripped['lines_removed']} line(s), "
+                         f"{format_size(before - after)} ({(before - after) / before:.0%} of {format_size(before)})")
+        if self.stripped["chunks"]:
+            notes.append(f"Chunks written: {self.stripped['chunks']} "
+                         f"(≤ {self.chunk_tokens} tokens each, see <name>.chunks/index.json)")
+        return notes
+
+    def close(self):
+        """Stop the workers and save the cache."""
+        self.pool.close()
+        if self.cache:
+            self.cache.save()
+
+    def _submit(self, file_path):
+        """
+        Queue one file.
+
+        Returns:
+            A single task id, or for page chunks {"headers": task id of
+            document_headers, "tasks": chunk task ids (run after it),
+            "pages": page count}
+        """
+        output_path = self.output_path(file_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        chunks = plan_chunks(file_path, self.jobs)
+        if chunks is None:
+            return self.pool.submit(convert_pdf_to_markdown, file_path, output_path, self.ocr_language,
+                                    self.strip, self.chunk_tokens, self.report is not None)
+        headers = self.pool.submit(document_headers, file_path)
+        return {"headers": headers,
+                "tasks": [self.pool.submit(convert_pages, file_path, pages, self.ocr_language, after=headers)
+                          for pages in chunks],
+                "pages": sum(len(pages) for pages in chunks)}
+
+    def _collect(self, file_path, task):
+        """Wait for a file's task(s) and return its result tuple."""
+        task_ids = [task["headers"], *task["tasks"]] if isinstance(task, dict) else [task]
+        main_seconds = 0.0
+        try:
+            if isinstance(task, dict):
+                remaining = deque(task["tasks"])
+                try:
+                    self.pool.result(task["headers"])
+                    with MarkdownWriter(self.output_path(file_path)) as out:
+                        while remaining:
+                            out.write(self.pool.result(remaining.popleft()))
+                except TaskFailed:
+                    self.pool.discard(remaining)
+                    raise
+                output_path = out.path
+                started = time.perf_counter()
+                stats = finish_markdown(output_path, self.strip, self.chunk_tokens, self.report is not None,
+                                        task["pages"])
+                main_seconds = time.perf_counter() - started
+            else:
+                output_path, stats = self.pool.result(task)
+        except TaskFailed as e:
+            if e.kind != "error":
+                # The killed worker couldn't clean up after itself
+                output_path = self.output_path(file_path)
+                MarkdownWriter.temp_path(output_path).unlink(missing_ok=True)
+                chunk_dir = chunk_dir_for(output_path)
+                shutil.rmtree(chunk_dir.with_name(f".{chunk_dir.name}.tmp"), ignore_errors=True)
+                self.retry_files.append(file_path)
+            self._measure(file_path, None, task_ids, {}, str(e))
+            return file_path, False, None, str(e), {}
+        except OSError as e:
+            self._measure(file_path, None, task_ids, {}, str(e))
+            return file_path, False, None, str(e), {}
+
+        if self.cache:
+            self.cache.record(file_path, output_path)
+        for key in self.stripped:
+            self.stripped[key] += stats.get(key, 0)
+        self._measure(file_path, output_path, task_ids, stats, None, main_seconds)
+        return file_path, True, output_path, None, stats
+
+    def _measure(self, file_path, output_path, task_ids, stats, error, main_seconds=0.0):
+        """
+        Add a file's entry to the report (and release its task usage).
+
+        Args:
+            file_path (Path): PDF path
+            output_path (Path): Markdown path, or None if the conversion failed
+            task_ids (list): The file's worker task ids
+            stats (dict): finish_markdown stats
+            error (str): Error message, or None
+            main_seconds (float): Post-processing time spent in this process
+        """
+        usages = [usage for usage in (self.pool.usage.pop(task_id, None) for task_id in task_ids) if usage]
+        if self.report is None:
+            return
+
+        seconds = sum(usage["seconds"] for usage in usages) + main_seconds
+        peaks = [usage["peak_rss_mb"] for usage in usages if usage["peak_rss_mb"] is not None]
+        pages = stats.get("pages")
+        entry = {
+            "pdf": str(file_path),
+            "markdown": str(output_path) if output_path else None,
+            "status": "failed" if error else "ok",
+            "error": error,
+            "pages": pages,
+            "bytes_in": file_path.stat().st_size if file_path.exists() else None,
+            "bytes_out": output_path.stat().st_size if output_path else None,
+            "seconds": round(seconds, 3),
+            "pages_per_second": round(pages / seconds, 2) if pages and seconds else None,
+            "peak_rss_mb": round(max(peaks), 1) if peaks else None,
+            "empty_pages": stats.get("empty_pages"),
+            "tables": stats.get("tables"),
+            "flags": [],
+        }
+        if entry["pages_per_second"] is not None and entry["pages_per_second"] < SLOW_PAGES_PER_SECOND:
+            entry["flags"].append("slow")
+        if pages and entry["empty_pages"] >= pages * EMPTY_PAGE_FRACTION:
+            entry["flags"].append("mostly_empty")
+        self.report.append(entry)
+
+    def write_report(self, report_path):
+        """
+        Write the --report JSON: one entry per converted (or failed) file plus totals.
+
+        Seconds are worker time per file; the totals' pages_per_second is
+        the batch throughput (pages per wall-clock second).
+
+        Args:
+            report_path (Path): Where to write the report
+
+        Returns:
+            dict: The report totals
+        """
+        files = self.report or []
+        ok = [entry for entry in files if entry["status"] == "ok"]
+        wall_seconds = time.monotonic() - self.started
+        pages = sum(entry["pages"] or 0 for entry in ok)
+        peaks = [entry["peak_rss_mb"] for entry in files if entry["peak_rss_mb"] is not None]
+        totals = {
+            "files": len(files),
+            "converted": len(ok),
+            "failed": len(files) - len(ok),
+            "unchanged": self.unchanged,
+            "pages": pages,
+            "bytes_in": sum(entry["bytes_in"] or 0 for entry in files),
+            "bytes_out": sum(entry["bytes_out"] or 0 for entry in ok),
+            "seconds": round(sum(entry["seconds"] for entry in files), 3),
+            "wall_seconds": round(wall_seconds, 3),
+            "pages_per_second": round(pages / wall_seconds, 2) if wall_seconds else None,
+            "peak_rss_mb": max(peaks) if peaks else None,
+            "empty_pages": sum(entry["empty_pages"] or 0 for entry in ok),
+            "tables": sum(entry["tables"] or 0 for entry in ok),
+            "jobs": self.jobs,
+            "slow": sum(1 for entry in files if "slow" in entry["flags"]),
+            "mostly_empty": sum(1 for entry in files if "mostly_empty" in entry["flags"]),
+        }
+        report = {"totals": totals, "files": files}
+        tmp_path = report_path.with_name(f".{report_path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, report_path)
+        return totals
+
+    def convert(self, file_paths):
+        """
+        Convert PDF files.
+
+        Files are submitted a few at a time ahead of the one being waited
+        for, and results are yielded in input order, so progress output stays
+        ordered even though workers finish out of order.
+
+        Args:
+            file_paths (iterable): PDF paths to convert
+
+        Yields:
+            tuple: (file_path, success, output_path, error_message, stats)
+        """
+        pending = deque()
+        files = iter(file_paths)
+        while True:
+            # Look ahead far enough to keep every worker busy
+            while len(pending) < self.jobs * 2:
+                file_path = next(files, None)
+                if file_path is None:
+                    break
+                pending.append((file_path, self._submit(file_path)))
+            if not pending:
+                return
+            yield self._collect(*pending.popleft())
+
+
+def write_retry_list(file_paths, retry_list):
+    """
+    Save files that timed out or ran out of memory, one path per line.
+
+    Args:
+        file_paths (list): PDF paths to retry
+        retry_list (Path): Output file (can be passed back as "@retry_list")
+    """
+    retry_list.write_text("".join(f"{path}\n" for path in file_paths), encoding='utf-8')
+    print(f"\n{len(file_paths)} file(s) timed out, ran out of memory or crashed their worker.")
+    print(f"Retry list: {retry_list}")
+    print(f'Retry with: python 13-convert-pdf-to-markdown.py "@{retry_list}" --timeout 0')
+
+
+def describe_stats(stats):
+    """Progress-line note for post-processing, e.g. " (boilerplate -14%, 12 chunks)"."""
+    parts = []
+    if stats.get("lines_removed") and stats.get("bytes_before"):
+        saved = stats["bytes_before"] - stats["bytes_after"]
+        parts.append(f"boilerplate -{saved / stats['bytes_before']:.0%}")
+    if stats.get("chunks"):
+        parts.append(f"{stats['chunks']} chunk(s)")
+    return f" ({', '.join(parts)})" if parts else ""
+
+
+def process_single_file(file_path, converter):
     """Process a single PDF file."""
+    if converter.is_fresh(file_path):
+        print(f"\nUp to date: {converter.output_path(file_path).name} (use --force to reconvert)")
+        return True
+
     print(f"\nConverting: {file_path.name}...", end=" ", flush=True)
 
-    success, output_path, error = convert_pdf_to_markdown(file_path)
+    _, success, output_path, error, stats = next(converter.convert([file_path]))
 
     if success:
-        print("✓")
+        print("✓" + describe_stats(stats))
         print(f"  Output: {output_path.name}")
         return True
     else:
@@ -77,64 +1502,195 @@ def process_single_file(file_path):
         return False
 
 
-def process_multiple_files(file_paths):
-    """Process multiple PDF files."""
-    total = len(file_paths)
-    success_count = 0
-    failed_files = []
+def _matches(relative, patterns):
+    """Check a relative path (or its last component) against glob patterns."""
+    relative = relative.lower()
+    name = relative.rsplit('/', 1)[-1]
+    return any(fnmatchcase(relative, pattern.lower()) or fnmatchcase(name, pattern.lower())
+               for pattern in patterns)
 
-    print(f"\nProcessing {total} file(s)...\n")
 
-    for idx, file_path in enumerate(file_paths, 1):
-        print(f"[{idx}/{total}] {file_path.name}...", end=" ", flush=True)
+def find_pdfs(root, recursive=False, include=DEFAULT_INCLUDE, exclude=(), skip_dirs=()):
+    """
+    Yield PDF files below a folder as they are found.
 
-        success, output_path, error = convert_pdf_to_markdown(file_path)
+    Uses os.scandir, one directory at a time (sorted by name), so a deep
+    archive tree starts converting before the walk has finished.
 
-        if success:
-            print("✓")
-            success_count += 1
-        else:
-            print("✗")
-            print(f"  Error: {error}")
-            failed_files.append(file_path.name)
+    Args:
+        root (Path): Folder to scan
+        recursive (bool): Descend into subfolders (hidden folders are skipped)
+        include (tuple): Glob patterns a file must match
+        exclude (tuple): Glob patterns for files and folders to skip
+        skip_dirs (tuple): Folders never to enter (e.g. the output directory)
+
+    Yields:
+        Path: PDF file paths
+    """
+    skip_dirs = {Path(directory).resolve() for directory in skip_dirs}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError as e:
+            print(f"Warning: Cannot read {directory}: {e}")
+            continue
+
+        subfolders = []
+        for entry in entries:
+            relative = Path(entry.path).relative_to(root).as_posix()
+            if exclude and _matches(relative, exclude):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                if recursive and not entry.name.startswith('.') and Path(entry.path).resolve() not in skip_dirs:
+                    subfolders.append(Path(entry.path))
+            elif entry.name.lower().endswith('.pdf') and entry.is_file() and _matches(relative, include):
+                yield Path(entry.path)
 
-    # Print summary
+        # Depth-first, in name order
+        stack.extend(reversed(subfolders))
+
+
+def print_summary(success_count, total, failed_files, unchanged=0, notes=()):
+    """Print the batch conversion summary (notes: extra lines, e.g. Converter.summary_notes())."""
     print("\n" + "=" * 60)
     print("Conversion complete!")
     print(f"Success: {success_count}/{total}")
+    if unchanged:
+        print(f"Unchanged (skipped): {unchanged}")
+    for note in notes:
+        print(note)
     if failed_files:
         print(f"Failed: {len(failed_files)}")
         print("Failed files:")
-        for fname in failed_files:
-            print(f"  - {fname}")
+        for fname, error in failed_files:
+            print(f"  - {fname}: {error}")
     print("=" * 60)
 
 
-def process_folder(folder_path, test_first=True):
+def process_multiple_files(file_paths, converter, start=1, total=None, success_count=0):
+    """
+    Process multiple PDF files.
+
+    Args:
+        file_paths (list): PDF paths to convert
+        converter (Converter): Runs the conversions
+        start (int): Progress number of the first file
+        total (int): Progress total (defaults to the number of files)
+        success_count (int): Files already converted (e.g. the folder-mode test file)
+    """
+    total = total or len(file_paths)
+    failed_files = []
+    jobs = converter.jobs
+
+    if start == 1:
+        print(f"\nProcessing {total} file(s)" + (f" with {jobs} workers" if jobs > 1 else "") + "...\n")
+
+    try:
+        for idx, (file_path, success, output_path, error, stats) in enumerate(converter.convert(file_paths), start):
+            if success:
+                print(f"[{idx}/{total}] {file_path.name}... ✓{describe_stats(stats)}", flush=True)
+                success_count += 1
+            else:
+                print(f"[{idx}/{total}] {file_path.name}... ✗", flush=True)
+                print(f"  Error: {error}")
+                failed_files.append((file_path.name, error))
+    finally:
+        # Keep finished conversions even if the batch is interrupted
+        if converter.cache:
+            converter.cache.save()
+
+    print_summary(success_count, total, failed_files, notes=converter.summary_notes())
+    return success_count, failed_files
+
+
+def process_tree(folder_path, converter, scan):
+    """
+    Convert PDFs as they are discovered (non-interactive batch mode).
+
+    There is no test-first step and no upfront listing: each PDF found by
+    find_pdfs goes straight into the worker pool.
+
+    Args:
+        folder_path (Path): Path to the folder
+        converter (Converter): Runs the conversions
+        scan (dict): find_pdfs options (recursive, include, exclude, skip_dirs)
+    """
+    unchanged = 0
+
+    def discovered():
+        nonlocal unchanged
+        for pdf_path in find_pdfs(folder_path, **scan):
+            if converter.is_fresh(pdf_path):
+                unchanged += 1
+            else:
+                yield pdf_path
+
+    print(f"\nConverting PDFs under {folder_path} as they are found...\n")
+    success_count = 0
+    failed_files = []
+    idx = 0
+    try:
+        for idx, (file_path, success, output_path, error, stats) in enumerate(converter.convert(discovered()), 1):
+            relative = file_path.relative_to(folder_path)
+            if success:
+                print(f"[{idx}] {relative}... ✓{describe_stats(stats)}", flush=True)
+                success_count += 1
+            else:
+                print(f"[{idx}] {relative}... ✗", flush=True)
+                print(f"  Error: {error}")
+                failed_files.append((str(relative), error))
+    finally:
+        if converter.cache:
+            converter.cache.save()
+
+    if idx == 0:
+        if unchanged:
+            print(f"All {unchanged} Markdown file(s) are up to date (use --force to reconvert).")
+        else:
+            print(f"No PDF files found in: {folder_path}")
+        return
+    print_summary(success_count, idx, failed_files, unchanged, converter.summary_notes())
+
+
+def process_folder(folder_path, converter, test_first=True, scan=None):
     """
     Process all PDF files in a folder.
 
     Args:
         folder_path (Path): Path to the folder
+        converter (Converter): Runs the conversions (its cache skips
+                               PDFs whose Markdown is up to date)
         test_first (bool): If True, test first file before processing all
+        scan (dict): find_pdfs options (recursive, include, exclude, skip_dirs)
     """
     # Find all PDF files in folder
-    pdf_files = sorted(folder_path.glob("*.pdf"))
+    pdf_files = list(find_pdfs(folder_path, **(scan or {})))
 
     if not pdf_files:
         print(f"\nNo PDF files found in: {folder_path}")
         return
 
+    pdf_files, unchanged = converter.split(pdf_files)
+    if converter.cache:
+        converter.cache.save()
+
     total = len(pdf_files)
-    print(f"\nFound {total} PDF file(s) to convert")
+    print(f"\nFound {total} PDF file(s) to convert" +
+          (f" ({len(unchanged)} unchanged, skipped)" if unchanged else ""))
+    if not pdf_files:
+        print("All Markdown files are up to date (use --force to reconvert).")
+        return
 
     if test_first and total > 1:
         # Test mode: convert first file and ask for confirmation
         print(f"\nTesting on: {pdf_files[0].name}")
-        success, output_path, error = convert_pdf_to_markdown(pdf_files[0])
+        _, success, output_path, error, stats = next(converter.convert(pdf_files[:1]))
 
         if success:
-            print(f"✓ Successfully converted test document")
+            print(f"✓ Successfully converted test document{describe_stats(stats)}")
             print(f"  Output: {output_path.name}")
 
             # Ask for confirmation (or auto-proceed in non-interactive mode)
@@ -151,57 +1707,141 @@ def process_folder(folder_path, test_first=True):
             remaining_files = pdf_files[1:]
             if remaining_files:
                 print(f"\nProcessing remaining {len(remaining_files)} documents...\n")
-                success_count = 1  # Include the test file
-                failed_files = []
-
-                for idx, file_path in enumerate(remaining_files, 2):
-                    print(f"[{idx}/{total}] {file_path.name}...", end=" ", flush=True)
-
-                    success, output_path, error = convert_pdf_to_markdown(file_path)
-
-                    if success:
-                        print("✓")
-                        success_count += 1
-                    else:
-                        print("✗")
-                        print(f"  Error: {error}")
-                        failed_files.append(file_path.name)
-
-                # Print summary
-                print("\n" + "=" * 60)
-                print("Conversion complete!")
-                print(f"Success: {success_count}/{total}")
-                if failed_files:
-                    print(f"Failed: {len(failed_files)}")
-                    print("Failed files:")
-                    for fname in failed_files:
-                        print(f"  - {fname}")
-                print("=" * 60)
+                process_multiple_files(remaining_files, converter, start=2, total=total, success_count=1)
         else:
             print(f"✗ Test conversion failed")
             print(f"  Error: {error}")
             print("\nPlease fix the issue and try again.")
     else:
         # Process all files without testing
-        process_multiple_files(pdf_files)
+        process_multiple_files(pdf_files, converter)
 
 
 def main():
     """Main entry point for the script."""
-    if len(sys.argv) < 2:
-        print("Usage: python 13-convert-pdf-to-markdown.py <file|files|folder>")
-        print("\nExamples:")
-        print('  Single file:    python 13-convert-pdf-to-markdown.py "./path/to/file.pdf"')
-        print('  Multiple files: python 13-convert-pdf-to-markdown.py "file1.pdf,file2.pdf"')
-        print('  Folder:         python 13-convert-pdf-to-markdown.py "./path/to/folder"')
-        sys.exit(1)
-
-    input_arg = sys.argv[1]
-
-    # Check if input contains comma (multiple files)
-    if ',' in input_arg:
+    parser = argparse.ArgumentParser(
+        description='Convert PDF files to Markdown using pymupdf4llm',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='''
+Examples:
+  Single file:    python 13-convert-pdf-to-markdown.py "./path/to/file.pdf"
+  Multiple files: python 13-convert-pdf-to-markdown.py "file1.pdf,file2.pdf"
+  Folder:         python 13-convert-pdf-to-markdown.py "./path/to/folder"
+  Folder, 4 jobs: python 13-convert-pdf-to-markdown.py "./path/to/folder" --jobs 4
+  Reconvert all:  python 13-convert-pdf-to-markdown.py "./path/to/folder" --force
+  Retry list:     python 13-convert-pdf-to-markdown.py "@convert-pdf-to-markdown-retry.txt" --timeout 0
+  Archive tree:   python 13-convert-pdf-to-markdown.py "./archive" -r --batch --exclude "drafts" -o ./archive-md
+        '''
+    )
+    # The hooks' Bash file tracking parses these options too: keep
+    # PDF_TO_MARKDOWN_VALUE_OPTIONS in hooks/bash_files.py in sync
+    parser.add_argument('input', help='PDF file, comma-separated PDF files, folder, or @file with one PDF per line')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help='Number of worker processes for files and page chunks (default: number of CPUs)')
+    parser.add_argument('--force', '-f', action='store_true',
+                        help='Reconvert PDFs even if their Markdown is up to date')
+    parser.add_argument('--timeout', type=float, default=FILE_TIMEOUT,
+                        help=f'Seconds allowed per file or page chunk, 0 = no limit (default: {FILE_TIMEOUT})')
+    parser.add_argument('--memory-limit', type=int, default=MEMORY_LIMIT_MB,
+                        help=f'Memory limit per worker in MB, 0 = no limit (default: {MEMORY_LIMIT_MB})')
+    parser.add_argument('--max-tasks-per-worker', type=int, default=MAX_TASKS_PER_WORKER,
+                        help=f'Replace each worker after this many tasks, 0 = never (default: {MAX_TASKS_PER_WORKER})')
+    parser.add_argument('--retry-list', default=RETRY_LIST_NAME,
+                        help=f'Where to list files that timed out or ran out of memory (default: {RETRY_LIST_NAME})')
+    parser.add_argument('--recursive', '-r', action='store_true',
+                        help='Folder mode: also convert PDFs in subfolders')
+    parser.add_argument('--include', action='append', metavar='GLOB',
+                        help='Folder mode: only convert matching PDFs (repeatable, default: "*.pdf")')
+    parser.add_argument('--exclude', action='append', metavar='GLOB', default=[],
+                        help='Folder mode: skip matching files and folders (repeatable)')
+    parser.add_argument('--output-dir', '-o',
+                        help='Write Markdown here instead of next to each PDF (folder mode mirrors the tree)')
+    parser.add_argument('--batch', '--yes', '-y', action='store_true',
+                        help='Folder mode: no test-first prompt; convert files as they are found')
+    parser.add_argument('--ocr-language', default=OCR_LANGUAGE,
+                        help=f'Tesseract language(s) for scanned pages, e.g. "ind+eng" (default: {OCR_LANGUAGE})')
+    parser.add_argument('--no-ocr', action='store_true',
+                        help='Skip page triage and OCR (scanned pages come out empty)')
+    parser.add_argument('--strip-boilerplate', action='store_true',
+                        help='Remove page headers, footers and page numbers repeated across pages')
+    parser.add_argument('--report', nargs='?', const=REPORT_NAME, metavar='PATH',
+                        help=f'Write per-file and total metrics (pages, bytes, seconds, peak memory, '
+                             f'empty pages, tables) as JSON (default: {REPORT_NAME})')
+    parser.add_argument('--chunks', type=int, nargs='?', const=CHUNK_TOKENS, default=0, metavar='TOKENS',
+                        help=f'Also split each Markdown file at headings into <name>.chunks/ with an '
+                             f'index.json, at most TOKENS tokens per chunk (default: {CHUNK_TOKENS})')
+    args = parser.parse_args()
+
+    input_arg = args.input
+    if args.memory_limit and resource is None:
+        print("Warning: Memory limits are not supported on this platform")
+
+    ocr_language = None if args.no_ocr else (args.ocr_language or None)
+    converter = Converter(
+        jobs=max(1, args.jobs),
+        timeout=max(0, args.timeout),
+        memory_limit_mb=max(0, args.memory_limit),
+        max_tasks=max(0, args.max_tasks_per_worker),
+        cache=ConversionCache(options={"ocr": ocr_language, "strip_boilerplate": args.strip_boilerplate,
+                                       "chunk_tokens": max(0, args.chunks)},
+                              force=args.force),
+        output_dir=Path(args.output_dir).resolve() if args.output_dir else None,
+        ocr_language=ocr_language,
+        strip=args.strip_boilerplate,
+        chunk_tokens=max(0, args.chunks),
+        measure=bool(args.report),
+    )
+    scan = {
+        "recursive": args.recursive,
+        "include": tuple(args.include or DEFAULT_INCLUDE),
+        "exclude": tuple(args.exclude),
+        "skip_dirs": (converter.output_dir,) if converter.output_dir else (),
+    }
+    try:
+        status = run(input_arg, converter, scan, batch=args.batch)
+    finally:
+        converter.close()
+
+    if converter.retry_files:
+        write_retry_list(converter.retry_files, Path(args.retry_list))
+
+    if args.report:
+        totals = converter.write_report(Path(args.report))
+        notes = [f"{totals['pages']} pages in {totals['wall_seconds']:.1f}s",
+                 f"{totals['pages_per_second'] or 0:.1f} pages/s"]
+        notes += [f"{totals[flag]} {flag.replace('_', ' ')}" for flag in ("slow", "mostly_empty") if totals[flag]]
+        print(f"\nReport: {args.report} ({', '.join(notes)})")
+
+    if status:
+        sys.exit(status)
+
+
+def run(input_arg, converter, scan, batch=False):
+    """
+    Convert the PDFs named by the command-line input.
+
+    Args:
+        input_arg (str): File, comma-separated files, folder or @list file
+        converter (Converter): Runs the conversions
+        scan (dict): find_pdfs options for folder mode
+        batch (bool): Folder mode without test-first, streaming discovery
+
+    Returns:
+        int: Exit status (1 if a single input file failed to convert). Bad
+             input exits right away, since nothing was converted.
+    """
+    # Check if input is a list file or contains comma (multiple files)
+    if input_arg.startswith('@') or ',' in input_arg:
         # Multiple files mode
-        file_paths = [Path(f.strip()).resolve() for f in input_arg.split(',')]
+        if input_arg.startswith('@'):
+            list_path = Path(input_arg[1:])
+            if not list_path.is_file():
+                print(f"Error: List file not found: {list_path}")
+                sys.exit(1)
+            names = [line.strip() for line in list_path.read_text(encoding='utf-8').splitlines()]
+        else:
+            names = input_arg.split(',')
+        file_paths = [Path(f.strip()).resolve() for f in names if f.strip()]
 
         # Validate all files exist and are PDFs
         valid_files = []
@@ -219,8 +1859,12 @@ def main():
             print("\nNo valid PDF files to process.")
             sys.exit(1)
 
-        print(f"Found {len(valid_files)} valid PDF file(s)")
-        process_multiple_files(valid_files)
+        valid_files, unchanged = converter.split(valid_files)
+        converter.cache.save()
+        print(f"Found {len(valid_files)} valid PDF file(s) to convert" +
+              (f" ({len(unchanged)} unchanged, skipped)" if unchanged else ""))
+        if valid_files:
+            process_multiple_files(valid_files, converter)
 
     else:
         # Single path (file or folder)
@@ -237,20 +1881,26 @@ def main():
                 sys.exit(1)
 
             print(f"Found 1 PDF file to convert")
-            if process_single_file(input_path):
+            if process_single_file(input_path, converter):
                 print("\n" + "=" * 60)
                 print("Conversion complete!")
                 print("=" * 60)
             else:
-                sys.exit(1)
+                # main() still writes the retry list and report
+                return 1
 
         elif input_path.is_dir():
-            # Folder mode
-            process_folder(input_path, test_first=True)
+            # Folder mode (output, if redirected, mirrors the folder tree)
+            converter.source_root = input_path
+            if batch:
+                process_tree(input_path, converter, scan)
+            else:
+                process_folder(input_path, converter, test_first=True, scan=scan)
 
         else:
             print(f"Error: Invalid path: {input_path}")
             sys.exit(1)
+    return 0
 
 
 if __name__ == "__main__":